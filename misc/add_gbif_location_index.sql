@@ -0,0 +1,5 @@
+-- Index for bounding box queries of /observations.geojson
+-- Run once against an existing database.
+
+-- Range scan on longitude, with latitude checked from the index entries
+CREATE INDEX IF NOT EXISTS idx_gbif_location ON gbif_data(decimal_longitude, decimal_latitude);
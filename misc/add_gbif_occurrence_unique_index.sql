@@ -0,0 +1,14 @@
+-- Make gbif_data idempotent on occurrence_id
+-- Run once against an existing database before deploying the upsert job.
+
+-- Add the payload hash used to skip unchanged observations
+ALTER TABLE gbif_data ADD COLUMN IF NOT EXISTS payload_hash VARCHAR(64);
+
+-- Remove duplicate observations left by earlier runs, keeping the newest row
+DELETE FROM gbif_data a
+USING gbif_data b
+WHERE a.occurrence_id = b.occurrence_id
+AND a.id < b.id;
+
+-- Unique index used as the upsert conflict target
+CREATE UNIQUE INDEX IF NOT EXISTS ix_gbif_data_occurrence_id ON gbif_data(occurrence_id);
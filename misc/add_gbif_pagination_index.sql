@@ -0,0 +1,7 @@
+-- Index for keyset pagination of /native-plants
+-- Run once against an existing database.
+
+-- Serves WHERE native = true ORDER BY event_date DESC NULLS LAST, id DESC
+-- and the (event_date, id) < (cursor) range of each following page
+CREATE INDEX IF NOT EXISTS idx_gbif_native_event_date_id
+ON gbif_data(native, event_date DESC NULLS LAST, id DESC);
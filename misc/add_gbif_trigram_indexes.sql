@@ -0,0 +1,8 @@
+-- Trigram indexes for the substring name filters of /native-plants
+-- (common_name / scientific_name ILIKE '%...%').
+-- Run once against an existing database; needs permission to create the extension.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_gbif_scientific_name_trgm ON gbif_data USING gin (scientific_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_gbif_common_name_trgm ON gbif_data USING gin (common_name gin_trgm_ops);
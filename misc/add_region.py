@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Script to add or update a tracked region.
+
+Usage:
+    python misc/add_region.py "Wildcat Canyon" misc/polygon.wkt
+    python misc/add_region.py "Tilden" tilden.wkt --dataset-key 50c9509d-22c7-4a22-a47d-8c48425ef4a7
+    python misc/add_region.py "Tilden" tilden.wkt --inactive
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import speciestrack
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from speciestrack.main import app
+from speciestrack.models import db, Region
+from speciestrack.utils.geometry_utils import parse_wkt_polygon
+
+parser = argparse.ArgumentParser(description="Add or update a tracked region")
+parser.add_argument("name", help="Region name, used as /native-plants?region=<name>")
+parser.add_argument("wkt_file", help="File holding the region's WKT POLYGON")
+parser.add_argument("--dataset-key", help="GBIF dataset key (default: DATASET_KEY env var)")
+parser.add_argument("--inactive", action="store_true", help="Store the region without ingesting it")
+args = parser.parse_args()
+
+geometry = Path(args.wkt_file).read_text().strip()
+rings = parse_wkt_polygon(geometry)
+if not rings:
+    sys.exit(f"No POLYGON found in {args.wkt_file}")
+
+with app.app_context():
+    region = Region.query.filter_by(name=args.name).first()
+    if region is None:
+        region = Region(name=args.name)
+        db.session.add(region)
+
+    region.geometry = geometry
+    region.dataset_key = args.dataset_key
+    region.active = not args.inactive
+    db.session.commit()
+
+    print(f"Saved region {region.id}: {region.name} ({len(rings[0])} points, active={region.active})")
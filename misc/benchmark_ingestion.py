@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+End-to-end ingestion benchmark against the local GBIF stand-in server.
+
+Starts misc/gbif_stub_server.py in a separate process on a free port, points
+the job at it and runs store_gbif_data, then reports pages/sec, rows/sec,
+peak RSS and the per-stage timings from IngestionStats. The stub's records
+live in its own process, so the peak RSS is the ingestion's alone. Nothing
+touches the live GBIF API.
+
+By default a scratch SQLite database is used; pass --database-url to
+benchmark PostgreSQL. Only rows with synthetic occurrence keys are removed
+before the run.
+
+Usage:
+    python misc/benchmark_ingestion.py --records 50000
+    python misc/benchmark_ingestion.py --records 20000 --latency 0.05 --error-rate 0.02 --json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+# Add parent directory to path so we can import speciestrack
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+parser = argparse.ArgumentParser(description="Benchmark GBIF ingestion against a local stand-in server")
+parser.add_argument("--records", type=int, default=20000, help="Number of synthetic records to ingest")
+parser.add_argument("--latency", type=float, default=0.0, help="Seconds the stub waits before each response")
+parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+parser.add_argument(
+    "--database-url",
+    default=os.getenv("BENCHMARK_DATABASE_URL", "sqlite:///gbif_benchmark.db"),
+    help="Database to ingest into (default: scratch SQLite file)"
+)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--json", action="store_true", help="Print the results as one JSON object")
+args = parser.parse_args()
+
+# Configure before the app is imported
+os.environ["DATABASE_URL"] = args.database_url
+os.environ.setdefault("GBIF_RATE_LIMIT", "0")
+os.environ.setdefault("GBIF_BACKOFF_SECONDS", "0.05")
+
+from speciestrack.main import app
+from speciestrack.models import db, GbifData, NativePlant
+from speciestrack.jobs.gbif_job import store_gbif_data
+from misc.gbif_stub_server import SPECIES_NAMES, FIRST_KEY, SEARCH_PATH, STATS_PATH
+
+
+def prepare_database():
+    """Create tables, seed native plants and drop rows from earlier benchmark runs"""
+    with app.app_context():
+        db.create_all()
+
+        if NativePlant.query.count() == 0:
+            # The first seven stub names are California natives
+            for name in SPECIES_NAMES[:7]:
+                botanical_name = " ".join(name.split()[:2])
+                db.session.add(NativePlant(botanical_name=botanical_name, common_name=botanical_name))
+
+        removed = GbifData.query.filter(
+            GbifData.occurrence_id.between(str(FIRST_KEY), "9999999999")
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return removed
+
+
+def start_stub_process():
+    """
+    Run the stub server in a child process and wait until it listens.
+
+    Returns:
+        (process, occurrence search URL) tuple
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable, str(Path(__file__).parent / "gbif_stub_server.py"),
+            "--records", str(args.records),
+            "--latency", str(args.latency),
+            "--error-rate", str(args.error_rate),
+            "--seed", str(args.seed),
+            "--port", "0",
+        ],
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        print("Stub server failed to start")
+        sys.exit(1)
+    return process, line.split()[-1]
+
+
+def stub_stats(url):
+    """Request and error counts served by the stub"""
+    with urllib.request.urlopen(url[:-len(SEARCH_PATH)] + STATS_PATH) as response:
+        return json.loads(response.read())
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+removed = prepare_database()
+stub_process, stub_url = start_stub_process()
+os.environ["GBIF_API_URL"] = stub_url
+
+if not args.json:
+    print("=" * 60)
+    print("GBIF Ingestion Benchmark")
+    print("=" * 60)
+    print(f"Stub server: {stub_url} ({args.records} records, latency={args.latency}s, error_rate={args.error_rate})")
+    print(f"Database: {args.database_url} ({removed} rows from earlier runs removed)")
+
+try:
+    started = time.perf_counter()
+    stats = store_gbif_data(app, full_sync=True)
+    elapsed = time.perf_counter() - started
+    served = stub_stats(stub_url)
+finally:
+    stub_process.terminate()
+    stub_process.wait()
+
+if stats is None:
+    print("Benchmark run failed; see the job output above")
+    sys.exit(1)
+
+results = {
+    "records": args.records,
+    "seconds": round(elapsed, 3),
+    "pages": stats.pages,
+    "rows": stats.processed,
+    "fetched": stats.fetched,
+    "stored": stats.stored,
+    "pages_per_second": round(stats.pages / elapsed, 1) if elapsed else 0.0,
+    "rows_per_second": round(stats.processed / elapsed, 1) if elapsed else 0.0,
+    "peak_rss_mb": round(peak_rss_mb(), 1),
+    "stage_seconds": {stage: round(seconds, 3) for stage, seconds in stats.stage_seconds.items()},
+    "requests": served["requests"],
+    "errors_served": served["errors"],
+    "fetch_complete": stats.fetch_complete,
+}
+
+if args.json:
+    print(json.dumps(results))
+else:
+    print("\n" + "=" * 60)
+    print(f"Wall time:      {results['seconds']}s")
+    print(f"Pages:          {results['pages']} ({results['pages_per_second']} pages/sec)")
+    print(f"Rows:           {results['rows']} ({results['rows_per_second']} rows/sec)")
+    print(f"Fetched/stored: {results['fetched']} / {results['stored']}")
+    print(f"Peak RSS:       {results['peak_rss_mb']} MB")
+    print(f"Requests:       {results['requests']} ({results['errors_served']} errors served)")
+    for stage, seconds in results["stage_seconds"].items():
+        print(f"  {stage:<8} {seconds}s")
+    print("=" * 60)
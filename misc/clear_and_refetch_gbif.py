@@ -1,37 +1,71 @@
 #!/usr/bin/env python3
 """
 Script to clear GBIF data and re-fetch with coordinates.
+
+Usage:
+    python misc/clear_and_refetch_gbif.py            # fetch from GBIF
+    python misc/clear_and_refetch_gbif.py --record   # fetch and record responses to the cache
+    python misc/clear_and_refetch_gbif.py --replay   # re-ingest from recorded responses only
 """
 
+import argparse
+import os
 import sys
 from pathlib import Path
 
 # Add parent directory to path so we can import speciestrack
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+parser = argparse.ArgumentParser(description="Clear GBIF data and fetch it again")
+cache_mode = parser.add_mutually_exclusive_group()
+cache_mode.add_argument(
+    "--record",
+    action="store_true",
+    help="Record GBIF responses to the disk cache (GBIF_CACHE_DIR)"
+)
+cache_mode.add_argument(
+    "--replay",
+    action="store_true",
+    help="Serve every GBIF request from the disk cache, without network access"
+)
+args = parser.parse_args()
+
+if args.record:
+    os.environ["GBIF_CACHE_MODE"] = "record"
+elif args.replay:
+    os.environ["GBIF_CACHE_MODE"] = "replay"
+
 from speciestrack.main import app
-from speciestrack.models import GbifData, db
+from speciestrack.models import GbifData, RegionOccurrence, db
 from speciestrack.jobs.gbif_job import store_gbif_data
+from speciestrack.jobs.run_lock import run_exclusive
 
 print("=" * 60)
 print("Clearing and Re-fetching GBIF Data")
 print("=" * 60)
 
-with app.app_context():
-    # Clear existing data
-    count_before = GbifData.query.count()
-    print(f"\nRecords before deletion: {count_before}")
 
-    GbifData.query.delete()
-    db.session.commit()
+def clear_and_refetch(app):
+    with app.app_context():
+        # Clear existing data
+        count_before = GbifData.query.count()
+        print(f"\nRecords before deletion: {count_before}")
 
-    print(f"Records deleted: {count_before}")
-    print("\n" + "=" * 60)
+        GbifData.query.delete()
+        RegionOccurrence.query.delete()
+        db.session.commit()
 
-# Re-fetch data with coordinates
-print("Fetching new data...")
-print("=" * 60)
-store_gbif_data(app)
+        print(f"Records deleted: {count_before}")
+        print("\n" + "=" * 60)
+
+    # Re-fetch data with coordinates; the table is empty, so skip the sync watermark
+    print("Fetching new data...")
+    print("=" * 60)
+    store_gbif_data(app, full_sync=True)
+
+
+# Hold the ingestion lock for both steps so a scheduled run cannot interleave
+run_exclusive(app, clear_and_refetch)
 
 print("\n" + "=" * 60)
 print("Done!")
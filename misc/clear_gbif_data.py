@@ -10,7 +10,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from speciestrack.main import app
-from speciestrack.models import GbifData, db
+from speciestrack.models import GbifData, RegionOccurrence, db
+from speciestrack.jobs.derived_data import refresh_derived_data
 
 print("=" * 60)
 print("Clearing GBIF Data")
@@ -20,13 +21,17 @@ with app.app_context():
     count_before = GbifData.query.count()
     print(f"\nRecords before deletion: {count_before}")
 
-    # Delete all records
+    # Delete all records and their region memberships
     GbifData.query.delete()
+    RegionOccurrence.query.delete()
     db.session.commit()
 
     count_after = GbifData.query.count()
     print(f"Records after deletion: {count_after}")
 
+    # Empty the map clusters and rollups built from the deleted rows
+    refresh_derived_data()
+
 print("\n" + "=" * 60)
 print("Done!")
 print("=" * 60)
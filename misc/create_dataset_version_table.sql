@@ -0,0 +1,12 @@
+-- Create table for the observation data version (bumped after each ingestion, keys the response cache)
+CREATE TABLE IF NOT EXISTS dataset_version (
+    id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- The table holds a single row
+INSERT INTO dataset_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
+
+-- Add comment to table
+COMMENT ON TABLE dataset_version IS 'Version of gbif_data, bumped after every job that changes it commits';
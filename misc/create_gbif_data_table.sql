@@ -1,3 +1,6 @@
+-- Trigram operators for the name search indexes below
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create table for GBIF observation data
 CREATE TABLE IF NOT EXISTS gbif_data (
     id SERIAL PRIMARY KEY,
@@ -10,6 +13,8 @@ CREATE TABLE IF NOT EXISTS gbif_data (
     decimal_latitude NUMERIC(10, 8),
     decimal_longitude NUMERIC(11, 8),
     event_date TIMESTAMP,
+    payload_hash VARCHAR(64),
+    region_id INTEGER,  -- regions(id), see create_regions_table.sql
     fetch_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -18,6 +23,14 @@ CREATE TABLE IF NOT EXISTS gbif_data (
 -- Create indexes for commonly queried columns
 CREATE INDEX idx_gbif_scientific_name ON gbif_data(scientific_name);
 CREATE INDEX idx_gbif_fetch_date ON gbif_data(fetch_date);
+CREATE UNIQUE INDEX ix_gbif_data_occurrence_id ON gbif_data(occurrence_id);
+CREATE INDEX ix_gbif_data_region_id ON gbif_data(region_id);
+CREATE INDEX idx_gbif_native_event_date_id ON gbif_data(native, event_date DESC NULLS LAST, id DESC);
+CREATE INDEX idx_gbif_location ON gbif_data(decimal_longitude, decimal_latitude);
+CREATE INDEX idx_gbif_scientific_name_trgm ON gbif_data USING gin (scientific_name gin_trgm_ops);
+CREATE INDEX idx_gbif_common_name_trgm ON gbif_data USING gin (common_name gin_trgm_ops);
+CREATE INDEX idx_gbif_updated_at ON gbif_data(updated_at);
+CREATE INDEX idx_gbif_event_date ON gbif_data(event_date);
 
 -- Add comment to table
 COMMENT ON TABLE gbif_data IS 'Storage for daily GBIF species observation data from Wildcat Canyon Regional Park';
@@ -0,0 +1,20 @@
+-- Create table for GBIF ingestion runs and their resume checkpoints
+CREATE TABLE IF NOT EXISTS gbif_job_run (
+    id SERIAL PRIMARY KEY,
+    dataset_key VARCHAR(255) NOT NULL DEFAULT '',
+    geometry_hash VARCHAR(64) NOT NULL,
+    since TIMESTAMP,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    checkpoint TEXT,
+    rows_stored INTEGER NOT NULL DEFAULT 0,
+    max_last_interpreted TIMESTAMP,
+    error TEXT,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_gbif_job_run_query ON gbif_job_run(dataset_key, geometry_hash, id);
+
+-- Add comment to table
+COMMENT ON TABLE gbif_job_run IS 'GBIF ingestion runs with a checkpoint of the pages committed so far, used by --resume';
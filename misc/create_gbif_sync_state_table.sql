@@ -0,0 +1,14 @@
+-- Create table for incremental GBIF sync watermarks
+CREATE TABLE IF NOT EXISTS gbif_sync_state (
+    id SERIAL PRIMARY KEY,
+    dataset_key VARCHAR(255) NOT NULL DEFAULT '',
+    geometry_hash VARCHAR(64) NOT NULL,
+    watermark TIMESTAMP,
+    last_success_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_gbif_sync_state_query UNIQUE (dataset_key, geometry_hash)
+);
+
+-- Add comment to table
+COMMENT ON TABLE gbif_sync_state IS 'Last successful GBIF lastInterpreted watermark per dataset and query polygon';
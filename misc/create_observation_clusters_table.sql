@@ -0,0 +1,16 @@
+-- Create table for precomputed map clusters (rebuilt from gbif_data after each ingestion)
+CREATE TABLE IF NOT EXISTS observation_clusters (
+    id SERIAL PRIMARY KEY,
+    zoom INTEGER NOT NULL,
+    cell_x INTEGER NOT NULL,
+    cell_y INTEGER NOT NULL,
+    longitude DOUBLE PRECISION NOT NULL,
+    latitude DOUBLE PRECISION NOT NULL,
+    observation_count INTEGER NOT NULL,
+    native_count INTEGER NOT NULL,
+    top_species TEXT,
+    CONSTRAINT uq_observation_clusters_cell UNIQUE (zoom, cell_y, cell_x)
+);
+
+-- Add comment to table
+COMMENT ON TABLE observation_clusters IS 'Observations binned into a Web Mercator grid per zoom level, served by /clusters';
@@ -0,0 +1,30 @@
+-- Create tables for the daily observation rollups (kept up to date from gbif_data after each ingestion)
+CREATE TABLE IF NOT EXISTS observation_daily_rollups (
+    id SERIAL PRIMARY KEY,
+    species VARCHAR(500) NOT NULL,
+    native BOOLEAN NOT NULL,
+    day DATE NOT NULL,
+    record_count INTEGER NOT NULL,
+    observation_count INTEGER NOT NULL,
+    CONSTRAINT uq_observation_daily_rollups_key UNIQUE (species, day, native)
+);
+
+CREATE INDEX IF NOT EXISTS idx_observation_daily_rollups_day ON observation_daily_rollups(day);
+
+-- Highest gbif_data.updated_at already rolled up; no row means the next refresh rebuilds everything
+CREATE TABLE IF NOT EXISTS rollup_state (
+    id SERIAL PRIMARY KEY,
+    watermark TIMESTAMP
+);
+
+-- Days an upsert moved observations away from, recomputed by the next refresh
+CREATE TABLE IF NOT EXISTS rollup_pending_days (
+    day DATE PRIMARY KEY
+);
+
+-- Indexes used by the incremental refresh
+CREATE INDEX IF NOT EXISTS idx_gbif_updated_at ON gbif_data(updated_at);
+CREATE INDEX IF NOT EXISTS idx_gbif_event_date ON gbif_data(event_date);
+
+-- Add comment to table
+COMMENT ON TABLE observation_daily_rollups IS 'Observations per species, native flag and day, served by /stats/timeseries';
@@ -0,0 +1,37 @@
+-- Create table for tracked regions (parks) and tag observations with their region
+CREATE TABLE IF NOT EXISTS regions (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    geometry TEXT NOT NULL,
+    dataset_key VARCHAR(255),
+    active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE gbif_data ADD COLUMN IF NOT EXISTS region_id INTEGER REFERENCES regions(id);
+CREATE INDEX IF NOT EXISTS ix_gbif_data_region_id ON gbif_data(region_id);
+
+-- Occurrences in each region; overlapping regions share occurrences, while
+-- gbif_data.region_id keeps only the first region that stored a row
+CREATE TABLE IF NOT EXISTS region_occurrences (
+    region_id INTEGER NOT NULL REFERENCES regions(id),
+    occurrence_id VARCHAR(500) NOT NULL,
+    PRIMARY KEY (region_id, occurrence_id)
+);
+
+-- Backfill observations stored before regions existed. With a single region every stored row
+-- came from its polygon; with several, each region's next run tags and links the rows it fetches.
+UPDATE gbif_data
+SET region_id = (SELECT MIN(id) FROM regions)
+WHERE region_id IS NULL
+  AND (SELECT COUNT(*) FROM regions) = 1;
+
+INSERT INTO region_occurrences (region_id, occurrence_id)
+SELECT region_id, occurrence_id FROM gbif_data
+WHERE region_id IS NOT NULL AND occurrence_id IS NOT NULL
+ON CONFLICT DO NOTHING;
+
+-- Add comment to table
+COMMENT ON TABLE regions IS 'Areas whose GBIF observations are ingested, each with its own WKT polygon';
+COMMENT ON TABLE region_occurrences IS 'Occurrences fetched for each region, shared between overlapping regions';
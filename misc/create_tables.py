@@ -31,7 +31,8 @@ with app.app_context():
         print(f"  - {table}")
 
     # Check if our expected tables exist
-    expected_tables = ['native_plants', 'gbif_data']
+    expected_tables = ['native_plants', 'regions', 'region_occurrences', 'gbif_data', 'gbif_sync_state', 'gbif_job_run', 'observation_clusters', 'dataset_version',
+                       'observation_daily_rollups', 'rollup_state', 'rollup_pending_days']
     for table in expected_tables:
         if table in tables:
             print(f"\n✓ Table '{table}' created successfully")
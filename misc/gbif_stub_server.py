@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GBIF occurrence search API.
+
+Serves synthetic occurrence pages so the ingestion job can be exercised and
+benchmarked offline. The number of records, response latency and error rate
+are configurable. Records are generated once at start-up inside the query
+polygon itself, so every fetched record is also stored. A request's
+`geometry` (if any) is honoured as a bounding box, so tiled fetches see
+consistent counts. `limit=0` returns only the count, like GBIF.
+GET /stub/stats returns the request and error counts served so far.
+
+Usage:
+    python misc/gbif_stub_server.py --records 50000 --latency 0.05 --error-rate 0.01
+    GBIF_API_URL=http://127.0.0.1:8765/occurrence/search python misc/run_gbif_job.py --full
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import argparse
+import random
+import gzip
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import speciestrack
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from speciestrack.jobs.gbif_job import WILDCAT_CANYON_POLYGON
+from speciestrack.utils.geometry_utils import parse_wkt_polygon, polygon_bounds, point_in_polygon
+
+SEARCH_PATH = "/occurrence/search"
+STATS_PATH = "/stub/stats"
+
+# Mix of native and non-native names, some with authors, as GBIF returns them
+SPECIES_NAMES = [
+    "Quercus agrifolia Née",
+    "Quercus lobata Née",
+    "Aesculus californica (Spach) Nutt.",
+    "Eschscholzia californica Cham.",
+    "Arctostaphylos glauca Lindl.",
+    "Umbellularia californica (Hook. & Arn.) Nutt.",
+    "Baccharis pilularis DC.",
+    "Eucalyptus globulus Labill.",
+    "Foeniculum vulgare Mill.",
+    "Genista monspessulana (L.) L.A.S.Johnson",
+]
+
+# First synthetic occurrence key; well away from real GBIF keys
+FIRST_KEY = 9000000000
+
+
+def generate_records(count, geometry=WILDCAT_CANYON_POLYGON, seed=0):
+    """
+    Build `count` synthetic GBIF occurrence results inside `geometry`
+    (outside its holes). The same seed always gives the same records.
+    """
+    rng = random.Random(seed)
+    rings = parse_wkt_polygon(geometry)
+    min_lon, min_lat, max_lon, max_lat = polygon_bounds(rings)
+
+    records = []
+    for i in range(count):
+        # Rejection sampling over the bounding box; checked after rounding
+        while True:
+            lon = round(rng.uniform(min_lon, max_lon), 6)
+            lat = round(rng.uniform(min_lat, max_lat), 6)
+            if point_in_polygon(lon, lat, rings):
+                break
+        records.append({
+            "key": FIRST_KEY + i,
+            "scientificName": SPECIES_NAMES[i % len(SPECIES_NAMES)],
+            "decimalLatitude": lat,
+            "decimalLongitude": lon,
+            "eventDate": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00",
+            "lastInterpreted": f"2025-06-{1 + i % 28:02d}T09:00:00.000Z",
+        })
+    return records
+
+
+class GbifStubServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the synthetic records and settings"""
+
+    daemon_threads = True
+
+    def __init__(self, address, records, latency=0.0, error_rate=0.0, seed=0):
+        """
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            records: Synthetic occurrence results to serve
+            latency: Seconds to wait before answering each request
+            error_rate: Fraction of requests answered with a 503
+            seed: Seed for the error draw
+        """
+        super().__init__(address, GbifStubHandler)
+        self.records = records
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        # Matching records per geometry, computed on first use
+        self.matches = {}
+
+    @property
+    def url(self):
+        """Occurrence search URL to use as GBIF_API_URL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    def records_within(self, geometry):
+        """Records inside the bounding box of a WKT geometry (all if None)"""
+        if not geometry:
+            return self.records
+
+        with self.lock:
+            if geometry not in self.matches:
+                min_lon, min_lat, max_lon, max_lat = polygon_bounds(parse_wkt_polygon(geometry))
+                self.matches[geometry] = [
+                    record for record in self.records
+                    if min_lon <= record["decimalLongitude"] <= max_lon
+                    and min_lat <= record["decimalLatitude"] <= max_lat
+                ]
+            return self.matches[geometry]
+
+    def should_fail(self):
+        """Draw whether this request gets an error response"""
+        with self.lock:
+            self.request_count += 1
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.error_count += 1
+                return True
+            return False
+
+
+class GbifStubHandler(BaseHTTPRequestHandler):
+    """Answers GET /occurrence/search like the GBIF API"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == STATS_PATH:
+            self.send_json(200, {
+                "requests": self.server.request_count,
+                "errors": self.server.error_count,
+            })
+            return
+        if url.path != SEARCH_PATH:
+            self.send_json(404, {"error": "not found"})
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if self.server.should_fail():
+            self.send_json(503, {"error": "service unavailable"})
+            return
+
+        params = parse_qs(url.query)
+        limit = int(params.get("limit", ["20"])[0])
+        offset = int(params.get("offset", ["0"])[0])
+        matches = self.server.records_within(params.get("geometry", [None])[0])
+
+        results = matches[offset:offset + limit] if limit > 0 else []
+        self.send_json(200, {
+            "offset": offset,
+            "limit": limit,
+            "endOfRecords": offset + limit >= len(matches),
+            "count": len(matches),
+            "results": results,
+        })
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+def start_stub_server(records=10000, latency=0.0, error_rate=0.0, host="127.0.0.1", port=0, seed=0):
+    """
+    Start a stub server on a background thread.
+
+    Args:
+        records: Number of synthetic records to serve
+        latency: Seconds to wait before answering each request
+        error_rate: Fraction of requests answered with a 503
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        seed: Seed for the records and the error draw
+
+    Returns:
+        The running GbifStubServer; call shutdown() to stop it
+    """
+    server = GbifStubServer((host, port), generate_records(records, seed=seed), latency, error_rate, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic GBIF occurrence search pages")
+    parser.add_argument("--records", type=int, default=10000, help="Number of synthetic records")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind (0 picks a free port)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = GbifStubServer(
+        (args.host, args.port),
+        generate_records(args.records, seed=args.seed),
+        args.latency,
+        args.error_rate,
+        args.seed
+    )
+    # The URL is the last word of the first line; misc/benchmark_ingestion.py reads it
+    print(f"Serving {args.records} synthetic GBIF records at {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
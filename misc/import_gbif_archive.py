@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Script to ingest a GBIF occurrence download (Darwin Core Archive).
+
+Usage:
+    python misc/import_gbif_archive.py path/to/download.zip
+    python misc/import_gbif_archive.py --download path/to/save.zip
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import speciestrack
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from speciestrack.main import app
+from speciestrack.jobs.gbif_archive import request_gbif_download, store_gbif_archive
+from speciestrack.jobs.run_lock import run_exclusive
+
+parser = argparse.ArgumentParser(description="Ingest a GBIF Darwin Core Archive download")
+parser.add_argument("archive", help="Path of the DwC-A zip to read (or to save to with --download)")
+parser.add_argument(
+    "--download",
+    action="store_true",
+    help="Request a new download from the GBIF download API first"
+)
+args = parser.parse_args()
+
+print("=" * 60)
+print("Importing GBIF Archive")
+print("=" * 60)
+
+if args.download:
+    request_gbif_download(args.archive)
+
+run_exclusive(app, store_gbif_archive, args.archive)
+
+print("\n" + "=" * 60)
+print("Import complete!")
+print("=" * 60)
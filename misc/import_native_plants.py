@@ -151,6 +151,7 @@ def main():
             cur.execute("SELECT COUNT(*) FROM native_plants")
             db_count = cur.fetchone()[0]
             print(f"  Total rows in database: {db_count}")
+            print("Run misc/reclassify_native_plants.py to update the native status of stored GBIF observations")
 
     except Exception as e:
         print(f"Error during import: {e}")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Script to recompute the native status of stored GBIF observations after
+the native_plants catalog changes (e.g. after import_native_plants.py).
+Nothing is fetched from GBIF.
+
+Usage:
+    python misc/reclassify_native_plants.py
+    python misc/reclassify_native_plants.py --batch-size 1000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import speciestrack
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from speciestrack.main import app
+from speciestrack.jobs.reclassify_job import reclassify_native_status
+from speciestrack.jobs.run_lock import run_exclusive
+
+parser = argparse.ArgumentParser(description="Re-classify native status of stored GBIF observations")
+parser.add_argument(
+    "--batch-size",
+    type=int,
+    help="Scientific names per UPDATE statement (default RECLASSIFY_BATCH_SIZE or 500)"
+)
+args = parser.parse_args()
+
+print("=" * 60)
+print("Re-classifying Native Status")
+print("=" * 60)
+
+# Share the ingestion lock so a running ingestion cannot write rows matched against the old catalog
+run_exclusive(app, reclassify_native_status, batch_size=args.batch_size)
+
+print("\n" + "=" * 60)
+print("Re-classification complete!")
+print("=" * 60)
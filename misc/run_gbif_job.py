@@ -3,6 +3,7 @@
 Script to manually run the GBIF data fetch and store job.
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -10,14 +11,41 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from speciestrack.main import app
-from speciestrack.jobs.gbif_job import store_gbif_data
+from speciestrack.models import Region
+from speciestrack.jobs.gbif_job import store_gbif_data, store_all_regions
+from speciestrack.jobs.run_lock import run_exclusive
+
+parser = argparse.ArgumentParser(description="Run the GBIF data fetch and store job")
+parser.add_argument(
+    "--full",
+    action="store_true",
+    help="Ignore the incremental sync watermark and run the default date query"
+)
+parser.add_argument(
+    "--resume",
+    action="store_true",
+    help="Continue the last unfinished run from its checkpoint instead of starting over"
+)
+parser.add_argument(
+    "--region",
+    help="Only fetch this region (name or id); by default every active region is fetched"
+)
+args = parser.parse_args()
 
 print("=" * 60)
 print("Running GBIF Data Fetch Job")
 print("=" * 60)
 
 # Run the job
-store_gbif_data(app)
+if args.region:
+    with app.app_context():
+        region = Region.lookup(args.region)
+        if region is None:
+            sys.exit(f"Unknown region: {args.region}")
+        region_id = region.id
+    run_exclusive(app, store_gbif_data, full_sync=args.full, resume=args.resume, region_id=region_id)
+else:
+    run_exclusive(app, store_all_regions, full_sync=args.full, resume=args.resume)
 
 print("\n" + "=" * 60)
 print("Job execution complete!")
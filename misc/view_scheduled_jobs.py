@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
-View all scheduled jobs and their next run times
+View the jobs the worker schedules and their next run times.
+The scheduler is built here but paused, so no job runs; the worker
+(speciestrack-worker) is the process that actually runs them.
 """
 
 import sys
@@ -9,14 +11,20 @@ from pathlib import Path
 # Add parent directory to path so we can import speciestrack
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from speciestrack.main import app, scheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+from speciestrack.main import create_app
+from speciestrack.worker import create_scheduler
 from datetime import datetime
 
+scheduler = create_scheduler(create_app(), scheduler_class=BackgroundScheduler)
+# Start paused so next run times are computed without running anything
+scheduler.start(paused=True)
+
 print("=" * 70)
 print("Scheduled Jobs Status")
 print("=" * 70)
 print(f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print(f"Scheduler running: {scheduler.running}")
+print("Scheduler: speciestrack-worker")
 print("=" * 70)
 
 jobs = scheduler.get_jobs()
@@ -32,5 +40,7 @@ else:
         print(f"Trigger: {job.trigger}")
         print("-" * 70)
 
-print("\nTo stop the scheduler, exit the Flask application.")
+scheduler.shutdown()
+
+print("\nJobs run in the worker process: speciestrack-worker (or python -m speciestrack.worker).")
 print("=" * 70)
@@ -8,4 +8,10 @@ setup(
         "Flask>=3.1.2",
         "requests>=2.32.5",
     ],
+    entry_points={
+        "console_scripts": [
+            "speciestrack-web=speciestrack.main:main",
+            "speciestrack-worker=speciestrack.worker:main",
+        ],
+    },
 )
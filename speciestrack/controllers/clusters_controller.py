@@ -0,0 +1,72 @@
+from flask import jsonify, request
+from sqlalchemy import or_
+from speciestrack.jobs.cluster_job import cells_per_axis, cluster_settings
+from speciestrack.models.observation_cluster import ObservationCluster
+from speciestrack.utils.geometry_utils import parse_bbox, bbox_longitude_ranges, mercator_cell
+
+# Largest number of clusters returned for one request
+MAX_CLUSTERS = 10000
+
+
+def get_clusters():
+    """
+    Return precomputed observation clusters inside a map viewport as a
+    GeoJSON FeatureCollection of Point features with observation_count,
+    native_count and top_species properties.
+
+    Clusters are grid cells CLUSTER_CELL_PIXELS wide on screen, so the
+    number returned depends on the viewport size, not on the number of
+    observations. Zoom levels above CLUSTER_MAX_ZOOM use the finest level;
+    at that point the map can switch to /observations.geojson.
+
+    Query Parameters:
+        bbox (str): min_lon,min_lat,max_lon,max_lat of the viewport (required)
+        zoom (int): Map zoom level (required)
+
+    Example:
+        /clusters?bbox=-122.5,37.7,-122.0,38.1&zoom=11
+    """
+    bbox_param = request.args.get('bbox')
+    zoom_param = request.args.get('zoom')
+    if not bbox_param or zoom_param is None:
+        return jsonify({"error": "bbox and zoom are required"}), 400
+
+    try:
+        bbox = parse_bbox(bbox_param)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid bbox: {str(e)}"}), 400
+
+    try:
+        zoom = int(zoom_param)
+    except ValueError:
+        return jsonify({"error": f"Invalid zoom: {zoom_param}"}), 400
+    if zoom < 0:
+        return jsonify({"error": "zoom must not be negative"}), 400
+
+    max_zoom, cell_pixels, _ = cluster_settings()
+    zoom = min(zoom, max_zoom)
+    cells = cells_per_axis(zoom, cell_pixels)
+
+    # Cell rows grow southwards, so the north edge gives the first row
+    min_lon, min_lat, max_lon, max_lat = bbox
+    _, min_y = mercator_cell(min_lon, max_lat, cells)
+    _, max_y = mercator_cell(min_lon, min_lat, cells)
+    x_ranges = []
+    for range_min_lon, range_max_lon in bbox_longitude_ranges(bbox):
+        x_ranges.append((mercator_cell(range_min_lon, 0, cells)[0], mercator_cell(range_max_lon, 0, cells)[0]))
+
+    clusters = ObservationCluster.query.filter(
+        ObservationCluster.zoom == zoom,
+        ObservationCluster.cell_y.between(min_y, max_y),
+        or_(*[ObservationCluster.cell_x.between(min_x, max_x) for min_x, max_x in x_ranges])
+    ).limit(MAX_CLUSTERS + 1).all()
+
+    response = jsonify({
+        "type": "FeatureCollection",
+        "zoom": zoom,
+        "bbox": list(bbox),
+        "features": [cluster.to_feature() for cluster in clusters[:MAX_CLUSTERS]],
+        "truncated": len(clusters) > MAX_CLUSTERS,
+    })
+    response.mimetype = "application/geo+json"
+    return response
@@ -1,26 +1,185 @@
-from flask import jsonify, request
+from flask import Response, jsonify, request, stream_with_context
+from sqlalchemy import and_, or_, select, tuple_
+from speciestrack.models import db
 from speciestrack.models.gbif_data import GbifData
+from speciestrack.models.region import Region, RegionOccurrence
+from speciestrack.utils.pagination import encode_cursor, decode_cursor
 from datetime import datetime
+import json
 
+# Page size when only a cursor is given, and the largest page a client can ask for
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
 
-def get_native_plants():
+# Rows fetched per round trip from the server-side cursor when streaming
+STREAM_BATCH_SIZE = 1000
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_stream():
+    """True if the request asks for an NDJSON stream (?stream=1 or Accept: application/x-ndjson)"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def parse_fields(value):
     """
-    Query the gbif_data table for all native plants (native=True)
-    and return as JSON response.
+    Parse the fields= query parameter.
 
-    Query Parameters:
-        start_time (str): ISO format timestamp for start of time range
-        end_time (str): ISO format timestamp for end of time range
-        common_name (str): Filter by common name (partial match)
-        scientific_name (str): Filter by scientific name (partial match)
+    Args:
+        value: Comma separated GbifData field names, or None
 
-    Example:
-        /native-plants?start_time=2025-01-01T00:00:00&end_time=2025-12-31T23:59:59
-        /native-plants?common_name=Oak
-        /native-plants?scientific_name=Quercus
+    Returns:
+        Tuple of field names in the requested order (every field if value is empty)
+
+    Raises:
+        ValueError: If a field name is unknown
     """
-    # Start with base query for native plants
-    query = GbifData.query.filter_by(native=True)
+    if not value:
+        return GbifData.FIELDS
+
+    fields = []
+    for field in value.split(','):
+        field = field.strip()
+        if field not in GbifData.FIELDS:
+            raise ValueError(f"Unknown field: {field}. Available fields: {', '.join(GbifData.FIELDS)}")
+        if field not in fields:
+            fields.append(field)
+    return tuple(fields)
+
+
+def select_fields(query, fields, required=()):
+    """
+    Load only the columns needed for a sparse fieldset.
+
+    Args:
+        query: Filtered GbifData query
+        fields: Fields that will be serialised
+        required: Extra fields the caller reads from each row (e.g. sort keys)
+
+    Returns:
+        Query of column rows, or the model query when every field is requested
+    """
+    if fields == GbifData.FIELDS:
+        return query
+    columns = list(fields) + [field for field in required if field not in fields]
+    return query.with_entities(*GbifData.columns(columns))
+
+
+def stream_ndjson(query, fields=GbifData.FIELDS):
+    """
+    Stream query results as newline-delimited JSON, one observation per line.
+
+    Rows are read through a server-side cursor (yield_per) and each line is
+    written as soon as it is serialised, so neither the row list nor the
+    response body is ever held in memory and the first rows reach the
+    client before the query has been read to the end.
+
+    Args:
+        query: Filtered GbifData query, or column rows from select_fields()
+        fields: Fields written for each observation
+
+    Returns:
+        Streaming Flask response
+    """
+    def generate():
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            yield json.dumps(GbifData.serialize(row, fields)) + "\n"
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    # Ask reverse proxies (nginx) to pass lines through instead of buffering the body
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def approximate_count(query):
+    """
+    Estimate the number of rows a query returns.
+
+    On PostgreSQL the estimate is the planner's row count from EXPLAIN, which
+    comes from table statistics and costs the same no matter how many rows
+    match. Other databases run an exact COUNT.
+
+    Args:
+        query: Filtered query, without ordering or limit
+
+    Returns:
+        Estimated row count
+    """
+    connection = db.session.connection()
+    if connection.dialect.name != "postgresql":
+        return query.order_by(None).count()
+
+    compiled = query.order_by(None).statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate_by_event_date(query, limit, cursor=None):
+    """
+    Return one page of observations, newest event_date first and undated
+    observations last, using keyset pagination on (event_date, id).
+
+    The cursor turns into a WHERE clause on the sort key instead of an
+    OFFSET, so every page is an index range scan that costs the same as
+    the first one.
+
+    Args:
+        query: Filtered GbifData query, or column rows that include event_date and id
+        limit: Maximum rows in the page
+        cursor: Cursor of the previous page, or None for the first page
+
+    Returns:
+        (rows, next cursor or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        event_date, row_id = decode_cursor(cursor)
+        if event_date is None:
+            # Already inside the undated tail
+            query = query.filter(and_(GbifData.event_date.is_(None), GbifData.id < row_id))
+        else:
+            query = query.filter(or_(
+                tuple_(GbifData.event_date, GbifData.id) < tuple_(event_date, row_id),
+                GbifData.event_date.is_(None)
+            ))
+
+    rows = query.order_by(
+        GbifData.event_date.desc().nulls_last(),
+        GbifData.id.desc()
+    ).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].event_date, rows[-1].id)
+
+
+def filter_observations(query):
+    """
+    Apply the shared observation filters from the request query string:
+    region, start_time, end_time, common_name and scientific_name.
+
+    Args:
+        query: GbifData query
+
+    Returns:
+        (filtered query, None), or (None, error response) for invalid parameters
+    """
+    # Filter by region if provided: occurrences linked to it in region_occurrences
+    # (overlapping regions share them), plus rows tagged with it that have no occurrence_id
+    region_param = request.args.get('region')
+    if region_param:
+        region = Region.lookup(region_param)
+        if region is None:
+            return None, (jsonify({"error": f"Unknown region: {region_param}"}), 404)
+        linked_ids = select(RegionOccurrence.occurrence_id).where(RegionOccurrence.region_id == region.id)
+        query = query.filter(or_(GbifData.occurrence_id.in_(linked_ids), GbifData.region_id == region.id))
 
     # Filter by timestamp range if provided
     start_time = request.args.get('start_time')
@@ -31,14 +190,14 @@ def get_native_plants():
             start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
             query = query.filter(GbifData.event_date >= start_dt)
         except (ValueError, AttributeError) as e:
-            return jsonify({"error": f"Invalid start_time format: {str(e)}"}), 400
+            return None, (jsonify({"error": f"Invalid start_time format: {str(e)}"}), 400)
 
     if end_time:
         try:
             end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
             query = query.filter(GbifData.event_date <= end_dt)
         except (ValueError, AttributeError) as e:
-            return jsonify({"error": f"Invalid end_time format: {str(e)}"}), 400
+            return None, (jsonify({"error": f"Invalid end_time format: {str(e)}"}), 400)
 
     # Filter by common name if provided
     common_name = request.args.get('common_name')
@@ -50,8 +209,84 @@ def get_native_plants():
     if scientific_name:
         query = query.filter(GbifData.scientific_name.ilike(f'%{scientific_name}%'))
 
+    return query, None
+
+
+def get_native_plants():
+    """
+    Query the gbif_data table for all native plants (native=True)
+    and return as JSON response.
+
+    Query Parameters:
+        start_time (str): ISO format timestamp for start of time range
+        end_time (str): ISO format timestamp for end of time range
+        common_name (str): Filter by common name (partial match)
+        scientific_name (str): Filter by scientific name (partial match)
+        region (str): Only observations from this region (name or id)
+        limit (int): Page size, at most MAX_PAGE_LIMIT (enables pagination)
+        cursor (str): `next` value of the previous page (enables pagination)
+        include_count (bool): Add an approximate total to paginated responses
+        fields (str): Comma separated fields to return, e.g. for the map
+            decimal_latitude,decimal_longitude,scientific_name,event_date.
+            Only those columns are loaded from the database.
+        stream (bool): Stream every matching row as NDJSON (same as Accept: application/x-ndjson)
+
+    Without limit or cursor every matching row is returned as a JSON list, or
+    streamed one JSON object per line when stream=1 or the Accept header asks
+    for application/x-ndjson.
+    With either one the response is a page, newest observations first:
+        {"results": [...], "next": "<cursor or null>", "approximate_count": 1234}
+
+    Example:
+        /native-plants?start_time=2025-01-01T00:00:00&end_time=2025-12-31T23:59:59
+        /native-plants?common_name=Oak
+        /native-plants?scientific_name=Quercus
+        /native-plants?region=Wildcat Canyon
+        /native-plants?limit=100&include_count=true
+        /native-plants?limit=100&cursor=WyIyMDI1LTA2LTAxVDEwOjAwOjAwIiw0Ml0
+        /native-plants?stream=1
+        /native-plants?fields=decimal_latitude,decimal_longitude,scientific_name,event_date
+    """
+    # Start with base query for native plants
+    query = GbifData.query.filter_by(native=True)
+
+    query, error = filter_observations(query)
+    if error is not None:
+        return error
+
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Paginate when the client asks for a page
+    limit_param = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    if limit_param is not None or cursor is not None:
+        try:
+            limit = int(limit_param) if limit_param is not None else DEFAULT_PAGE_LIMIT
+        except ValueError:
+            return jsonify({"error": f"Invalid limit: {limit_param}"}), 400
+        if not 1 <= limit <= MAX_PAGE_LIMIT:
+            return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_LIMIT}"}), 400
+
+        try:
+            # The next cursor is built from the sort key of the last row
+            rows, next_cursor = paginate_by_event_date(
+                select_fields(query, fields, required=("event_date", "id")), limit, cursor
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        page = {"results": [GbifData.serialize(row, fields) for row in rows], "next": next_cursor}
+        if request.args.get('include_count', '').lower() in ('1', 'true', 'yes'):
+            page["approximate_count"] = approximate_count(query)
+        return jsonify(page)
+
+    if wants_stream():
+        return stream_ndjson(select_fields(query, fields), fields)
+
     # Execute query and return results
-    native_plants = query.all()
-    plants_data = [plant.to_dict() for plant in native_plants]
+    native_plants = select_fields(query, fields).all()
+    plants_data = [GbifData.serialize(plant, fields) for plant in native_plants]
     return jsonify(plants_data)
-
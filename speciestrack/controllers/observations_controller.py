@@ -0,0 +1,139 @@
+from flask import jsonify, request
+from sqlalchemy import and_, or_, select
+from speciestrack.controllers.map_controller import filter_observations, parse_fields, select_fields
+from speciestrack.models import db
+from speciestrack.models.gbif_data import GbifData, gbif_location_rtree
+from speciestrack.utils.geometry_utils import parse_bbox, bbox_longitude_ranges
+
+# Feature properties returned when fields= is not given
+DEFAULT_PROPERTIES = ('id', 'scientific_name', 'common_name', 'native', 'event_date', 'observation_count')
+
+# Features returned when limit= is not given, and the largest limit a client can ask for
+DEFAULT_FEATURE_LIMIT = 5000
+MAX_FEATURE_LIMIT = 50000
+
+GEOJSON_MIMETYPE = "application/geo+json"
+
+
+def filter_bbox(query, bbox):
+    """
+    Keep observations inside a bounding box.
+
+    PostgreSQL range-scans the (decimal_longitude, decimal_latitude) index.
+    SQLite first looks the box up in the gbif_data_rtree R*Tree and only
+    reads the gbif_data rows it returns. Both re-check the exact
+    coordinates, since R*Tree boxes are rounded outwards.
+
+    Args:
+        query: GbifData query
+        bbox: (min_lon, min_lat, max_lon, max_lat) from parse_bbox()
+
+    Returns:
+        Filtered query
+    """
+    _, min_lat, _, max_lat = bbox
+    ranges = bbox_longitude_ranges(bbox)
+
+    query = query.filter(
+        GbifData.decimal_latitude.between(min_lat, max_lat),
+        or_(*[GbifData.decimal_longitude.between(min_lon, max_lon) for min_lon, max_lon in ranges])
+    )
+
+    if db.session.get_bind().dialect.name == "sqlite":
+        rtree = gbif_location_rtree.c
+        in_view = select(rtree.id).where(
+            rtree.min_lat <= max_lat,
+            rtree.max_lat >= min_lat,
+            or_(*[and_(rtree.min_lon <= max_lon, rtree.max_lon >= min_lon) for min_lon, max_lon in ranges])
+        )
+        query = query.filter(GbifData.id.in_(in_view))
+
+    return query
+
+
+def to_feature(row, properties):
+    """Convert a row with coordinates to a GeoJSON Point feature"""
+    return {
+        "type": "Feature",
+        "id": row.id if 'id' in properties else None,
+        "geometry": {
+            "type": "Point",
+            "coordinates": [float(row.decimal_longitude), float(row.decimal_latitude)],
+        },
+        "properties": GbifData.serialize(row, properties),
+    }
+
+
+def get_observations_geojson():
+    """
+    Return located GBIF observations as a GeoJSON FeatureCollection,
+    newest observations first.
+
+    Query Parameters:
+        bbox (str): min_lon,min_lat,max_lon,max_lat of the map viewport
+        native (bool): Only native (true) or non-native (false) observations
+        fields (str): Comma separated feature properties (default DEFAULT_PROPERTIES)
+        limit (int): Maximum features, at most MAX_FEATURE_LIMIT (default DEFAULT_FEATURE_LIMIT)
+        start_time, end_time, common_name, scientific_name, region:
+            Same filters as /native-plants
+
+    When more observations match than the limit, "truncated" is true; zoom
+    in (a smaller bbox) to see the rest.
+
+    Example:
+        /observations.geojson?bbox=-122.33,37.91,-122.27,37.95
+        /observations.geojson?bbox=-122.33,37.91,-122.27,37.95&native=true&fields=scientific_name
+    """
+    query = GbifData.query.filter(
+        GbifData.decimal_longitude.isnot(None),
+        GbifData.decimal_latitude.isnot(None)
+    )
+
+    native = request.args.get('native')
+    if native is not None:
+        if native.lower() not in ('true', 'false', '1', '0'):
+            return jsonify({"error": f"Invalid native value: {native}"}), 400
+        query = query.filter(GbifData.native == (native.lower() in ('true', '1')))
+
+    query, error = filter_observations(query)
+    if error is not None:
+        return error
+
+    bbox = None
+    bbox_param = request.args.get('bbox')
+    if bbox_param:
+        try:
+            bbox = parse_bbox(bbox_param)
+        except ValueError as e:
+            return jsonify({"error": f"Invalid bbox: {str(e)}"}), 400
+        query = filter_bbox(query, bbox)
+
+    try:
+        properties = parse_fields(request.args.get('fields')) if request.args.get('fields') else DEFAULT_PROPERTIES
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    limit_param = request.args.get('limit')
+    try:
+        limit = int(limit_param) if limit_param is not None else DEFAULT_FEATURE_LIMIT
+    except ValueError:
+        return jsonify({"error": f"Invalid limit: {limit_param}"}), 400
+    if not 1 <= limit <= MAX_FEATURE_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_FEATURE_LIMIT}"}), 400
+
+    rows = select_fields(query, properties, required=('id', 'decimal_longitude', 'decimal_latitude')).order_by(
+        GbifData.event_date.desc().nulls_last(),
+        GbifData.id.desc()
+    ).limit(limit + 1).all()
+
+    collection = {
+        "type": "FeatureCollection",
+        "features": [to_feature(row, properties) for row in rows[:limit]],
+        "truncated": len(rows) > limit,
+    }
+    if bbox is not None:
+        collection["bbox"] = list(bbox)
+
+    response = jsonify(collection)
+    response.mimetype = GEOJSON_MIMETYPE
+    return response
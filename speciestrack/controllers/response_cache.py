@@ -0,0 +1,120 @@
+"""
+Versioned response cache for the read-only data routes.
+
+Responses are cached per web process, keyed on the dataset version (see
+jobs/dataset_version.py) and the full request: path, query string and
+Accept header. When an ingestion bumps the version the whole cache is
+dropped, so nothing older than the data is ever served.
+
+Every cached response carries a strong ETag over its body; a client that
+sends it back in If-None-Match gets an empty 304 instead of the payload.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from hashlib import sha256
+from flask import Response, current_app, request
+from speciestrack.jobs.dataset_version import current_dataset_version
+import threading
+import os
+
+# Key of the cache state in app.extensions
+EXTENSION_KEY = "response_cache"
+
+_lock = threading.Lock()
+
+
+class ResponseCache:
+    """
+    Byte-bounded LRU of response bodies for one dataset version.
+    """
+
+    def __init__(self, version, max_bytes):
+        self.version = version
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """Cached (body, mimetype, etag) for a key, or None"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        """Store an entry, evicting the least recently used ones to fit"""
+        body = entry[0]
+        if len(body) > self.max_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous[0])
+        self.entries[key] = entry
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted[0])
+
+
+def _cache_for(version):
+    """The app's cache for a dataset version, replacing one for an older version"""
+    max_bytes = int(float(os.getenv("RESPONSE_CACHE_MAX_MB", "64")) * 1024 * 1024)
+    cache = current_app.extensions.get(EXTENSION_KEY)
+    if cache is None or cache.version != version or cache.max_bytes != max_bytes:
+        cache = current_app.extensions[EXTENSION_KEY] = ResponseCache(version, max_bytes)
+    return cache
+
+
+def _respond(body, mimetype, etag, cache_status):
+    """Build the full or 304 response for a cached or fresh body"""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Cache"] = cache_status
+    return response
+
+
+def cached_response(view):
+    """
+    Cache a view's successful responses under the current dataset version.
+
+    Only 200 responses that are not streamed are cached; errors and NDJSON
+    streams pass through untouched. RESPONSE_CACHE_MAX_MB (default 64)
+    bounds the cache size per process, and 0 turns caching off while
+    keeping ETags.
+
+    Args:
+        view: Flask view function
+
+    Returns:
+        Wrapped view function
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = current_dataset_version()
+        key = (
+            request.path,
+            tuple(sorted(request.args.items(multi=True))),
+            request.headers.get("Accept", ""),
+        )
+
+        with _lock:
+            entry = _cache_for(version).get(key)
+        if entry is not None:
+            return _respond(*entry, cache_status="HIT")
+
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code != 200 or response.is_streamed:
+            return response
+
+        body = response.get_data()
+        entry = (body, response.mimetype, sha256(body).hexdigest())
+        with _lock:
+            _cache_for(version).put(key, entry)
+        return _respond(*entry, cache_status="MISS")
+
+    return wrapper
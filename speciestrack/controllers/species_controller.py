@@ -0,0 +1,38 @@
+from flask import jsonify, request
+from speciestrack.jobs.species_suggestions import get_suggest_index
+
+# Suggestions returned when limit= is not given, and the largest limit a client can ask for
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+
+
+def get_species_suggestions():
+    """
+    Autocomplete species names from the observed species.
+
+    The query matches the start of any word of the canonical scientific
+    name or the common name, ignoring case and accents. Suggestions are
+    ranked by observation count and served from an in-memory index.
+
+    Query Parameters:
+        q (str): Text typed so far
+        limit (int): Maximum suggestions, at most MAX_SUGGEST_LIMIT
+
+    Example:
+        /species/suggest?q=quer
+        /species/suggest?q=live oak&limit=5
+    """
+    query = request.args.get('q', '')
+
+    limit_param = request.args.get('limit')
+    try:
+        limit = int(limit_param) if limit_param is not None else DEFAULT_SUGGEST_LIMIT
+    except ValueError:
+        return jsonify({"error": f"Invalid limit: {limit_param}"}), 400
+    if not 1 <= limit <= MAX_SUGGEST_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_SUGGEST_LIMIT}"}), 400
+
+    return jsonify({
+        "query": query,
+        "suggestions": get_suggest_index().suggest(query, limit),
+    })
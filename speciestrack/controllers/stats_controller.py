@@ -0,0 +1,108 @@
+from datetime import date
+from flask import jsonify, request
+from sqlalchemy import Date, case, cast, func
+from speciestrack.models import db
+from speciestrack.models.observation_rollup import ObservationDailyRollup
+from speciestrack.utils.name_utils import species_key
+
+# Accepted bucket= values
+BUCKETS = ('day', 'week', 'month')
+DEFAULT_BUCKET = 'week'
+
+
+def bucket_start(bucket):
+    """
+    SQL expression for the first day of the bucket holding each rollup day.
+    Weeks start on Monday.
+
+    Args:
+        bucket: One of BUCKETS
+
+    Returns:
+        Date expression
+    """
+    day = ObservationDailyRollup.day
+    if bucket == 'day':
+        return day
+    if db.session.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc(bucket, day), Date)
+    # SQLite: 'weekday 0' moves forward to Sunday, six days back is that week's Monday
+    if bucket == 'week':
+        return func.date(day, 'weekday 0', '-6 days', type_=Date)
+    return func.date(day, 'start of month', type_=Date)
+
+
+def get_timeseries():
+    """
+    Return observation counts per day, week or month, read from the
+    precomputed daily rollups only.
+
+    Each bucket has record_count (GBIF records), observation_count (sum of
+    their observation counts), native_observation_count and species_count
+    (distinct species). Buckets without observations are left out.
+
+    Query Parameters:
+        bucket (str): day, week or month (default week)
+        species (str): Only this species; author and rank variants of the name are accepted
+        native (bool): Only native (true) or non-native (false) observations
+        start, end (str): First and last day to include, YYYY-MM-DD
+
+    Example:
+        /stats/timeseries?bucket=week&species=Quercus lobata
+        /stats/timeseries?bucket=month&native=true&start=2025-01-01
+    """
+    bucket = request.args.get('bucket', DEFAULT_BUCKET)
+    if bucket not in BUCKETS:
+        return jsonify({"error": f"Invalid bucket: {bucket}. Use one of {', '.join(BUCKETS)}"}), 400
+
+    start = bucket_start(bucket).label('start')
+    query = db.session.query(
+        start,
+        func.sum(ObservationDailyRollup.record_count),
+        func.sum(ObservationDailyRollup.observation_count),
+        func.sum(case((ObservationDailyRollup.native, ObservationDailyRollup.observation_count), else_=0)),
+        func.count(func.distinct(ObservationDailyRollup.species))
+    )
+
+    species = request.args.get('species')
+    if species:
+        species = species_key(species.strip())
+        query = query.filter(ObservationDailyRollup.species == species)
+
+    native = request.args.get('native')
+    if native is not None:
+        if native.lower() not in ('true', 'false', '1', '0'):
+            return jsonify({"error": f"Invalid native value: {native}"}), 400
+        query = query.filter(ObservationDailyRollup.native == (native.lower() in ('true', '1')))
+
+    dates = {}
+    for name in ('start', 'end'):
+        value = request.args.get(name)
+        if value:
+            try:
+                dates[name] = date.fromisoformat(value)
+            except ValueError:
+                return jsonify({"error": f"Invalid {name} date format. Use YYYY-MM-DD"}), 400
+    if 'start' in dates:
+        query = query.filter(ObservationDailyRollup.day >= dates['start'])
+    if 'end' in dates:
+        query = query.filter(ObservationDailyRollup.day <= dates['end'])
+    if 'start' in dates and 'end' in dates and dates['start'] > dates['end']:
+        return jsonify({"error": "start must not be after end"}), 400
+
+    rows = query.group_by(start).order_by(start).all()
+
+    return jsonify({
+        "bucket": bucket,
+        "species": species or None,
+        "results": [
+            {
+                "start": bucket_day.isoformat(),
+                "record_count": int(records),
+                "observation_count": int(observations),
+                "native_observation_count": int(native_observations),
+                "species_count": species_count,
+            }
+            for bucket_day, records, observations, native_observations, species_count in rows
+        ],
+    })
@@ -0,0 +1,308 @@
+"""
+Bulk write path for gbif_data rows.
+
+PostgreSQL rows are streamed with COPY into a temporary staging table and
+moved into gbif_data with one INSERT ... SELECT; other databases (SQLite in
+tests) use a single executemany INSERT. Both skip the ORM unit of work and
+use ON CONFLICT (occurrence_id) DO NOTHING, so an occurrence inserted by a
+concurrent run (regions with overlapping polygons) is skipped instead of
+failing the batch.
+
+Observations are keyed on occurrence_id: upsert_gbif_rows() inserts new
+occurrences, rewrites ones whose payload hash changed and skips the rest.
+Region membership is kept in region_occurrences, since overlapping regions
+share occurrences. gbif_data.region_id is the first region that stored the
+row: it is filled in once and never re-tagged or cleared afterwards.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from speciestrack.models import db, GbifData, RegionOccurrence
+from speciestrack.jobs.rollup_job import mark_rollup_days
+import csv
+import io
+
+# Counts returned by upsert_gbif_rows(); linked counts new region memberships
+UpsertResult = namedtuple("UpsertResult", ["inserted", "updated", "skipped", "linked"], defaults=[0])
+
+# Occurrence ids looked up per query, kept under SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+# Region memberships written per INSERT (two bound parameters each)
+LINK_CHUNK_SIZE = LOOKUP_CHUNK_SIZE // 2
+
+# Columns written by the bulk path, in COPY column order
+GBIF_INSERT_COLUMNS = [
+    "scientific_name",
+    "common_name",
+    "occurrence_id",
+    "observation_count",
+    "observation_type",
+    "native",
+    "decimal_latitude",
+    "decimal_longitude",
+    "event_date",
+    "payload_hash",
+    "region_id",
+    "fetch_date",
+]
+
+# created_at/updated_at are always set by the database clock (CURRENT_TIMESTAMP), the same
+# clock as the column defaults and re-classification, so updated_at can serve as a watermark
+
+# NULL marker used in COPY CSV data so that NULL and '' stay distinct
+COPY_NULL = "\\N"
+
+# Temporary table COPY writes into; dropped at the end of each transaction
+STAGING_TABLE = "gbif_data_staging"
+
+
+def _copy_value(value):
+    """Format a single value for PostgreSQL COPY CSV input"""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def rows_to_copy_buffer(rows, columns=GBIF_INSERT_COLUMNS):
+    """
+    Serialise rows to an in-memory CSV buffer for COPY ... FROM STDIN.
+
+    Args:
+        rows: List of dictionaries keyed by column name
+        columns: Column order to write
+
+    Returns:
+        StringIO positioned at the start of the data
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row.get(column)) for column in columns])
+    buffer.seek(0)
+    return buffer
+
+
+def copy_gbif_rows(rows):
+    """
+    Write rows to gbif_data with PostgreSQL COPY.
+    Runs in the current session transaction; the caller commits.
+
+    COPY cannot skip conflicting rows, so it fills a staging table and
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING moves the rows across.
+
+    Returns:
+        Number of rows inserted
+    """
+    buffer = rows_to_copy_buffer(rows)
+    columns = ", ".join(GBIF_INSERT_COLUMNS)
+    connection = db.session.connection()
+    connection.exec_driver_sql(
+        f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ON COMMIT DROP AS "
+        f"SELECT {columns} FROM {GbifData.__tablename__} WITH NO DATA"
+    )
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+    inserted = connection.exec_driver_sql(
+        f"INSERT INTO {GbifData.__tablename__} ({columns}, created_at, updated_at) "
+        f"SELECT {columns}, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM {STAGING_TABLE} "
+        f"ON CONFLICT (occurrence_id) DO NOTHING"
+    ).rowcount
+    # Several batches can share a transaction
+    connection.exec_driver_sql(f"TRUNCATE {STAGING_TABLE}")
+    return inserted
+
+
+def insert_gbif_rows(rows):
+    """
+    Insert rows into gbif_data using the fastest path for the database.
+    Runs in the current session transaction; the caller commits.
+    Rows whose occurrence_id is already stored are skipped.
+
+    Args:
+        rows: List of dictionaries of GbifData column values
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+
+    if db.session.get_bind().dialect.name == "postgresql":
+        return copy_gbif_rows(rows)
+
+    # executemany: one statement, one round trip per batch
+    stmt = sqlite_insert(GbifData.__table__).on_conflict_do_nothing(index_elements=["occurrence_id"])
+    return db.session.execute(stmt, rows).rowcount
+
+
+def _existing_occurrences(occurrence_ids):
+    """
+    Look up stored rows for a set of occurrence ids.
+
+    Returns:
+        Dictionary of occurrence_id -> (id, payload_hash, created_at, region_id, event_date)
+    """
+    existing = {}
+    occurrence_ids = list(occurrence_ids)
+    for start in range(0, len(occurrence_ids), LOOKUP_CHUNK_SIZE):
+        chunk = occurrence_ids[start:start + LOOKUP_CHUNK_SIZE]
+        rows = db.session.query(
+            GbifData.occurrence_id,
+            GbifData.id,
+            GbifData.payload_hash,
+            GbifData.created_at,
+            GbifData.region_id,
+            GbifData.event_date
+        ).filter(GbifData.occurrence_id.in_(chunk))
+        for occurrence_id, row_id, row_hash, created_at, region_id, event_date in rows:
+            existing[occurrence_id] = (row_id, row_hash, created_at, region_id, event_date)
+    return existing
+
+
+def _update_changed_rows(rows):
+    """
+    Rewrite stored occurrences whose payload changed or that have no region yet.
+
+    PostgreSQL uses INSERT ... ON CONFLICT (occurrence_id) DO UPDATE, guarded
+    so that a row is only rewritten when its payload hash differs or a region
+    is set for the first time, and keeping the stored region when there is
+    one. SQLite uses INSERT OR REPLACE with the stored id, so ids stay
+    stable; the caller has already filled in the stored region.
+    """
+    table = GbifData.__table__
+
+    if db.session.get_bind().dialect.name == "postgresql":
+        stmt = pg_insert(table)
+        update_columns = {
+            column: stmt.excluded[column]
+            for column in GBIF_INSERT_COLUMNS
+            if column != "occurrence_id"
+        }
+        update_columns["region_id"] = func.coalesce(table.c.region_id, stmt.excluded.region_id)
+        update_columns["updated_at"] = func.current_timestamp()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.occurrence_id],
+            set_=update_columns,
+            where=or_(
+                table.c.payload_hash.is_distinct_from(stmt.excluded.payload_hash),
+                and_(table.c.region_id.is_(None), stmt.excluded.region_id.isnot(None))
+            )
+        )
+        # The conflict target finds the stored row, so the stored id is not sent
+        params = [{key: value for key, value in row.items() if key != "id"} for row in rows]
+        db.session.execute(stmt, params)
+    else:
+        # updated_at is left to its CURRENT_TIMESTAMP default
+        db.session.execute(table.insert().prefix_with("OR REPLACE"), rows)
+
+
+def link_region_occurrences(rows):
+    """
+    Record the region membership of rows, ignoring memberships already stored.
+    Runs in the current session transaction; the caller commits.
+
+    Args:
+        rows: Row dictionaries; those with both region_id and occurrence_id are linked
+
+    Returns:
+        Number of new memberships
+    """
+    links = sorted({
+        (row["region_id"], row["occurrence_id"])
+        for row in rows
+        if row.get("region_id") is not None and row.get("occurrence_id") is not None
+    })
+    if not links:
+        return 0
+
+    table = RegionOccurrence.__table__
+    dialect_insert = pg_insert if db.session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    linked = 0
+    for start in range(0, len(links), LINK_CHUNK_SIZE):
+        values = [
+            {"region_id": region_id, "occurrence_id": occurrence_id}
+            for region_id, occurrence_id in links[start:start + LINK_CHUNK_SIZE]
+        ]
+        # One multi-row INSERT, so rowcount is the number of new links on both databases
+        stmt = dialect_insert(table).values(values).on_conflict_do_nothing(
+            index_elements=["region_id", "occurrence_id"]
+        )
+        linked += db.session.execute(stmt).rowcount
+    return linked
+
+
+def upsert_gbif_rows(rows):
+    """
+    Write rows into gbif_data keyed on occurrence_id.
+    Runs in the current session transaction; the caller commits.
+
+    - New occurrences go through the bulk insert path
+    - Stored occurrences with a different payload hash, or without a
+      region_id when the new row has one, are updated in place; a stored
+      region_id is never replaced or cleared
+    - Other stored occurrences are skipped
+    - Rows without an occurrence_id cannot be matched and are always inserted
+    - Rows with a region_id are linked to that region in region_occurrences
+
+    Args:
+        rows: List of dictionaries of GbifData column values, with payload_hash
+
+    Returns:
+        UpsertResult with inserted/updated/skipped/linked counts
+    """
+    unkeyed = []
+    keyed = {}
+    for row in rows:
+        occurrence_id = row.get("occurrence_id")
+        if occurrence_id is None:
+            unkeyed.append(row)
+        else:
+            # The same occurrence can appear twice in a batch; keep the last copy
+            row["occurrence_id"] = str(occurrence_id)
+            keyed[row["occurrence_id"]] = row
+
+    existing = _existing_occurrences(keyed.keys())
+
+    new_rows = list(unkeyed)
+    changed_rows = []
+    # Days an update moves an observation away from, which the rollups must recompute
+    moved_days = set()
+    for occurrence_id, row in keyed.items():
+        stored = existing.get(occurrence_id)
+        if stored is None:
+            new_rows.append(row)
+            continue
+        row_id, row_hash, created_at, region_id, event_date = stored
+        region_added = region_id is None and row.get("region_id") is not None
+        if row_hash != row.get("payload_hash") or region_added:
+            if region_id is not None:
+                row = {**row, "region_id": region_id}
+            changed_rows.append({**row, "id": row_id, "created_at": created_at})
+            new_event_date = row.get("event_date")
+            if event_date is not None and (new_event_date is None or new_event_date.date() != event_date.date()):
+                moved_days.add(event_date.date())
+
+    # Rows another run inserted since the lookup are skipped by the insert
+    inserted = insert_gbif_rows(new_rows)
+    if changed_rows:
+        _update_changed_rows(changed_rows)
+    mark_rollup_days(moved_days)
+    linked = link_region_occurrences(keyed.values())
+
+    skipped = len(rows) - inserted - len(changed_rows)
+    return UpsertResult(inserted, len(changed_rows), skipped, linked)
@@ -0,0 +1,168 @@
+"""
+Precomputed map clusters for /clusters.
+
+Located observations are binned into a Web Mercator grid at every zoom
+level from 0 to CLUSTER_MAX_ZOOM. A cell is CLUSTER_CELL_PIXELS wide on
+screen at its zoom, so a viewport holds about the same number of clusters
+at every zoom no matter how many observations there are.
+
+The finest level is aggregated from one pass over gbif_data; every coarser
+level is built by merging the four child cells of each cell. The whole
+table is replaced in one transaction, so readers see either the old or the
+new clusters.
+"""
+
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import insert
+from speciestrack.models import db, GbifData, ObservationCluster
+from speciestrack.utils.geometry_utils import mercator_cell
+from speciestrack.utils.name_utils import species_key
+import json
+import time
+import os
+
+# Map tiles are 256 pixels wide at every zoom
+TILE_PIXELS = 256
+
+# Rows read per round trip and written per INSERT
+CLUSTER_BATCH_SIZE = 5000
+
+
+def cluster_settings():
+    """
+    Cluster grid settings from the environment.
+
+    Returns:
+        (max_zoom, cell_pixels, top_species) tuple
+    """
+    return (
+        int(os.getenv("CLUSTER_MAX_ZOOM", "16")),
+        int(os.getenv("CLUSTER_CELL_PIXELS", "64")),
+        int(os.getenv("CLUSTER_TOP_SPECIES", "3")),
+    )
+
+
+def cells_per_axis(zoom, cell_pixels):
+    """Number of grid cells across the world at a zoom level"""
+    return (2 ** zoom) * TILE_PIXELS // cell_pixels
+
+
+class _Cell:
+    """Running aggregate of the observations in one grid cell"""
+
+    __slots__ = ("count", "native", "lon_sum", "lat_sum", "species")
+
+    def __init__(self):
+        self.count = 0
+        self.native = 0
+        self.lon_sum = 0.0
+        self.lat_sum = 0.0
+        self.species = Counter()
+
+    def merge(self, other):
+        self.count += other.count
+        self.native += other.native
+        self.lon_sum += other.lon_sum
+        self.lat_sum += other.lat_sum
+        self.species.update(other.species)
+
+
+def aggregate_finest_level(max_zoom, cell_pixels):
+    """
+    Bin every located observation into the grid of the finest zoom level.
+    Must be called inside a Flask app context.
+
+    Returns:
+        Dictionary of (cell_x, cell_y) -> _Cell
+    """
+    cells_count = cells_per_axis(max_zoom, cell_pixels)
+    cells = {}
+    species_cache = {}
+
+    rows = db.session.query(
+        GbifData.decimal_longitude,
+        GbifData.decimal_latitude,
+        GbifData.scientific_name,
+        GbifData.native
+    ).filter(
+        GbifData.decimal_longitude.isnot(None),
+        GbifData.decimal_latitude.isnot(None)
+    ).yield_per(CLUSTER_BATCH_SIZE)
+
+    for lon, lat, scientific_name, native in rows:
+        lon = float(lon)
+        lat = float(lat)
+        key = mercator_cell(lon, lat, cells_count)
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = _Cell()
+        cell.count += 1
+        cell.native += 1 if native else 0
+        cell.lon_sum += lon
+        cell.lat_sum += lat
+        cell.species[species_key(scientific_name, species_cache)] += 1
+
+    return cells
+
+
+def merge_to_parent_level(cells):
+    """Merge each 2x2 block of cells into the cell one zoom level up"""
+    parents = {}
+    for (x, y), cell in cells.items():
+        parent = parents.get((x >> 1, y >> 1))
+        if parent is None:
+            parent = parents[(x >> 1, y >> 1)] = _Cell()
+        parent.merge(cell)
+    return parents
+
+
+def _cluster_rows(zoom, cells, top_species):
+    for (x, y), cell in cells.items():
+        yield {
+            "zoom": zoom,
+            "cell_x": x,
+            "cell_y": y,
+            "longitude": cell.lon_sum / cell.count,
+            "latitude": cell.lat_sum / cell.count,
+            "observation_count": cell.count,
+            "native_count": cell.native,
+            "top_species": json.dumps(cell.species.most_common(top_species)),
+        }
+
+
+def refresh_observation_clusters():
+    """
+    Rebuild observation_clusters from gbif_data.
+    Must be called inside a Flask app context; commits.
+
+    Returns:
+        Number of clusters written across all zoom levels
+    """
+    max_zoom, cell_pixels, top_species = cluster_settings()
+    started = time.perf_counter()
+
+    cells = aggregate_finest_level(max_zoom, cell_pixels)
+
+    table = ObservationCluster.__table__
+    db.session.execute(table.delete())
+
+    written = 0
+    batch = []
+    for zoom in range(max_zoom, -1, -1):
+        if zoom < max_zoom:
+            cells = merge_to_parent_level(cells)
+        for row in _cluster_rows(zoom, cells, top_species):
+            batch.append(row)
+            if len(batch) >= CLUSTER_BATCH_SIZE:
+                db.session.execute(insert(table), batch)
+                written += len(batch)
+                batch = []
+    if batch:
+        db.session.execute(insert(table), batch)
+        written += len(batch)
+
+    db.session.commit()
+    print(f"[{datetime.now()}] Refreshed {written} observation clusters for zoom 0-{max_zoom} "
+          f"in {time.perf_counter() - started:.3f}s")
+    return written
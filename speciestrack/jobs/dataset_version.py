@@ -0,0 +1,54 @@
+"""
+Dataset version shared by every process.
+
+Jobs bump the version once their changes to gbif_data and the derived
+tables are committed. Web processes read it at most once every
+DATASET_VERSION_CHECK_SECONDS, so cached responses are served without a
+database round trip and go stale for at most that long after a run.
+"""
+
+from datetime import datetime
+from flask import current_app
+from speciestrack.models import db, DatasetVersion
+import time
+import os
+
+# Key of the (checked_at, version) pair in app.extensions
+EXTENSION_KEY = "dataset_version"
+
+
+def current_dataset_version():
+    """
+    Get the dataset version, re-reading it from the database when the
+    cached value is older than DATASET_VERSION_CHECK_SECONDS.
+    Must be called inside a Flask app context.
+
+    Returns:
+        Version number
+    """
+    interval = float(os.getenv("DATASET_VERSION_CHECK_SECONDS", "5"))
+    cached = current_app.extensions.get(EXTENSION_KEY)
+    if cached is not None and time.monotonic() - cached[0] < interval:
+        return cached[1]
+
+    version = DatasetVersion.current()
+    # Read-only; end the transaction so the connection is not held open
+    db.session.commit()
+    current_app.extensions[EXTENSION_KEY] = (time.monotonic(), version)
+    return version
+
+
+def bump_dataset_version():
+    """
+    Bump and commit the dataset version. This process sees the new
+    version immediately; others within DATASET_VERSION_CHECK_SECONDS.
+    Must be called inside a Flask app context.
+
+    Returns:
+        The new version
+    """
+    version = DatasetVersion.bump()
+    db.session.commit()
+    current_app.extensions[EXTENSION_KEY] = (time.monotonic(), version)
+    print(f"[{datetime.now()}] Dataset version is now {version}")
+    return version
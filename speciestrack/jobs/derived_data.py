@@ -0,0 +1,35 @@
+"""
+Tables derived from gbif_data, rebuilt after it changes.
+
+Every job that writes gbif_data calls refresh_derived_data() once it has
+committed, instead of each derived table hooking into the write path.
+"""
+
+from speciestrack.models import db
+from speciestrack.jobs.cluster_job import refresh_observation_clusters
+from speciestrack.jobs.rollup_job import refresh_observation_rollups
+from speciestrack.jobs.dataset_version import bump_dataset_version
+
+# Run in order after each ingestion. The version bump comes last so that a
+# response cached under the new version already sees the rebuilt tables.
+REFRESHERS = (
+    refresh_observation_clusters,
+    refresh_observation_rollups,
+    bump_dataset_version,
+)
+
+
+def refresh_derived_data():
+    """
+    Rebuild every table derived from gbif_data.
+    Must be called inside a Flask app context.
+
+    A failing refresh is logged and rolled back; the observations written
+    by the job are already committed and the next run refreshes again.
+    """
+    for refresh in REFRESHERS:
+        try:
+            refresh()
+        except Exception as e:
+            print(f"Error in {refresh.__name__}: {e}")
+            db.session.rollback()
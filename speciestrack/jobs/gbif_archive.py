@@ -0,0 +1,302 @@
+"""
+Bulk ingestion from GBIF occurrence download archives (Darwin Core Archive)
+
+The search API stops at MAX_OFFSET and returns JSON pages that are costly to
+parse. A DwC-A download has no offset ceiling: occurrence.txt is streamed row
+by row straight out of the zip (nothing is extracted to disk) and pushed
+through the same native matching and bulk insert pipeline as the search path.
+"""
+
+from datetime import datetime
+from speciestrack.models import db
+from speciestrack.jobs.gbif_job import (
+    GbifPage,
+    GbifFetchError,
+    WILDCAT_CANYON_POLYGON,
+    report_ingestion_stats
+)
+from speciestrack.jobs.native_plant_index import NativePlantIndex
+from speciestrack.jobs.derived_data import refresh_derived_data
+from speciestrack.jobs.ingest_pipeline import IngestionStats, run_ingestion_pipeline
+import xml.etree.ElementTree as ElementTree
+import requests
+import zipfile
+import csv
+import io
+import os
+import sys
+import time
+
+# Rows per page handed to the pipeline
+ARCHIVE_PAGE_SIZE = 1000
+
+DWC_TEXT_NAMESPACE = "{http://rs.tdwg.org/dwc/text/}"
+DEFAULT_DOWNLOAD_API_URL = "https://api.gbif.org/v1/occurrence/download"
+
+# Download statuses that will never become SUCCEEDED
+FAILED_DOWNLOAD_STATUSES = {"CANCELLED", "FAILED", "KILLED", "FILE_ERASED"}
+
+# occurrence.txt values can be long (e.g. remarks); lift the csv default limit
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+def _term_name(term):
+    """Short name of a Darwin Core term URI, e.g. .../terms/scientificName -> scientificName"""
+    return term.rstrip("/").rsplit("/", 1)[-1]
+
+
+def read_archive_layout(archive):
+    """
+    Find the core data file and its columns from the archive's meta.xml.
+    Archives without meta.xml are assumed to hold occurrence.txt with a
+    tab separated header row.
+
+    Args:
+        archive: Open zipfile.ZipFile
+
+    Returns:
+        Dictionary with location, delimiter, header_lines and columns
+        (term name -> column index, or None to read it from the header)
+    """
+    layout = {
+        "location": "occurrence.txt",
+        "delimiter": "\t",
+        "header_lines": 1,
+        "columns": None,
+    }
+
+    if "meta.xml" not in archive.namelist():
+        return layout
+
+    root = ElementTree.fromstring(archive.read("meta.xml"))
+    core = root.find(f"{DWC_TEXT_NAMESPACE}core")
+    if core is None:
+        return layout
+
+    location = core.find(f"{DWC_TEXT_NAMESPACE}files/{DWC_TEXT_NAMESPACE}location")
+    if location is not None and location.text:
+        layout["location"] = location.text.strip()
+
+    delimiter = core.get("fieldsTerminatedBy")
+    if delimiter:
+        layout["delimiter"] = delimiter.encode("utf-8").decode("unicode_escape")
+    layout["header_lines"] = int(core.get("ignoreHeaderLines", "0"))
+
+    columns = {}
+    for element in list(core.findall(f"{DWC_TEXT_NAMESPACE}id")) + list(core.findall(f"{DWC_TEXT_NAMESPACE}field")):
+        if element.get("index") is None:
+            continue
+        if element.get("term"):
+            columns[_term_name(element.get("term"))] = int(element.get("index"))
+        elif element.tag == f"{DWC_TEXT_NAMESPACE}id":
+            columns.setdefault("gbifID", int(element.get("index")))
+    layout["columns"] = columns or None
+
+    return layout
+
+
+def _to_float(value):
+    """Parse a coordinate, returning None for blanks"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_archive_row(values, columns):
+    """
+    Convert one occurrence.txt row into the observation dictionary the
+    search fetcher produces.
+
+    Returns:
+        Observation dictionary, or None if the row has no scientific name
+    """
+    def value(term):
+        index = columns.get(term)
+        if index is None or index >= len(values):
+            return None
+        return values[index] or None
+
+    name = value("scientificName")
+    if not name:
+        return None
+
+    return {
+        "name": name,
+        "type": "",
+        "count": 1,
+        "latitude": _to_float(value("decimalLatitude")),
+        "longitude": _to_float(value("decimalLongitude")),
+        "occurrence_id": value("gbifID"),  # Same key as the search API
+        "event_date": value("eventDate"),
+        "last_interpreted": value("lastInterpreted")
+    }
+
+
+def iter_archive_pages(archive_path, page_size=ARCHIVE_PAGE_SIZE):
+    """
+    Stream observations from a DwC-A zip without extracting it.
+
+    Args:
+        archive_path: Path to the downloaded archive
+        page_size: Observations per yielded page
+
+    Yields:
+        GbifPage objects whose offset is the row number of the first row
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        layout = read_archive_layout(archive)
+        print(f"Reading {layout['location']} from {archive_path}")
+
+        with archive.open(layout["location"]) as raw:
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            reader = csv.reader(text, delimiter=layout["delimiter"], quoting=csv.QUOTE_NONE)
+
+            columns = layout["columns"]
+            for line_number in range(layout["header_lines"]):
+                header = next(reader, None)
+                if line_number == 0 and columns is None and header is not None:
+                    columns = {name: index for index, name in enumerate(header)}
+            columns = columns or {}
+
+            offset = 0
+            observations = []
+            for row_number, values in enumerate(reader):
+                observation = parse_archive_row(values, columns)
+                if observation is not None:
+                    observations.append(observation)
+
+                if len(observations) >= page_size:
+                    yield GbifPage(offset, observations)
+                    offset = row_number + 1
+                    observations = []
+
+            if observations:
+                yield GbifPage(offset, observations)
+
+
+def build_download_predicate(dataset_key=None, geometry=None):
+    """
+    Build the GBIF download API predicate matching the search job's filters.
+    """
+    dataset_key = dataset_key if dataset_key is not None else os.getenv("DATASET_KEY")
+    predicates = [
+        {"type": "equals", "key": "HAS_COORDINATE", "value": "true"},
+        {"type": "equals", "key": "HAS_GEOSPATIAL_ISSUE", "value": "false"},
+        {"type": "equals", "key": "STATE_PROVINCE", "value": "California"},
+        {"type": "within", "geometry": geometry or WILDCAT_CANYON_POLYGON},
+    ]
+    if dataset_key:
+        predicates.insert(0, {"type": "equals", "key": "DATASET_KEY", "value": dataset_key})
+
+    return {"type": "and", "predicates": predicates}
+
+
+def request_gbif_download(destination, dataset_key=None, geometry=None, poll_seconds=60, timeout_seconds=6 * 3600):
+    """
+    Request a DwC-A download from the GBIF download API, wait for it to be
+    prepared and save the zip to `destination`.
+
+    Args:
+        destination: File path to write the archive to
+        dataset_key: GBIF dataset key (default: DATASET_KEY env var)
+        geometry: WKT polygon (default: Wildcat Canyon)
+        poll_seconds: Delay between status checks
+        timeout_seconds: Give up if the download is not ready by then
+
+    Returns:
+        destination
+
+    Raises:
+        GbifFetchError: If the request fails or the download does not succeed
+    """
+    api_url = os.getenv("GBIF_DOWNLOAD_API_URL", DEFAULT_DOWNLOAD_API_URL).rstrip("/")
+    username = os.getenv("GBIF_USERNAME")
+    password = os.getenv("GBIF_PASSWORD")
+
+    response = requests.post(
+        f"{api_url}/request",
+        json={
+            "creator": username,
+            "format": "DWCA",
+            "predicate": build_download_predicate(dataset_key, geometry),
+        },
+        auth=(username, password),
+        timeout=30
+    )
+    if response.status_code not in (200, 201):
+        raise GbifFetchError(f"Error requesting GBIF download: {response.status_code} - {response.text}")
+
+    download_key = response.text.strip()
+    print(f"Requested GBIF download {download_key}")
+
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        status_response = requests.get(f"{api_url}/{download_key}", timeout=30)
+        if status_response.status_code != 200:
+            raise GbifFetchError(
+                f"Error checking GBIF download {download_key}: {status_response.status_code} - {status_response.text}"
+            )
+
+        download = status_response.json()
+        status = download.get("status")
+        print(f"GBIF download {download_key} status: {status}")
+
+        if status == "SUCCEEDED":
+            break
+        if status in FAILED_DOWNLOAD_STATUSES:
+            raise GbifFetchError(f"GBIF download {download_key} ended with status {status}")
+        if time.monotonic() > deadline:
+            raise GbifFetchError(f"GBIF download {download_key} not ready after {timeout_seconds}s")
+        time.sleep(poll_seconds)
+
+    with requests.get(download["downloadLink"], stream=True, timeout=60) as archive_response:
+        if archive_response.status_code != 200:
+            raise GbifFetchError(f"Error downloading GBIF archive {download_key}: {archive_response.status_code}")
+        with open(destination, "wb") as f:
+            for chunk in archive_response.iter_content(chunk_size=1024 * 1024):
+                f.write(chunk)
+
+    print(f"Saved GBIF download {download_key} to {destination}")
+    return destination
+
+
+def store_gbif_archive(app, archive_path):
+    """
+    Ingest a DwC-A zip through the same matching and bulk insert pipeline
+    as the daily search job. Observations are upserted on occurrence_id,
+    so archives that overlap earlier runs do not create duplicates.
+
+    Args:
+        app: Flask application
+        archive_path: Path to a local DwC-A zip
+
+    Returns:
+        IngestionStats for the run, or None if the job failed
+    """
+    with app.app_context():
+        print(f"[{datetime.now()}] Starting GBIF archive import from {archive_path}...")
+        stats = IngestionStats()
+
+        try:
+            native_index = NativePlantIndex.load()
+            print(f"Loaded {len(native_index)} native plant names for matching")
+
+            run_ingestion_pipeline(iter_archive_pages(archive_path), native_index, stats=stats)
+
+            if not stats.fetch_complete:
+                print("Archive could not be read to the end; rows read so far were stored")
+
+            report_ingestion_stats(stats)
+            return stats
+
+        except Exception as e:
+            print(f"Error in GBIF archive import: {e}")
+            db.session.rollback()
+        finally:
+            # Batches committed before a failure are visible too, so caches must not outlive them
+            if stats.inserted or stats.updated or stats.linked:
+                refresh_derived_data()
+            db.session.close()
@@ -0,0 +1,221 @@
+"""
+Record/replay disk cache for GBIF search responses.
+
+Successful page and count responses are stored gzip-compressed on disk,
+keyed by the request URL and its normalised query parameters. Entries
+expire after a TTL, and the least recently used entries are evicted once
+the cache grows past its size limit.
+
+The date query of a run without a watermark (today's month, year and day of
+year) is left out of the key and stored in the entry instead, so a run
+recorded on one day can be replayed on any later day. In record mode an
+entry recorded for another day is refetched.
+
+Modes:
+    off     No caching (default)
+    record  Serve fresh entries from the cache, fetch and store the rest
+    replay  Serve every request from the cache and never touch the network;
+            a missing entry raises GbifCacheMiss. TTL is ignored so a
+            recorded run can be replayed at any time.
+"""
+
+from speciestrack.jobs.gbif_client import GbifFetchError
+import hashlib
+import gzip
+import json
+import os
+import threading
+import time
+
+CACHE_MODES = ("off", "record", "replay")
+
+# Search parameters derived from the current date (see build_search_params)
+DATE_PARAMS = ("start_day_of_year", "month", "year")
+
+
+class GbifCacheMiss(GbifFetchError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache entry"""
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+        self.from_cache = True
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _normalise_params(params):
+    """Query parameters as sorted (name, value) strings, without empty values"""
+    return sorted(
+        (str(name), str(value)) for name, value in (params or {}).items()
+        if value is not None and value != ""
+    )
+
+
+def _date_params(params):
+    """The date-derived parameters of a query, as stored with its entry"""
+    return [[name, value] for name, value in _normalise_params(params) if name in DATE_PARAMS]
+
+
+def cache_key(url, params):
+    """
+    Build a cache key from a URL and query parameters.
+    Parameters are stringified and sorted, and empty values dropped, so
+    equivalent queries share an entry whatever order they were built in.
+    Date-derived parameters (DATE_PARAMS) are left out of the key.
+    """
+    normalised = [
+        (name, value) for name, value in _normalise_params(params)
+        if name not in DATE_PARAMS
+    ]
+    payload = json.dumps([url, normalised], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GbifResponseCache:
+    """Thread-safe gzip file cache of GBIF responses"""
+
+    def __init__(self, directory, mode="record", ttl_seconds=24 * 3600, max_bytes=500 * 1024 * 1024):
+        """
+        Args:
+            directory: Folder holding the cache entries
+            mode: "record" or "replay"
+            ttl_seconds: Age after which entries are refetched in record mode (0 keeps them forever)
+            max_bytes: Total size of entries kept on disk
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown GBIF cache mode: {mode}")
+
+        self.directory = directory
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.size = None  # Bytes on disk, scanned on first write
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build a cache from GBIF_CACHE_MODE, GBIF_CACHE_DIR,
+        GBIF_CACHE_TTL_HOURS and GBIF_CACHE_MAX_MB.
+
+        Returns:
+            GbifResponseCache, or None when caching is off
+        """
+        mode = os.getenv("GBIF_CACHE_MODE", "off").lower()
+        if mode == "off":
+            return None
+
+        return cls(
+            directory=os.getenv("GBIF_CACHE_DIR", ".gbif_cache"),
+            mode=mode,
+            ttl_seconds=float(os.getenv("GBIF_CACHE_TTL_HOURS", "24")) * 3600,
+            max_bytes=int(float(os.getenv("GBIF_CACHE_MAX_MB", "500")) * 1024 * 1024),
+        )
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def _entries(self):
+        """(mtime, size, path) of every entry on disk"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json.gz"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, url, params):
+        """
+        Look up a response.
+
+        Returns:
+            CachedResponse, or None if there is no usable entry
+
+        Raises:
+            GbifCacheMiss: In replay mode, if the request was never recorded
+        """
+        path = self._path(cache_key(url, params))
+
+        try:
+            age = time.time() - os.path.getmtime(path)
+            expired = self.mode == "record" and self.ttl_seconds and age > self.ttl_seconds
+            if not expired:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    entry = json.load(f)
+                # Replay serves the recorded day's query; record refetches another day's
+                if self.mode == "replay" or entry.get("date_params", []) == _date_params(params):
+                    # Mark as recently used for eviction
+                    os.utime(path)
+                    with self.lock:
+                        self.hits += 1
+                    return CachedResponse(entry["status_code"], entry["text"])
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            pass
+
+        with self.lock:
+            self.misses += 1
+        if self.mode == "replay":
+            raise GbifCacheMiss(f"No cached GBIF response for {url} with {params} (replay mode)")
+        return None
+
+    def put(self, url, params, response):
+        """Store a successful response; other statuses are not cached"""
+        if self.mode != "record" or response.status_code != 200:
+            return
+
+        path = self._path(cache_key(url, params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        data = gzip.compress(
+            json.dumps({
+                "status_code": response.status_code,
+                "text": response.text,
+                "date_params": _date_params(params),
+            }).encode("utf-8")
+        )
+        # Write to a temporary file first so readers never see a partial entry
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+
+        with self.lock:
+            # An existing entry for the key is replaced, so its size no longer counts
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temp_path, path)
+            if self.size is None:
+                self.size = sum(size for _, size, _ in self._entries())
+            else:
+                self.size += len(data) - replaced
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache is under max_bytes"""
+        entries = sorted(self._entries())
+        self.size = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
@@ -0,0 +1,199 @@
+"""
+HTTP client for the GBIF occurrence search API.
+
+One pooled requests.Session is shared by every page request in a run, so
+connections are kept alive between pages. Transient failures (429 and 5xx
+responses, connection errors, timeouts) are retried with exponential
+backoff and jitter, honouring Retry-After, and a token bucket caps the
+request rate across all threads. An optional GbifResponseCache
+(gbif_cache.py) answers repeated requests from disk.
+"""
+
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+import threading
+import requests
+import random
+import time
+import os
+
+# Responses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GbifFetchError(Exception):
+    """Raised when the GBIF API returns an error response"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Allows bursts of up to `capacity` requests and `rate` requests per second
+    on average.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header (delay in seconds or an HTTP date).
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class GbifClient:
+    """Pooled, retrying, rate limited client for GBIF occurrence search"""
+
+    def __init__(self, url, username=None, password=None, pool_size=10, max_retries=4,
+                 backoff_base=1.0, backoff_max=60.0, rate_limit=10.0, timeout=30, cache=None):
+        """
+        Args:
+            url: Occurrence search endpoint
+            username: GBIF username for basic auth
+            password: GBIF password for basic auth
+            pool_size: Keep-alive connections kept in the pool
+            max_retries: Retries after the first attempt for transient errors
+            backoff_base: First backoff delay in seconds, doubled on each retry
+            backoff_max: Upper bound for a single backoff delay
+            rate_limit: Requests per second across all threads (0 disables)
+            timeout: Per-request timeout in seconds
+            cache: Optional GbifResponseCache for record/replay
+        """
+        self.url = url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit and rate_limit > 0 else None
+
+        self.session = requests.Session()
+        if username or password:
+            self.session.auth = (username, password)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+        })
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_env(cls, pool_size=10):
+        """Build a client from the GBIF_* environment variables"""
+        from speciestrack.jobs.gbif_cache import GbifResponseCache
+
+        return cls(
+            url=os.getenv("GBIF_API_URL"),
+            username=os.getenv("GBIF_USERNAME"),
+            password=os.getenv("GBIF_PASSWORD"),
+            pool_size=pool_size,
+            max_retries=int(os.getenv("GBIF_MAX_RETRIES", "4")),
+            backoff_base=float(os.getenv("GBIF_BACKOFF_SECONDS", "1.0")),
+            rate_limit=float(os.getenv("GBIF_RATE_LIMIT", "10")),
+            cache=GbifResponseCache.from_env(),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close pooled connections"""
+        if self.cache is not None:
+            print(f"GBIF response cache ({self.cache.mode}): {self.cache.hits} hits, {self.cache.misses} misses")
+        self.session.close()
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """
+        Delay before retry number `attempt` (starting at 0).
+        Uses Retry-After when the server sent one, otherwise exponential
+        backoff with full jitter.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def get(self, params):
+        """
+        GET the search endpoint, retrying transient failures.
+        With a cache, cached responses are returned without a request and
+        successful responses are recorded.
+
+        Args:
+            params: Query parameters
+
+        Returns:
+            The final requests.Response; callers check status_code
+
+        Raises:
+            requests.RequestException: If the last attempt failed to connect
+            GbifCacheMiss: If the cache is in replay mode and has no entry
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.url, params)
+            if cached is not None:
+                return cached
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                response = self.session.get(self.url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"GBIF request failed ({e}); retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    if self.cache is not None:
+                        self.cache.put(self.url, params, response)
+                    return response
+                delay = self.backoff_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+                print(f"GBIF returned {response.status_code}; retrying in {delay:.1f}s")
+
+            time.sleep(delay)
+            attempt += 1
@@ -2,192 +2,710 @@
 Scheduled job to fetch and store GBIF data daily
 """
 
-from datetime import datetime
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from speciestrack.models import db, GbifData, NativePlant
+from speciestrack.models import db, GbifSyncState, GbifJobRun, Region
+from speciestrack.jobs.gbif_client import GbifClient, GbifFetchError
+from speciestrack.jobs.native_plant_index import NativePlantIndex
+from speciestrack.jobs.derived_data import refresh_derived_data
+from speciestrack.jobs.ingest_pipeline import IngestionStats, run_ingestion_pipeline
 from speciestrack.utils.date_utils import get_date_json
-import requests
+from speciestrack.utils.geometry_utils import (
+    parse_wkt_polygon,
+    polygon_bounds,
+    point_in_polygon,
+    quadtree_tiles,
+    get_bounding_box_polygon
+)
+import multiprocessing
+import threading
+import queue
 import os
 
 load_dotenv()
 
+# Constants for pagination
+LIMIT = 300  # Maximum allowed by GBIF API
+MAX_OFFSET = 100000  # Maximum offset allowed by GBIF API
 
-def fetch_gbif_data_raw():
+# Wildcat Canyon Regional Park
+WILDCAT_CANYON_POLYGON = "POLYGON((-122.28112 37.91874,-122.27067 37.92392,-122.27061 37.92138,-122.26765 37.92143,-122.262 37.92416,-122.2659 37.93392,-122.27042 37.93614,-122.28178 37.94702,-122.28391 37.9473,-122.28559 37.95072,-122.29028 37.95304,-122.28642 37.95197,-122.28435 37.95408,-122.29229 37.95429,-122.2975 37.95679,-122.29822 37.95575,-122.29613 37.95525,-122.29899 37.95366,-122.30203 37.95487,-122.30175 37.95264,-122.30828 37.95267,-122.30794 37.96,-122.31055 37.96004,-122.31557 37.9594,-122.31875 37.95404,-122.3244 37.95385,-122.32226 37.95131,-122.3163 37.95097,-122.31596 37.94868,-122.3138 37.94836,-122.31248 37.94682,-122.31136 37.94882,-122.30721 37.9454,-122.31131 37.9456,-122.31168 37.94403,-122.3101 37.94503,-122.29522 37.93138,-122.29224 37.93069,-122.29064 37.92924,-122.2918 37.92726,-122.28112 37.91874),(-122.31321 37.95783,-122.31039 37.95636,-122.31337 37.95701,-122.31321 37.95783))"
+
+# One page of parsed observations, the offset it was fetched from and the
+# key of the spatial tile it belongs to (None when the query was not tiled)
+GbifPage = namedtuple("GbifPage", ["offset", "observations", "tile"], defaults=(None,))
+
+# A spatial tile of the query polygon: quadtree key, WKT geometry sent to
+# GBIF, bounding box and the record count from its probe
+GbifTile = namedtuple("GbifTile", ["key", "geometry", "bounds", "count"])
+
+# Marks the end of one tile worker's pages
+_TILE_DONE = object()
+
+# How long tile workers wait on a full queue before re-checking the stop flag
+_POLL_SECONDS = 0.1
+
+
+def parse_gbif_results(results):
     """
-    Fetch occurrence data from GBIF API and return raw data.
-    This is a non-Flask version for use in scheduled jobs.
-    Paginates through all results using limit and offset.
+    Extract the fields we store from a page of GBIF occurrence results.
+    Results without a scientificName are skipped.
+    """
+    observations = []
+    for item in results:
+        name = item.get("scientificName")
+        if name:
+            observations.append({
+                "name": name,
+                "type": "",
+                "count": 1,
+                "latitude": item.get("decimalLatitude"),
+                "longitude": item.get("decimalLongitude"),
+                "occurrence_id": item.get("key"),  # GBIF occurrence key/ID
+                "event_date": item.get("eventDate"),  # Date when observation occurred
+                "last_interpreted": item.get("lastInterpreted")  # When GBIF last processed the record
+            })
+    return observations
+
+
+def build_search_params(dataset_key=None, geometry=None, since=None):
     """
-    url = os.getenv("GBIF_API_URL")
-    username = os.getenv("GBIF_USERNAME")
-    password = os.getenv("GBIF_PASSWORD")
-    date_info = get_date_json()
+    Build the GBIF occurrence search filters for a job run.
 
-    # Constants for pagination
-    LIMIT = 300  # Maximum allowed by GBIF API
-    MAX_OFFSET = 100000  # Maximum offset allowed by GBIF API
+    Without a watermark the query is limited to today's month, year and
+    day of year. With one, only records GBIF interpreted at or after the
+    watermark are requested, whatever their event date.
 
-    all_species_data = []
-    offset = 0
+    Args:
+        dataset_key: GBIF dataset key (default: DATASET_KEY env var)
+        geometry: WKT polygon to search (default: Wildcat Canyon)
+        since: Naive UTC datetime watermark for incremental sync
 
-    # Using bounding box from Wildcat Canyon Regional Park
-    base_params = {
-        "dataset_key": os.getenv("DATASET_KEY"),
+    Returns:
+        Dictionary of query parameters, without limit/offset
+    """
+    params = {
+        "dataset_key": dataset_key if dataset_key is not None else os.getenv("DATASET_KEY"),
         "has_coordinate": "true",
         "has_geospatial_issue": "false",
         "state_province": "California",
         "advanced": "1",
-        "start_day_of_year": date_info["day"],
-        "month": date_info["month"],
-        "year": date_info["year"],
-        "geometry": "POLYGON((-122.28112 37.91874,-122.27067 37.92392,-122.27061 37.92138,-122.26765 37.92143,-122.262 37.92416,-122.2659 37.93392,-122.27042 37.93614,-122.28178 37.94702,-122.28391 37.9473,-122.28559 37.95072,-122.29028 37.95304,-122.28642 37.95197,-122.28435 37.95408,-122.29229 37.95429,-122.2975 37.95679,-122.29822 37.95575,-122.29613 37.95525,-122.29899 37.95366,-122.30203 37.95487,-122.30175 37.95264,-122.30828 37.95267,-122.30794 37.96,-122.31055 37.96004,-122.31557 37.9594,-122.31875 37.95404,-122.3244 37.95385,-122.32226 37.95131,-122.3163 37.95097,-122.31596 37.94868,-122.3138 37.94836,-122.31248 37.94682,-122.31136 37.94882,-122.30721 37.9454,-122.31131 37.9456,-122.31168 37.94403,-122.3101 37.94503,-122.29522 37.93138,-122.29224 37.93069,-122.29064 37.92924,-122.2918 37.92726,-122.28112 37.91874),(-122.31321 37.95783,-122.31039 37.95636,-122.31337 37.95701,-122.31321 37.95783))",
+        "geometry": geometry or WILDCAT_CANYON_POLYGON,
     }
 
-    print(f"Starting pagination: limit={LIMIT}, max_offset={MAX_OFFSET}")
+    if since is not None:
+        params["last_interpreted"] = f"{since.strftime('%Y-%m-%dT%H:%M:%S')},*"
+    else:
+        date_info = get_date_json()
+        params["start_day_of_year"] = date_info["day"]
+        params["month"] = date_info["month"]
+        params["year"] = date_info["year"]
 
-    try:
-        while offset <= MAX_OFFSET:
+    return params
+
+
+def fetch_gbif_pages(concurrency=None, dataset_key=None, geometry=None, since=None, client=None, start_offset=0):
+    """
+    Fetch occurrence data from GBIF API one page at a time.
+    Paginates through all results using limit and offset, yielding a
+    GbifPage for each non-empty page so callers never hold the full
+    result set in memory.
+
+    Up to `concurrency` page requests are kept in flight at once. Pages are
+    still yielded in offset order, and no new pages are scheduled once a
+    short or empty page shows the end of the results.
+
+    Args:
+        concurrency: Number of page requests in flight
+                     (default: GBIF_FETCH_CONCURRENCY env var, or 1)
+        dataset_key: GBIF dataset key (default: DATASET_KEY env var)
+        geometry: WKT polygon to search (default: Wildcat Canyon)
+        since: Only fetch records interpreted at or after this UTC datetime
+        client: GbifClient to use (default: one built from the environment,
+                closed when the generator finishes)
+        start_offset: Offset of the first page, to resume from a checkpoint
+
+    Raises:
+        GbifFetchError: If the API returns a non-200 response after retries
+    """
+    if concurrency is None:
+        concurrency = int(os.getenv("GBIF_FETCH_CONCURRENCY", "1"))
+    concurrency = max(1, concurrency)
+
+    owns_client = client is None
+    if owns_client:
+        client = GbifClient.from_env(pool_size=concurrency)
+
+    next_offset = start_offset
+
+    base_params = build_search_params(dataset_key=dataset_key, geometry=geometry, since=since)
+
+    # Page requests in flight, as (offset, future) in offset order
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    in_flight = deque()
+
+    def schedule_pages():
+        nonlocal next_offset
+        while len(in_flight) < concurrency and next_offset <= MAX_OFFSET:
             # Add pagination parameters
             params = base_params.copy()
             params["limit"] = LIMIT
-            params["offset"] = offset
-
-            print(f"Fetching page at offset {offset}...")
-
-            response = requests.get(url, params=params, auth=(username, password), timeout=30)
-
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get("results", [])
-
-                # If no results, we've reached the end
-                if not results:
-                    print(f"No more results at offset {offset}. Pagination complete.")
-                    break
-
-                # Process results
-                page_count = 0
-                for item in results:
-                    name = item.get("scientificName")
-                    if name:
-                        all_species_data.append({
-                            "name": name,
-                            "type": "",
-                            "count": 1,
-                            "latitude": item.get("decimalLatitude"),
-                            "longitude": item.get("decimalLongitude"),
-                            "occurrence_id": item.get("key"),  # GBIF occurrence key/ID
-                            "event_date": item.get("eventDate")  # Date when observation occurred
-                        })
-                        page_count += 1
-
-                print(f"Fetched {page_count} observations from offset {offset}")
-
-                # If we got fewer results than the limit, we've reached the end
-                if len(results) < LIMIT:
-                    print(f"Received {len(results)} results (less than limit of {LIMIT}). Pagination complete.")
-                    break
-
-                # Move to next page
-                offset += LIMIT
+            params["offset"] = next_offset
 
-            else:
-                print(f"Error fetching data from GBIF API at offset {offset}: {response.status_code} - {response.text}")
-                break
+            print(f"Fetching page at offset {next_offset}...")
+
+            future = executor.submit(client.get, params)
+            in_flight.append((next_offset, future))
+            next_offset += LIMIT
+
+    print(f"Starting pagination: limit={LIMIT}, max_offset={MAX_OFFSET}, concurrency={concurrency}")
+
+    try:
+        schedule_pages()
+
+        while in_flight:
+            offset, future = in_flight.popleft()
+            response = future.result()
+
+            if response.status_code != 200:
+                raise GbifFetchError(
+                    f"Error fetching data from GBIF API at offset {offset}: {response.status_code} - {response.text}"
+                )
+
+            data = response.json()
+            results = data.get("results", [])
+
+            # If no results, we've reached the end
+            if not results:
+                print(f"No more results at offset {offset}. Pagination complete.")
+                return
+
+            observations = parse_gbif_results(results)
+            print(f"Fetched {len(observations)} observations from offset {offset}")
+
+            # If we got fewer results than the limit, this is the last page
+            last_page = len(results) < LIMIT
+            if not last_page:
+                # Keep the window of in-flight pages full
+                schedule_pages()
+
+            yield GbifPage(offset, observations)
+
+            if last_page:
+                print(f"Received {len(results)} results (less than limit of {LIMIT}). Pagination complete.")
+                return
+
+    finally:
+        # Drop pages scheduled past the end of the results
+        for _, future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
+        if owns_client:
+            client.close()
+
+
+def count_gbif_occurrences(client, params):
+    """
+    Probe how many records a query matches without fetching any of them.
+
+    Args:
+        client: GbifClient to use
+        params: Search parameters, without limit/offset
+
+    Returns:
+        Record count reported by GBIF
+
+    Raises:
+        GbifFetchError: If the API returns a non-200 response after retries
+    """
+    probe_params = params.copy()
+    probe_params["limit"] = 0
+
+    response = client.get(probe_params)
+    if response.status_code != 200:
+        raise GbifFetchError(f"Error counting GBIF records: {response.status_code} - {response.text}")
+
+    return int(response.json().get("count", 0))
+
+
+def plan_gbif_tiles(client, base_params, max_count, max_depth=8):
+    """
+    Split the query polygon into tiles small enough to page through.
+
+    The polygon's bounding box is split as a quadtree, probing each tile's
+    record count, until every tile holds at most `max_count` records. When
+    the whole polygon already fits, a single tile querying the polygon
+    itself is returned.
+
+    Args:
+        client: GbifClient used for the count probes
+        base_params: Search parameters including the polygon geometry
+        max_count: Largest record count allowed in one tile
+        max_depth: Maximum number of quadtree splits
+
+    Returns:
+        List of GbifTile objects
+    """
+    geometry = base_params["geometry"]
+    rings = parse_wkt_polygon(geometry)
+
+    def count(bounds):
+        params = base_params.copy()
+        params["geometry"] = get_bounding_box_polygon(*bounds)
+        return count_gbif_occurrences(client, params)
+
+    tiles = []
+    for key, bounds, tile_count in quadtree_tiles(polygon_bounds(rings), count, max_count, max_depth, rings):
+        if tile_count > MAX_OFFSET + LIMIT:
+            print(f"Tile {key or 'root'} still has {tile_count} records at max depth; results past {MAX_OFFSET} are skipped")
+        # The root tile fits as it is, so query the polygon itself
+        tile_geometry = geometry if key == "" else get_bounding_box_polygon(*bounds)
+        tiles.append(GbifTile(key, tile_geometry, bounds, tile_count))
+
+    return tiles
+
+
+def tiles_to_checkpoint(tiles):
+    """Tile plan as JSON-serialisable [key, bounds, count] lists"""
+    return [[tile.key, list(tile.bounds), tile.count] for tile in tiles]
+
+
+def tiles_from_checkpoint(saved, geometry):
+    """
+    Rebuild a tile plan saved with tiles_to_checkpoint.
+
+    Args:
+        saved: List of [key, bounds, count] lists
+        geometry: WKT polygon of the query, used for the root tile
+    """
+    return [
+        GbifTile(key, geometry if key == "" else get_bounding_box_polygon(*bounds), tuple(bounds), count)
+        for key, bounds, count in saved
+    ]
+
+
+def fetch_gbif_tiles(concurrency=None, dataset_key=None, geometry=None, since=None, client=None,
+                     max_count=None, max_depth=None, tiles=None, start_offsets=None, on_plan=None,
+                     page_concurrency=None):
+    """
+    Fetch occurrence data for a polygon as parallel spatial tiles.
+
+    A single query is paginated through one stream and capped at MAX_OFFSET.
+    Here the polygon is split into a quadtree of bounding box tiles using
+    GBIF count probes, and each tile is paginated by its own worker, so
+    large regions are fetched in parallel and no tile hits the offset cap.
+
+    The page requests in flight are shared between the tiles being fetched:
+    a single tile keeps all `page_concurrency` requests in flight, and with
+    several tiles each gets an even share (at least one).
+
+    Observations from bounding box tiles are filtered back to the polygon.
+    A record lying exactly on a shared tile edge can be returned by both
+    tiles, so records on tile edges are de-duplicated by occurrence_id.
+
+    Args:
+        concurrency: Number of tiles fetched at once
+                     (default: GBIF_TILE_CONCURRENCY env var, or 4)
+        dataset_key: GBIF dataset key (default: DATASET_KEY env var)
+        geometry: WKT polygon to search (default: Wildcat Canyon)
+        since: Only fetch records interpreted at or after this UTC datetime
+        client: GbifClient to use (default: one built from the environment,
+                closed when the generator finishes)
+        max_count: Largest record count for one tile
+                   (default: GBIF_TILE_MAX_COUNT env var, or 20000)
+        max_depth: Maximum quadtree depth (default: GBIF_TILE_MAX_DEPTH env var, or 8)
+        tiles: Tile plan to reuse instead of probing counts (when resuming)
+        start_offsets: Dictionary of tile key -> offset to start that tile from
+        on_plan: Optional callback receiving the tile plan before any page is fetched
+        page_concurrency: Page requests in flight across all tiles
+                          (default: GBIF_FETCH_CONCURRENCY env var, or 1)
+
+    Yields:
+        GbifPage objects tagged with their tile key. Pages from different
+        tiles are interleaved; offsets are relative to each tile.
+
+    Raises:
+        GbifFetchError: If a count probe or page request fails after retries
+    """
+    if concurrency is None:
+        concurrency = int(os.getenv("GBIF_TILE_CONCURRENCY", "4"))
+    concurrency = max(1, concurrency)
+    if page_concurrency is None:
+        page_concurrency = int(os.getenv("GBIF_FETCH_CONCURRENCY", "1"))
+    page_concurrency = max(1, page_concurrency)
+    if max_count is None:
+        max_count = int(os.getenv("GBIF_TILE_MAX_COUNT", "20000"))
+    max_count = min(max_count, MAX_OFFSET + LIMIT)
+    if max_depth is None:
+        max_depth = int(os.getenv("GBIF_TILE_MAX_DEPTH", "8"))
+
+    owns_client = client is None
+    if owns_client:
+        client = GbifClient.from_env(pool_size=max(concurrency, page_concurrency))
+
+    base_params = build_search_params(dataset_key=dataset_key, geometry=geometry, since=since)
+    rings = parse_wkt_polygon(base_params["geometry"])
+
+    pages = queue.Queue(maxsize=concurrency * 2)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    start_offsets = start_offsets or {}
+    # Page requests in flight per tile, set once the tile plan is known
+    tile_page_concurrency = 1
+
+    def fetch_tile(tile):
+        tile_pages = fetch_gbif_pages(
+            concurrency=tile_page_concurrency, dataset_key=dataset_key, geometry=tile.geometry, since=since, client=client,
+            start_offset=start_offsets.get(tile.key, 0)
+        )
+        try:
+            for page in tile_pages:
+                if not put((tile, page)):
+                    return
+            put((tile, _TILE_DONE))
+        except Exception as e:
+            put((tile, e))
+        finally:
+            tile_pages.close()
+
+    try:
+        if tiles is None:
+            tiles = plan_gbif_tiles(client, base_params, max_count, max_depth)
+        if on_plan is not None:
+            on_plan(tiles)
+        tile_page_concurrency = max(1, page_concurrency // max(1, min(concurrency, len(tiles))))
+        print(f"Fetching {len(tiles)} tiles with concurrency={concurrency}, "
+              f"{tile_page_concurrency} page requests per tile")
+
+        for tile in tiles:
+            executor.submit(fetch_tile, tile)
+
+        # occurrence_ids already yielded for records on a tile edge
+        edge_ids = set()
+        remaining = len(tiles)
+
+        while remaining:
+            tile, item = pages.get()
+            if item is _TILE_DONE:
+                remaining -= 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+
+            observations = item.observations
+            if tile.key:
+                observations = []
+                for observation in item.observations:
+                    lon, lat = observation.get("longitude"), observation.get("latitude")
+                    if lon is None or lat is None:
+                        observations.append(observation)
+                        continue
+                    if not point_in_polygon(lon, lat, rings):
+                        continue
+                    min_lon, min_lat, max_lon, max_lat = tile.bounds
+                    if lon in (min_lon, max_lon) or lat in (min_lat, max_lat):
+                        if observation.get("occurrence_id") in edge_ids:
+                            continue
+                        edge_ids.add(observation.get("occurrence_id"))
+                    observations.append(observation)
+
+            if observations:
+                yield GbifPage(item.offset, observations, tile.key)
+
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        if owns_client:
+            client.close()
+
+
+def fetch_gbif_data_raw(concurrency=None, client=None):
+    """
+    Fetch occurrence data from GBIF API and return raw data.
+    This is a non-Flask version for use in scheduled jobs.
+    Thin wrapper that collects every page from fetch_gbif_pages().
+    """
+    all_species_data = []
+
+    try:
+        for page in fetch_gbif_pages(concurrency=concurrency, client=client):
+            all_species_data.extend(page.observations)
 
         print(f"Pagination finished. Total observations fetched: {len(all_species_data)}")
         return all_species_data
 
+    except GbifFetchError as e:
+        print(e)
+        return all_species_data  # Return what we've collected so far
+
     except Exception as e:
         print(f"Exception while fetching GBIF data: {e}")
         return all_species_data  # Return what we've collected so far
 
 
-def store_gbif_data(app):
+def store_gbif_data(app, full_sync=False, resume=False, region_id=None, refresh=True):
     """
     Scheduled job function to fetch and store GBIF data.
     Runs daily at 12pm.
+
+    The polygon is fetched as parallel spatial tiles, and pages stream
+    through parsing, native matching and batched inserts, with a commit
+    per batch.
+
+    Runs are incremental: only records GBIF interpreted since the stored
+    watermark for this dataset and polygon are requested. The watermark
+    is advanced only after every page has been fetched and committed.
+
+    Every run is recorded in gbif_job_run with a checkpoint of the pages
+    stored so far, written in the same transaction as each batch. With
+    `resume`, an unfinished run continues from its checkpoint using the
+    same query and tile plan instead of starting again.
+
+    Args:
+        app: Flask application
+        full_sync: Ignore the stored watermark and run the default query
+        resume: Continue the latest unfinished run for this query, if any
+        region_id: Region to fetch; its rows are tagged with region_id.
+                   Without one the Wildcat Canyon polygon is fetched untagged.
+        refresh: Rebuild the derived tables (map clusters) and bump the
+                 dataset version if rows changed, even if the run then failed
+
+    Returns:
+        IngestionStats for the run, or None if the job failed
     """
     with app.app_context():
         print(f"[{datetime.now()}] Starting GBIF data fetch job...")
 
+        job_run = None
+        # Counts of committed batches, kept if the run fails part way
+        stats = IngestionStats()
         try:
-            # Fetch data from GBIF API
-            species_data = fetch_gbif_data_raw()
+            dataset_key = os.getenv("DATASET_KEY")
+            geometry = WILDCAT_CANYON_POLYGON
+            row_values = None
+
+            if region_id is not None:
+                region = db.session.get(Region, region_id)
+                if region is None:
+                    raise ValueError(f"Unknown region id {region_id}")
+                print(f"Region: {region.name}")
+                dataset_key = region.dataset_key or dataset_key
+                geometry = region.geometry
+                row_values = {"region_id": region.id}
+
+            sync_state = GbifSyncState.for_query(dataset_key, geometry)
+            db.session.commit()
 
-            if not species_data:
-                print("No species data retrieved from GBIF API")
-                return
+            if resume:
+                job_run = GbifJobRun.resumable(dataset_key, geometry)
+                if job_run is None:
+                    print("No unfinished run to resume: starting a new run")
+
+            tiles = None
+            start_offsets = None
+            if job_run is not None:
+                since = job_run.since
+                checkpoint = job_run.load_checkpoint()
+                if checkpoint["tiles"] is not None:
+                    tiles = tiles_from_checkpoint(checkpoint["tiles"], geometry)
+                start_offsets = checkpoint["offsets"]
+                job_run.status = GbifJobRun.STATUS_RUNNING
+                print(f"Resuming run {job_run.id} ({job_run.rows_stored} rows already stored)")
+            else:
+                since = None
+                if sync_state.watermark is not None and not full_sync:
+                    # Overlap the previous run a little; unchanged rows are skipped on upsert
+                    overlap = timedelta(minutes=int(os.getenv("GBIF_SYNC_OVERLAP_MINUTES", "60")))
+                    since = sync_state.watermark - overlap
+                    print(f"Incremental sync: fetching records interpreted since {since.isoformat()}")
+                else:
+                    print("No sync watermark in use: running the default date query")
+                job_run = GbifJobRun.start(dataset_key, geometry, since)
+            db.session.commit()
 
-            # Store each observation in the database
-            stored_count = 0
-            native_count = 0
-            fetch_time = datetime.now()
+            # Load native plant names once so matching runs in memory
+            native_index = NativePlantIndex.load()
+            print(f"Loaded {len(native_index)} native plant names for matching")
+
+            # Tile plan of this run, saved with the first checkpoint
+            plan = {"tiles": tiles_to_checkpoint(tiles) if tiles is not None else None}
+
+            def save_plan(planned_tiles):
+                plan["tiles"] = tiles_to_checkpoint(planned_tiles)
+
+            def record_checkpoint(positions, rows, result):
+                job_run.record_batch(plan["tiles"], positions, result.inserted + result.updated, LIMIT)
+
+            stats = run_ingestion_pipeline(
+                fetch_gbif_tiles(
+                    dataset_key=dataset_key, geometry=geometry, since=since,
+                    tiles=tiles, start_offsets=start_offsets, on_plan=save_plan
+                ),
+                native_index,
+                on_batch=record_checkpoint,
+                row_values=row_values,
+                stats=stats
+            )
+
+            # Every batch is committed at this point; only a complete fetch moves the watermark
+            if stats.fetch_complete:
+                job_run.finish(GbifJobRun.STATUS_COMPLETED, stats.max_last_interpreted)
+                advance_sync_watermark(sync_state, job_run.max_last_interpreted)
+            else:
+                job_run.finish(GbifJobRun.STATUS_FAILED, stats.max_last_interpreted, "Fetch did not complete")
+                db.session.commit()
+                print(f"Fetch did not complete; sync watermark not advanced. Resume run {job_run.id} with --resume")
 
-            for item in species_data:
-                try:
-                    scientific_name = item.get("name", "")
-
-                    # Check if this species is in the native_plants table
-                    # GBIF includes author names (e.g. "Artemisia californica Less.")
-                    # while native_plants table has just the species name
-                    # We check if the GBIF name starts with any botanical_name from native_plants
-
-                    # First try exact match
-                    native_plant = NativePlant.query.filter_by(botanical_name=scientific_name).first()
-
-                    # If no exact match, check if GBIF name starts with a native plant name + space
-                    # This handles the case where GBIF has "Species name Author" and we have "Species name"
-                    if not native_plant:
-                        # Extract just genus and species (first two words) from GBIF name
-                        words = scientific_name.split()
-                        if len(words) >= 2:
-                            genus_species = f"{words[0]} {words[1]}"
-                            native_plant = NativePlant.query.filter(
-                                NativePlant.botanical_name.like(f"{genus_species}%")
-                            ).first()
-
-                    # Determine if native and get common name
-                    is_native = native_plant is not None
-                    common_name = native_plant.common_name if native_plant is not None else None
-
-                    # Parse event_date if present
-                    event_date = None
-                    if item.get("event_date"):
-                        try:
-                            event_date = datetime.fromisoformat(item.get("event_date").replace('Z', '+00:00'))
-                        except (ValueError, AttributeError):
-                            event_date = None
-
-                    gbif_entry = GbifData(
-                        scientific_name=scientific_name,
-                        common_name=common_name,
-                        occurrence_id=item.get("occurrence_id"),
-                        observation_count=item.get("count", 1),
-                        observation_type=item.get("type", ""),
-                        native=is_native,
-                        decimal_latitude=item.get("latitude"),
-                        decimal_longitude=item.get("longitude"),
-                        event_date=event_date,
-                        fetch_date=fetch_time
-                    )
-                    db.session.add(gbif_entry)
-                    stored_count += 1
-
-                    if is_native:
-                        native_count += 1
-
-                except Exception as e:
-                    print(f"Error storing entry for {item.get('name')}: {e}")
-                    continue
-
-            # Commit all entries
-            db.session.commit()
-            print(f"[{datetime.now()}] Successfully stored {stored_count} GBIF observations")
-            print(f"[{datetime.now()}] Native plants found: {native_count} ({native_count/stored_count*100:.1f}%)")
+            report_ingestion_stats(stats)
+            return stats
 
         except Exception as e:
             print(f"Error in GBIF data job: {e}")
             db.session.rollback()
+            if job_run is not None and job_run.id is not None:
+                try:
+                    job_run.finish(GbifJobRun.STATUS_FAILED, error=str(e))
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
         finally:
+            # Batches committed before a failure are visible too, so caches must not outlive them
+            if refresh and (stats.inserted or stats.updated or stats.linked):
+                refresh_derived_data()
             db.session.close()
+
+
+def store_region(region_id, full_sync=False, resume=False, database_uri=None):
+    """
+    Ingest one region in a worker process of store_all_regions().
+    Builds its own app, since Flask apps cannot be sent between processes.
+
+    Returns:
+        IngestionStats for the run, or None if the job failed
+    """
+    from speciestrack.main import create_app
+
+    config = {"SQLALCHEMY_DATABASE_URI": database_uri} if database_uri else None
+    # store_all_regions() refreshes the derived tables once every region is done
+    return store_gbif_data(create_app(config), full_sync=full_sync, resume=resume, region_id=region_id, refresh=False)
+
+
+def store_all_regions(app, full_sync=False, resume=False, max_workers=None):
+    """
+    Ingest every active region, running regions concurrently in a bounded
+    process pool. Each region is an independent store_gbif_data run with
+    its own watermark, checkpoint and tiles. Without any regions the
+    default Wildcat Canyon polygon is fetched.
+
+    The GBIF request rate limit is shared out between the worker processes.
+
+    Args:
+        app: Flask application
+        full_sync: Ignore the stored watermarks and run the default query
+        resume: Continue each region's latest unfinished run, if any
+        max_workers: Regions ingested at once
+                     (default: GBIF_REGION_CONCURRENCY env var, or 4;
+                     1 runs regions one after another in this process)
+
+    Returns:
+        Dictionary of region name -> IngestionStats (None for failed regions)
+    """
+    with app.app_context():
+        regions = [(region.id, region.name) for region in Region.query.filter_by(active=True).order_by(Region.id)]
+        database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+
+    if not regions:
+        print("No active regions configured; fetching the default polygon")
+        return {None: store_gbif_data(app, full_sync=full_sync, resume=resume)}
+
+    if max_workers is None:
+        max_workers = int(os.getenv("GBIF_REGION_CONCURRENCY", "4"))
+    max_workers = max(1, min(max_workers, len(regions)))
+    print(f"[{datetime.now()}] Ingesting {len(regions)} regions, {max_workers} at a time")
+
+    results = {}
+    if max_workers == 1:
+        for region_id, name in regions:
+            results[name] = store_gbif_data(app, full_sync=full_sync, resume=resume, region_id=region_id, refresh=False)
+    else:
+        # Each process gets its share of the request rate so the total stays under the limit
+        saved_rate_limit = os.environ.get("GBIF_RATE_LIMIT")
+        os.environ["GBIF_RATE_LIMIT"] = str(float(saved_rate_limit or "10") / max_workers)
+        try:
+            # spawn: the scheduler's threads must not be forked into the workers
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = {
+                    executor.submit(store_region, region_id, full_sync, resume, database_uri): name
+                    for region_id, name in regions
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        print(f"Region {name} failed: {e}")
+                        results[name] = None
+        finally:
+            if saved_rate_limit is None:
+                del os.environ["GBIF_RATE_LIMIT"]
+            else:
+                os.environ["GBIF_RATE_LIMIT"] = saved_rate_limit
+
+    for name, stats in results.items():
+        summary = f"{stats.stored} stored, {stats.native} native" if stats is not None else "failed"
+        print(f"Region {name}: {summary}")
+
+    # A failed region may still have committed batches before it failed
+    if any(stats is None or stats.inserted or stats.updated or stats.linked for stats in results.values()):
+        with app.app_context():
+            refresh_derived_data()
+    return results
+
+
+def report_ingestion_stats(stats):
+    """Print the summary of an ingestion run"""
+    if not stats.fetched:
+        print("No species data retrieved from GBIF API")
+        return
+
+    print(f"Native matching took {stats.stage_seconds['match']:.3f}s for {stats.fetched} observations")
+    if stats.match_reasons:
+        reasons = ", ".join(f"{reason}={count}" for reason, count in stats.match_reasons.most_common())
+        print(f"Match reasons: {reasons}")
+    print(
+        f"[{datetime.now()}] Successfully stored {stats.stored} GBIF observations in {stats.batches} batches "
+        f"({stats.inserted} new, {stats.updated} updated, {stats.skipped} unchanged)"
+    )
+    print(f"Insert took {stats.stage_seconds['insert']:.3f}s ({stats.insert_rows_per_second:.0f} rows/sec)")
+    if stats.processed:
+        print(f"[{datetime.now()}] Native plants found: {stats.native} ({stats.native/stats.processed*100:.1f}%)")
+
+
+def advance_sync_watermark(sync_state, last_interpreted):
+    """
+    Record a successful sync. The watermark only moves forward.
+
+    Args:
+        sync_state: GbifSyncState for the query that was run
+        last_interpreted: Newest lastInterpreted stored by the run, or None
+    """
+    if last_interpreted is not None and (
+        sync_state.watermark is None or last_interpreted > sync_state.watermark
+    ):
+        sync_state.watermark = last_interpreted
+        print(f"Sync watermark advanced to {last_interpreted.isoformat()}")
+
+    sync_state.last_success_at = datetime.now()
+    db.session.commit()
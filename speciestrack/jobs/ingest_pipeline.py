@@ -0,0 +1,358 @@
+"""
+Streaming fetch -> parse -> match -> insert pipeline for GBIF observations.
+
+Each stage runs in its own thread and hands work to the next one through a
+bounded queue, so only a few pages are held in memory at any time no matter
+how many observations the query returns. Rows are committed in batches.
+"""
+
+from collections import Counter
+from datetime import datetime
+from speciestrack.models import db
+from speciestrack.jobs.bulk_insert import upsert_gbif_rows
+from speciestrack.utils.date_utils import parse_gbif_timestamp
+import hashlib
+import json
+import queue
+import threading
+import time
+import os
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# How long blocked stages wait before re-checking the stop flag
+_POLL_SECONDS = 0.1
+
+
+class IngestionStats:
+    """Counters and per-stage timings for one pipeline run"""
+
+    def __init__(self):
+        self.pages = 0
+        self.fetched = 0
+        self.processed = 0
+        self.stored = 0
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.linked = 0  # New region memberships of stored occurrences
+        self.native = 0
+        self.errors = 0
+        self.batches = 0
+        self.fetch_complete = True
+        self.max_last_interpreted = None  # Newest GBIF lastInterpreted seen, for the sync watermark
+        self.match_reasons = Counter()  # Rows per NativePlantIndex match reason
+        self.stage_seconds = {"fetch": 0.0, "parse": 0.0, "match": 0.0, "insert": 0.0}
+
+    @property
+    def insert_rows_per_second(self):
+        """Rows handled per second of time spent in the insert stage"""
+        seconds = self.stage_seconds["insert"]
+        return self.processed / seconds if seconds else 0.0
+
+
+# Observation fields that make up the payload hash
+_PAYLOAD_FIELDS = ("name", "type", "count", "latitude", "longitude", "occurrence_id", "event_date")
+
+
+def parse_event_date(value):
+    """Parse a GBIF eventDate string, returning None if it is missing or not ISO 8601"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _payload_value(item, field):
+    """
+    Value of a payload field in the form the search API returns it, so an
+    occurrence read from an archive (string keys and coordinates, other
+    eventDate spellings) hashes the same as when it is fetched from the API.
+    """
+    value = item.get(field)
+    if value is None:
+        return None
+    if field == "occurrence_id" and isinstance(value, str) and value.isdigit():
+        return int(value)
+    if field in ("latitude", "longitude"):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+    if field == "event_date":
+        event_date = parse_event_date(value)
+        return event_date.isoformat() if event_date is not None else value
+    return value
+
+
+def payload_hash(item):
+    """
+    Hash the GBIF fields of an observation so that re-fetched rows whose
+    payload has not changed can be skipped on upsert.
+    """
+    payload = json.dumps([_payload_value(item, field) for field in _PAYLOAD_FIELDS], default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parse_observation(item, fetch_time):
+    """
+    Convert a fetched observation into a gbif_data row.
+
+    Args:
+        item: Observation dictionary produced by the fetcher
+        fetch_time: Timestamp shared by every row in the run
+
+    Returns:
+        Dictionary of GbifData column values
+    """
+    event_date = parse_event_date(item.get("event_date"))
+
+    return {
+        "scientific_name": item.get("name", ""),
+        "common_name": None,
+        "occurrence_id": item.get("occurrence_id"),
+        "observation_count": item.get("count", 1),
+        "observation_type": item.get("type", ""),
+        "native": False,
+        "decimal_latitude": item.get("latitude"),
+        "decimal_longitude": item.get("longitude"),
+        "event_date": event_date,
+        "payload_hash": payload_hash(item),
+        "fetch_date": fetch_time,
+    }
+
+
+def insert_batch(rows, before_commit=None):
+    """
+    Upsert a batch of gbif_data rows and commit.
+    Must be called inside a Flask app context.
+
+    Args:
+        rows: List of gbif_data row dictionaries
+        before_commit: Optional callback(result) run after the upsert and
+                       before the commit
+
+    Returns:
+        UpsertResult with inserted/updated/skipped counts
+    """
+    result = upsert_gbif_rows(rows)
+    if before_commit is not None:
+        before_commit(result)
+    db.session.commit()
+    return result
+
+
+def _put(q, item, stop):
+    """Put an item on a queue, giving up if the pipeline is stopping"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q, stop):
+    """Get an item from a queue, returning _DONE if the pipeline is stopping"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def run_ingestion_pipeline(pages, native_index, batch_size=None, queue_size=None, on_batch=None, row_values=None,
+                           stats=None):
+    """
+    Stream pages of observations through parse, native matching and
+    batched inserts. Must be called inside a Flask app context.
+
+    If the page source fails part way, the rows already fetched are still
+    stored and stats.fetch_complete is set to False.
+
+    Args:
+        pages: Iterable of GbifPage (offset, observations) tuples
+        native_index: NativePlantIndex used to flag native plants
+        batch_size: Rows per insert transaction
+                    (default: GBIF_INSERT_BATCH_SIZE env var, or 1000)
+        queue_size: Pages buffered between stages
+                    (default: GBIF_PIPELINE_QUEUE_SIZE env var, or 4)
+        on_batch: Optional callback(positions, rows, result) run in the
+                  caller's thread just before each batch is committed, so
+                  anything it adds to the session is committed with the
+                  batch. positions lists the (tile, offset) of every page in
+                  the batch and result is its UpsertResult.
+        row_values: Optional column values set on every row (e.g. region_id)
+        stats: Optional IngestionStats to fill in, so the caller still has
+               the counts of committed batches if the pipeline raises
+
+    Returns:
+        IngestionStats for the run
+    """
+    if batch_size is None:
+        batch_size = int(os.getenv("GBIF_INSERT_BATCH_SIZE", "1000"))
+    if queue_size is None:
+        queue_size = int(os.getenv("GBIF_PIPELINE_QUEUE_SIZE", "4"))
+
+    if stats is None:
+        stats = IngestionStats()
+    stop = threading.Event()
+    fetch_time = datetime.now()
+
+    parse_queue = queue.Queue(maxsize=queue_size)
+    match_queue = queue.Queue(maxsize=queue_size)
+    insert_queue = queue.Queue(maxsize=queue_size)
+
+    def fetch_stage():
+        iterator = iter(pages)
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    page = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    stats.stage_seconds["fetch"] += time.perf_counter() - started
+
+                stats.pages += 1
+                stats.fetched += len(page.observations)
+                position = (getattr(page, "tile", None), page.offset)
+                if not _put(parse_queue, (position, page.observations), stop):
+                    break
+        except Exception as e:
+            print(f"Exception while fetching GBIF data: {e}")
+            stats.fetch_complete = False
+        finally:
+            # Release any requests the source still has in flight
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    def parse_stage():
+        while True:
+            item = _get(parse_queue, stop)
+            if item is _DONE:
+                return
+            position, observations = item
+
+            started = time.perf_counter()
+            rows = []
+            for item in observations:
+                try:
+                    row = parse_observation(item, fetch_time)
+                    if row_values:
+                        row.update(row_values)
+                    rows.append(row)
+
+                    last_interpreted = parse_gbif_timestamp(item.get("last_interpreted"))
+                    if last_interpreted and (
+                        stats.max_last_interpreted is None or last_interpreted > stats.max_last_interpreted
+                    ):
+                        stats.max_last_interpreted = last_interpreted
+                except Exception as e:
+                    print(f"Error storing entry for {item.get('name')}: {e}")
+                    stats.errors += 1
+            stats.stage_seconds["parse"] += time.perf_counter() - started
+
+            if not _put(match_queue, (position, rows), stop):
+                return
+
+    def match_stage():
+        while True:
+            item = _get(match_queue, stop)
+            if item is _DONE:
+                return
+            position, rows = item
+
+            started = time.perf_counter()
+            matches = native_index.match_batch(row["scientific_name"] for row in rows)
+            for row, (native_plant, reason) in zip(rows, matches):
+                stats.match_reasons[reason] += 1
+                if native_plant is not None:
+                    row["native"] = True
+                    row["common_name"] = native_plant[1]
+            stats.stage_seconds["match"] += time.perf_counter() - started
+
+            if not _put(insert_queue, (position, rows), stop):
+                return
+
+    # Unexpected stage failures are re-raised once the pipeline has stopped
+    stage_errors = []
+
+    def run_stage(stage, output_queue):
+        try:
+            stage()
+        except Exception as e:
+            stage_errors.append(e)
+            stop.set()
+        finally:
+            _put(output_queue, _DONE, stop)
+
+    def flush(batch, positions):
+        started = time.perf_counter()
+        checkpoint = None
+        if on_batch is not None:
+            def checkpoint(result):
+                on_batch(positions, batch, result)
+        result = insert_batch(batch, before_commit=checkpoint)
+        elapsed = time.perf_counter() - started
+        stats.stage_seconds["insert"] += elapsed
+        stats.batches += 1
+        stats.processed += len(batch)
+        stats.inserted += result.inserted
+        stats.updated += result.updated
+        stats.skipped += result.skipped
+        stats.linked += result.linked
+        stats.stored += result.inserted + result.updated
+        stats.native += sum(1 for row in batch if row["native"])
+        print(
+            f"Committed batch {stats.batches}: {len(batch)} rows in {elapsed:.3f}s "
+            f"({len(batch) / max(elapsed, 1e-9):.0f} rows/sec; "
+            f"{result.inserted} new, {result.updated} updated, {result.skipped} unchanged)"
+        )
+
+    threads = [
+        threading.Thread(target=run_stage, args=(stage, output_queue), name=f"gbif-{stage.__name__}", daemon=True)
+        for stage, output_queue in (
+            (fetch_stage, parse_queue),
+            (parse_stage, match_queue),
+            (match_stage, insert_queue),
+        )
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Insert stage runs here so it keeps the caller's app context
+    try:
+        batch = []
+        positions = []
+        while True:
+            item = _get(insert_queue, stop)
+            if item is _DONE:
+                break
+            position, rows = item
+
+            # Batches hold whole pages
+            batch.extend(rows)
+            positions.append(position)
+            if len(batch) >= batch_size:
+                flush(batch, positions)
+                batch = []
+                positions = []
+
+        if batch and not stage_errors:
+            flush(batch, positions)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if stage_errors:
+        raise stage_errors[0]
+
+    return stats
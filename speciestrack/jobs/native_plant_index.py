@@ -0,0 +1,157 @@
+"""
+In-memory index of native plant names used to match GBIF observations
+"""
+
+from speciestrack.models import db, NativePlant
+from speciestrack.utils.name_utils import normalize_scientific_name, split_name_list
+
+# Match reasons, from most to least specific
+MATCH_EXACT = "exact"
+MATCH_CANONICAL = "canonical"
+MATCH_SYNONYM = "synonym"
+MATCH_OBSOLETE = "obsolete"
+MATCH_SPECIES = "species"
+MATCH_SYNONYM_SPECIES = "synonym_species"
+MATCH_NONE = "unmatched"
+
+
+class NativePlantIndex:
+    """
+    Lookup structure built once per job run from the native_plants table.
+
+    Botanical names, synonyms (other_names) and obsolete names are all
+    normalised with normalize_scientific_name() into dict keys, and a GBIF
+    name is tried against them in order:
+    1. Exact match on botanical_name
+    2. Canonical name (authors stripped, rank and hybrid marker normalised)
+       against botanical names
+    3. Canonical name against synonyms, then obsolete names
+    4. Genus + species against botanical names, which lets a GBIF species
+       match a variety or subspecies in the catalog
+    5. Genus + species against synonyms and obsolete names
+
+    Results are memoised by raw name, so each distinct GBIF name is only
+    normalised once per run.
+    """
+
+    def __init__(self, plants):
+        """
+        Build the index.
+
+        Args:
+            plants: Iterable of (botanical_name, common_name[, other_names[, obsolete_names]])
+                    tuples in id order. When several plants share a key the
+                    first one wins, and a botanical name always wins over
+                    another plant's synonym.
+        """
+        self.exact = {}
+        self.canonical = {}
+        self.species = {}
+        self.synonyms = {}
+        self.obsolete = {}
+        self.synonym_species = {}
+        self._memo = {}
+
+        alternate_names = []
+        for botanical_name, common_name, *rest in plants:
+            entry = (botanical_name, common_name)
+            self.exact.setdefault(botanical_name, entry)
+
+            normalized = normalize_scientific_name(botanical_name)
+            if normalized is not None:
+                self.canonical.setdefault(normalized.canonical, entry)
+                self.species.setdefault(normalized.species, entry)
+
+            other_names = rest[0] if len(rest) > 0 else None
+            obsolete_names = rest[1] if len(rest) > 1 else None
+            alternate_names.append((entry, other_names, obsolete_names))
+
+        # Synonyms are indexed after every botanical name so they never shadow one
+        for entry, other_names, obsolete_names in alternate_names:
+            for names, lookup in ((other_names, self.synonyms), (obsolete_names, self.obsolete)):
+                for name in split_name_list(names):
+                    normalized = normalize_scientific_name(name)
+                    if normalized is None:
+                        continue
+                    lookup.setdefault(normalized.canonical, entry)
+                    self.synonym_species.setdefault(normalized.species, entry)
+
+    @classmethod
+    def load(cls):
+        """
+        Load every native plant name and synonym in a single query.
+        Must be called inside a Flask app context.
+        """
+        rows = db.session.query(
+            NativePlant.botanical_name,
+            NativePlant.common_name,
+            NativePlant.other_names,
+            NativePlant.obsolete_names
+        ).order_by(NativePlant.id).all()
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.exact)
+
+    def match_with_reason(self, scientific_name):
+        """
+        Find the native plant matching a GBIF scientific name.
+
+        Args:
+            scientific_name: Name as returned by GBIF, possibly with authors
+
+        Returns:
+            ((botanical_name, common_name) or None, reason) where reason is
+            one of the MATCH_* constants
+        """
+        result = self._memo.get(scientific_name)
+        if result is None:
+            result = self._lookup(scientific_name)
+            self._memo[scientific_name] = result
+        return result
+
+    def _lookup(self, scientific_name):
+        entry = self.exact.get(scientific_name)
+        if entry is not None:
+            return entry, MATCH_EXACT
+
+        normalized = normalize_scientific_name(scientific_name)
+        if normalized is None:
+            return None, MATCH_NONE
+
+        for lookup, key, reason in (
+            (self.canonical, normalized.canonical, MATCH_CANONICAL),
+            (self.synonyms, normalized.canonical, MATCH_SYNONYM),
+            (self.obsolete, normalized.canonical, MATCH_OBSOLETE),
+            (self.species, normalized.species, MATCH_SPECIES),
+            (self.synonym_species, normalized.species, MATCH_SYNONYM_SPECIES),
+        ):
+            entry = lookup.get(key)
+            if entry is not None:
+                return entry, reason
+
+        return None, MATCH_NONE
+
+    def match(self, scientific_name):
+        """
+        Find the native plant matching a GBIF scientific name.
+
+        Args:
+            scientific_name: Name as returned by GBIF, possibly with authors
+
+        Returns:
+            (botanical_name, common_name) tuple, or None if not native
+        """
+        return self.match_with_reason(scientific_name)[0]
+
+    def match_batch(self, scientific_names):
+        """
+        Match a batch of GBIF scientific names.
+
+        Args:
+            scientific_names: Iterable of names
+
+        Returns:
+            List of (entry, reason) tuples in input order, as match_with_reason()
+        """
+        return [self.match_with_reason(name) for name in scientific_names]
@@ -0,0 +1,172 @@
+"""
+Re-classify the native status of stored GBIF observations.
+
+The native and common_name columns of gbif_data are set when a row is
+ingested. After the native_plants catalog changes they go stale, and
+payload-hash upserts never rewrite them because the GBIF payload itself has
+not changed. This job recomputes them from the database alone: distinct
+scientific names are matched in memory with NativePlantIndex, and only the
+names whose stored values differ are rewritten in batches of names.
+
+PostgreSQL rewrites each batch with one UPDATE ... FROM (VALUES ...) join;
+other databases (SQLite in tests) use a single executemany UPDATE keyed on
+scientific_name.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import Boolean, String, bindparam, column, func, or_, update, values
+from speciestrack.models import db, GbifData
+from speciestrack.jobs.native_plant_index import NativePlantIndex
+from speciestrack.jobs.derived_data import refresh_derived_data
+import time
+import os
+
+# Counts returned by reclassify_native_status()
+ReclassifyResult = namedtuple("ReclassifyResult", ["names", "changed_names", "updated"])
+
+
+def changed_classifications(native_index):
+    """
+    Find the scientific names whose stored native status is out of date.
+    Must be called inside a Flask app context.
+
+    Args:
+        native_index: NativePlantIndex built from the current catalog
+
+    Returns:
+        (distinct name count, dictionary of scientific_name -> (native, common_name))
+        holding only the names that need rewriting
+    """
+    # One row per name and stored classification; a name is stale if any group differs
+    groups = db.session.query(
+        GbifData.scientific_name,
+        GbifData.native,
+        GbifData.common_name
+    ).group_by(GbifData.scientific_name, GbifData.native, GbifData.common_name)
+
+    names = set()
+    changed = {}
+    for scientific_name, native, common_name in groups:
+        names.add(scientific_name)
+        native_plant = native_index.match(scientific_name)
+        target = (True, native_plant[1]) if native_plant is not None else (False, None)
+        if (bool(native), common_name) != target:
+            changed[scientific_name] = target
+    return len(names), changed
+
+
+def _values_join_update(table, chunk):
+    """UPDATE gbif_data ... FROM (VALUES ...) for one batch of names"""
+    batch = values(
+        column("scientific_name", String),
+        column("native", Boolean),
+        column("common_name", String),
+        name="reclassified"
+    ).data([(row["name"], row["target_native"], row["target_common_name"]) for row in chunk])
+
+    return (
+        update(table)
+        .where(table.c.scientific_name == batch.c.scientific_name)
+        .where(or_(
+            table.c.native.is_distinct_from(batch.c.native),
+            table.c.common_name.is_distinct_from(batch.c.common_name)
+        ))
+        .values(native=batch.c.native, common_name=batch.c.common_name, updated_at=func.current_timestamp())
+    )
+
+
+def update_classifications(changed, batch_size, on_commit=None):
+    """
+    Rewrite native/common_name for a set of names, committing once per batch.
+    Must be called inside a Flask app context.
+
+    Args:
+        changed: Dictionary of scientific_name -> (native, common_name)
+        batch_size: Names per UPDATE statement
+        on_commit: Optional callback(rows) run after each batch is committed
+                   with the rows it updated, so the caller still knows what
+                   was committed if a later batch raises
+
+    Returns:
+        Number of rows updated
+    """
+    table = GbifData.__table__
+    items = list(changed.items())
+    postgresql = db.session.get_bind().dialect.name == "postgresql"
+    updated = 0
+
+    for start in range(0, len(items), batch_size):
+        batch_updated = 0
+        chunk = [
+            {"name": name, "target_native": native, "target_common_name": common_name}
+            for name, (native, common_name) in items[start:start + batch_size]
+        ]
+        if postgresql:
+            batch_updated = db.session.execute(_values_join_update(table, chunk)).rowcount
+        else:
+            stmt = (
+                update(table)
+                .where(table.c.scientific_name == bindparam("name"))
+                .where(or_(
+                    table.c.native.is_distinct_from(bindparam("target_native")),
+                    table.c.common_name.is_distinct_from(bindparam("target_common_name"))
+                ))
+                .values(
+                    native=bindparam("target_native"),
+                    common_name=bindparam("target_common_name"),
+                    updated_at=func.current_timestamp()
+                )
+            )
+            # executemany: the driver reports the total rows matched across the batch
+            batch_updated = db.session.connection().execute(stmt, chunk).rowcount
+        db.session.commit()
+        updated += batch_updated
+        if on_commit is not None:
+            on_commit(batch_updated)
+
+    return updated
+
+
+def reclassify_native_status(app, batch_size=None):
+    """
+    Recompute native and common_name for every stored observation from the
+    current native_plants catalog, without touching the network.
+
+    Args:
+        app: Flask application
+        batch_size: Names per UPDATE statement, defaults to RECLASSIFY_BATCH_SIZE (500)
+
+    Returns:
+        ReclassifyResult, or None if the job failed
+    """
+    if batch_size is None:
+        batch_size = int(os.getenv("RECLASSIFY_BATCH_SIZE", "500"))
+
+    with app.app_context():
+        print(f"[{datetime.now()}] Starting native status re-classification...")
+        started = time.perf_counter()
+        # Rows updated by each committed batch
+        committed = []
+
+        try:
+            native_index = NativePlantIndex.load()
+            print(f"Loaded {len(native_index)} native plant names for matching")
+
+            names, changed = changed_classifications(native_index)
+            updated = update_classifications(changed, batch_size, on_commit=committed.append)
+
+            print(
+                f"[{datetime.now()}] Re-classified {updated} observations across {len(changed)} of "
+                f"{names} scientific names in {time.perf_counter() - started:.3f}s"
+            )
+            return ReclassifyResult(names, len(changed), updated)
+
+        except Exception as e:
+            print(f"Error in native status re-classification: {e}")
+            db.session.rollback()
+        finally:
+            # Batches committed before a failure are visible too, so caches must not outlive them
+            if sum(committed):
+                refresh_derived_data()
+            db.session.close()
@@ -0,0 +1,196 @@
+"""
+Daily observation rollups for /stats/timeseries.
+
+observation_daily_rollups holds one row per species, native flag and day
+(of event_date). After each ingestion only the days touched by rows
+changed since the last refresh are recomputed: gbif_data rows with
+updated_at at or after the watermark in rollup_state name the days, and
+each of those days is re-aggregated from its own rows. Recomputing whole
+days keeps re-classified and re-ingested rows from being counted twice.
+
+When an upsert moves a row's event_date to another day, the old day no
+longer has a changed row on it; the upsert records it in
+rollup_pending_days (mark_rollup_days()) and the next refresh recomputes it.
+
+updated_at is always written by the database clock (CURRENT_TIMESTAMP), so
+the watermark never runs ahead of later writes.
+
+With no watermark (first run, or gbif_data emptied) every day is rebuilt.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import Date, and_, func, insert, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from speciestrack.models import db, GbifData, ObservationDailyRollup, RollupState, RollupPendingDay
+from speciestrack.utils.name_utils import species_key
+import time
+
+# Days recomputed per DELETE/aggregate round trip
+ROLLUP_BATCH_DAYS = 200
+
+# Rows read per round trip and written per INSERT
+ROLLUP_BATCH_SIZE = 5000
+
+
+def event_day():
+    """SQL expression for the calendar day of GbifData.event_date"""
+    return func.date(GbifData.event_date, type_=Date)
+
+
+def changed_days(watermark, high):
+    """
+    Days with gbif_data rows written between two updated_at values.
+    Must be called inside a Flask app context.
+
+    Args:
+        watermark: Lowest updated_at to include
+        high: Highest updated_at to include
+
+    Returns:
+        Sorted list of dates
+    """
+    day = event_day()
+    # Start a second early: SQLite stores CURRENT_TIMESTAMP in whole seconds without the
+    # fraction a bound datetime carries, so an equal timestamp would compare as lower
+    rows = db.session.query(day).filter(
+        GbifData.updated_at >= watermark - timedelta(seconds=1),
+        GbifData.updated_at <= high,
+        GbifData.event_date.isnot(None)
+    ).distinct()
+    return sorted(value for value, in rows if value is not None)
+
+
+def mark_rollup_days(days):
+    """
+    Queue days for the next rollup refresh, ignoring ones already queued.
+    Runs in the current session transaction; the caller commits.
+
+    Args:
+        days: Iterable of dates
+    """
+    rows = [{"day": day} for day in set(days)]
+    if not rows:
+        return
+    table = RollupPendingDay.__table__
+    if db.session.get_bind().dialect.name == "postgresql":
+        stmt = pg_insert(table).on_conflict_do_nothing(index_elements=["day"])
+    else:
+        stmt = sqlite_insert(table).on_conflict_do_nothing(index_elements=["day"])
+    db.session.execute(stmt, rows)
+
+
+def _day_ranges(days):
+    """Merge sorted dates into [start, end) datetime ranges of consecutive days"""
+    ranges = []
+    for day in days:
+        start = datetime(day.year, day.month, day.day)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = start + timedelta(days=1)
+        else:
+            ranges.append([start, start + timedelta(days=1)])
+    return ranges
+
+
+def aggregate_days(days=None):
+    """
+    Aggregate gbif_data into rollup rows.
+    Must be called inside a Flask app context.
+
+    Args:
+        days: Dates to aggregate, or None for every dated observation
+
+    Returns:
+        Dictionary of (species, native, day) -> [record_count, observation_count]
+    """
+    day = event_day()
+    query = db.session.query(
+        day,
+        GbifData.scientific_name,
+        GbifData.native,
+        func.count(GbifData.id),
+        func.sum(func.coalesce(GbifData.observation_count, 1))
+    ).filter(GbifData.event_date.isnot(None))
+
+    if days is not None:
+        # Ranges on event_date itself, so the event_date index is used
+        query = query.filter(or_(*[
+            and_(GbifData.event_date >= start, GbifData.event_date < end)
+            for start, end in _day_ranges(days)
+        ]))
+
+    rollups = {}
+    species_cache = {}
+    rows = query.group_by(day, GbifData.scientific_name, GbifData.native).yield_per(ROLLUP_BATCH_SIZE)
+    for row_day, scientific_name, native, records, observations in rows:
+        key = (species_key(scientific_name, species_cache), bool(native), row_day)
+        totals = rollups.get(key)
+        if totals is None:
+            totals = rollups[key] = [0, 0]
+        totals[0] += records
+        totals[1] += observations or 0
+    return rollups
+
+
+def _write_rollups(rollups):
+    """Insert aggregated rollup rows in batches"""
+    table = ObservationDailyRollup.__table__
+    rows = [
+        {
+            "species": species,
+            "native": native,
+            "day": day,
+            "record_count": records,
+            "observation_count": observations,
+        }
+        for (species, native, day), (records, observations) in rollups.items()
+    ]
+    for start in range(0, len(rows), ROLLUP_BATCH_SIZE):
+        db.session.execute(insert(table), rows[start:start + ROLLUP_BATCH_SIZE])
+    return len(rows)
+
+
+def refresh_observation_rollups(full=False):
+    """
+    Bring observation_daily_rollups up to date with gbif_data.
+    Must be called inside a Flask app context; commits once, so readers
+    see either the old or the new rollups.
+
+    Args:
+        full: Rebuild every day instead of only the changed ones
+
+    Returns:
+        Number of rollup rows written
+    """
+    started = time.perf_counter()
+    table = ObservationDailyRollup.__table__
+
+    state = db.session.get(RollupState, RollupState.SINGLETON_ID)
+    if state is None:
+        state = RollupState(id=RollupState.SINGLETON_ID)
+        db.session.add(state)
+    high = db.session.query(func.max(GbifData.updated_at)).scalar()
+    pending = [day for day, in db.session.query(RollupPendingDay.day)]
+
+    if full or state.watermark is None or high is None:
+        db.session.execute(table.delete())
+        written = _write_rollups(aggregate_days())
+        scope = "all days"
+    else:
+        days = sorted(set(changed_days(state.watermark, high)) | set(pending))
+        written = 0
+        for start in range(0, len(days), ROLLUP_BATCH_DAYS):
+            chunk = days[start:start + ROLLUP_BATCH_DAYS]
+            db.session.execute(table.delete().where(table.c.day.in_(chunk)))
+            written += _write_rollups(aggregate_days(chunk))
+        scope = f"{len(days)} changed days"
+
+    # Rows written after the max was read are at or after it, so the next run picks them up
+    state.watermark = high
+    pending_table = RollupPendingDay.__table__
+    for start in range(0, len(pending), ROLLUP_BATCH_DAYS):
+        db.session.execute(pending_table.delete().where(pending_table.c.day.in_(pending[start:start + ROLLUP_BATCH_DAYS])))
+    db.session.commit()
+    print(f"[{datetime.now()}] Refreshed {written} observation rollups for {scope} "
+          f"in {time.perf_counter() - started:.3f}s")
+    return written
@@ -0,0 +1,122 @@
+"""
+Cross-process lock for ingestion runs.
+
+The scheduler only runs in the worker process (speciestrack/worker.py),
+but several workers may be deployed, and a manual misc/run_gbif_job.py run
+can overlap with the scheduled one. Runs take this lock and skip when
+another process holds it.
+
+On PostgreSQL the lock is a session-level advisory lock held on a dedicated
+connection, so it is shared by every host using the database and released
+by the server if the process dies. Other databases (SQLite in development
+and tests) fall back to an exclusive flock on a file named after the
+database URL.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from speciestrack.models import db
+from sqlalchemy import text
+import hashlib
+import tempfile
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Lock shared by every GBIF ingestion entry point
+GBIF_INGESTION_LOCK = "gbif_ingestion"
+
+
+def advisory_lock_key(name):
+    """Stable signed 64-bit key for pg_try_advisory_lock"""
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def lock_file_path(name, database_url):
+    """Lock file for a lock name and database"""
+    directory = os.getenv("SPECIESTRACK_LOCK_DIR", tempfile.gettempdir())
+    database_hash = hashlib.sha256(str(database_url).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(directory, f"speciestrack-{name}-{database_hash}.lock")
+
+
+@contextmanager
+def _advisory_lock(engine, name):
+    connection = engine.connect()
+    key = advisory_lock_key(name)
+    try:
+        acquired = bool(connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar())
+        connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                connection.commit()
+    finally:
+        connection.close()
+
+
+@contextmanager
+def _file_lock(path):
+    if fcntl is None:
+        print(f"File locks are not supported on this platform; running without {path}")
+        yield True
+        return
+
+    with open(path, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def job_run_lock(name=GBIF_INGESTION_LOCK):
+    """
+    Try to take a cross-process lock without waiting.
+    Must be used inside a Flask app context.
+
+    Args:
+        name: Lock name; runs using the same name exclude each other
+
+    Yields:
+        True if this process holds the lock, False if another one does
+    """
+    engine = db.engine
+    if engine.dialect.name == "postgresql":
+        with _advisory_lock(engine, name) as acquired:
+            yield acquired
+    else:
+        with _file_lock(lock_file_path(name, engine.url)) as acquired:
+            yield acquired
+
+
+def run_exclusive(app, job, *args, lock_name=GBIF_INGESTION_LOCK, **kwargs):
+    """
+    Run job(app, *args, **kwargs) unless another process is already
+    running a job under the same lock.
+
+    Args:
+        app: Flask application
+        job: Job function taking the app as its first argument
+        lock_name: Lock shared by the jobs that must not overlap
+
+    Returns:
+        The job's return value, or None if it was skipped
+    """
+    with app.app_context():
+        with job_run_lock(lock_name) as acquired:
+            if not acquired:
+                print(f"[{datetime.now()}] Skipping {job.__name__} in process {os.getpid()}: "
+                      f"another process holds the {lock_name} lock")
+                return None
+            return job(app, *args, **kwargs)
@@ -0,0 +1,97 @@
+"""
+In-memory species autocomplete index for /species/suggest.
+
+Each web process builds the index from the distinct names in gbif_data on
+first use and keeps it on the Flask app with the dataset version it was
+built from. Ingestion runs in the worker process and bumps the version, and
+the next request after that rebuilds the index.
+"""
+
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func
+from speciestrack.models import db, GbifData
+from speciestrack.jobs.dataset_version import current_dataset_version
+from speciestrack.utils.name_utils import normalize_scientific_name
+from speciestrack.utils.suggest_index import SuggestIndex
+import threading
+import time
+
+# Key of the index in app.extensions
+EXTENSION_KEY = "species_suggest_index"
+
+_build_lock = threading.Lock()
+
+
+def load_suggest_index():
+    """
+    Build the autocomplete index from gbif_data in a single grouped query.
+    Must be called inside a Flask app context.
+
+    GBIF name variants (authors, rank spellings) are merged under their
+    canonical name, weighted by observation count.
+
+    Returns:
+        SuggestIndex whose values are suggestion dictionaries
+    """
+    rows = db.session.query(
+        GbifData.scientific_name,
+        GbifData.common_name,
+        GbifData.native,
+        func.count(GbifData.id)
+    ).group_by(GbifData.scientific_name, GbifData.common_name, GbifData.native)
+
+    species = {}
+    for scientific_name, common_name, native, count in rows:
+        normalized = normalize_scientific_name(scientific_name)
+        name = normalized.canonical if normalized is not None else scientific_name.strip()
+        if not name:
+            continue
+        entry = species.get(name)
+        if entry is None:
+            entry = species[name] = {"count": 0, "native": False, "common_names": Counter()}
+        entry["count"] += count
+        entry["native"] = entry["native"] or bool(native)
+        if common_name:
+            entry["common_names"][common_name] += count
+
+    entries = []
+    for name, entry in sorted(species.items()):
+        common_name = entry["common_names"].most_common(1)[0][0] if entry["common_names"] else None
+        value = {
+            "scientific_name": name,
+            "common_name": common_name,
+            "native": entry["native"],
+            "observation_count": entry["count"],
+        }
+        entries.append(((name, common_name), entry["count"], value))
+    return SuggestIndex(entries)
+
+
+def get_suggest_index():
+    """
+    Get the app's autocomplete index, building it if missing or built from
+    an older dataset version.
+    Must be called inside a Flask app context.
+
+    Returns:
+        SuggestIndex
+    """
+    version = current_dataset_version()
+    cached = current_app.extensions.get(EXTENSION_KEY)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _build_lock:
+        # Another thread may have rebuilt it while this one waited
+        cached = current_app.extensions.get(EXTENSION_KEY)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        started = time.perf_counter()
+        index = load_suggest_index()
+        current_app.extensions[EXTENSION_KEY] = (version, index)
+        print(f"[{datetime.now()}] Built species suggest index for dataset version {version}: "
+              f"{len(index)} species in {time.perf_counter() - started:.3f}s")
+        return index
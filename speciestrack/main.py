@@ -1,53 +1,113 @@
 from flask import Flask
 from flask_cors import CORS
+from dotenv import load_dotenv
 from speciestrack.controllers.map_controller import get_native_plants
-from speciestrack.models import db, NativePlant, GbifData
-from speciestrack.jobs.gbif_job import store_gbif_data
-from apscheduler.schedulers.background import BackgroundScheduler
+from speciestrack.controllers.observations_controller import get_observations_geojson
+from speciestrack.controllers.clusters_controller import get_clusters
+from speciestrack.controllers.species_controller import get_species_suggestions
+from speciestrack.controllers.stats_controller import get_timeseries
+from speciestrack.controllers.response_cache import cached_response
+from speciestrack.models import db
 import os
-import atexit
 
-app = Flask(__name__)
 
-# Enable CORS for all routes
-CORS(app, origins=['http://localhost:8081'])
+def hello_world():
+    return "Hello World"
 
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
-    'DATABASE_URL',
-    'postgresql://localhost/california_native_plants'
-)
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# Initialize database
-db.init_app(app)
+@cached_response
+def native_plants():
+    return get_native_plants()
 
-# Configure scheduler for daily jobs
-scheduler = BackgroundScheduler()
-scheduler.add_job(
-    func=lambda: store_gbif_data(app),
-    trigger="cron",
-    hour=12,
-    minute=0,
-    id='gbif_daily_fetch',
-    name='Fetch GBIF data daily at 12pm',
-    replace_existing=True
-)
-scheduler.start()
 
-# Shut down the scheduler when exiting the app
-atexit.register(lambda: scheduler.shutdown())
+@cached_response
+def observations_geojson():
+    return get_observations_geojson()
 
 
-@app.route("/")
-def hello_world():
-    return "Hello World"
+@cached_response
+def clusters():
+    return get_clusters()
 
-@app.route("/native-plants")
-def native_plants():
-    return get_native_plants()
 
+@cached_response
+def species_suggest():
+    return get_species_suggestions()
 
-if __name__ == "__main__":
 
-    app.run()
+@cached_response
+def stats_timeseries():
+    return get_timeseries()
+
+
+def create_app(config=None):
+    """
+    Build the Flask application.
+
+    Nothing is connected or started here: the database engine is created on
+    first use, and the daily ingestion scheduler lives in the worker process
+    (speciestrack/worker.py), not in the web app.
+
+    Args:
+        config: Optional dictionary of config values applied last
+
+    Returns:
+        Flask application
+    """
+    load_dotenv()
+
+    app = Flask(__name__)
+
+    # Enable CORS for all routes
+    CORS(app, origins=['http://localhost:8081'])
+
+    # Database configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
+        'DATABASE_URL',
+        'postgresql://localhost/california_native_plants'
+    )
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if config:
+        app.config.update(config)
+
+    # Initialize database
+    db.init_app(app)
+
+    app.add_url_rule("/", view_func=hello_world)
+    app.add_url_rule("/native-plants", view_func=native_plants)
+    app.add_url_rule("/observations.geojson", view_func=observations_geojson)
+    app.add_url_rule("/clusters", view_func=clusters)
+    app.add_url_rule("/species/suggest", view_func=species_suggest)
+    app.add_url_rule("/stats/timeseries", view_func=stats_timeseries)
+
+    return app
+
+
+_app = None
+
+
+def __getattr__(name):
+    """
+    Build the shared `app` on first access, so `from speciestrack.main import app`
+    (misc scripts, WSGI servers pointed at speciestrack.main:app) keeps working
+    without importing this module doing any work.
+    """
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main():
+    """Entry point for speciestrack-web: serve the API only, with no scheduler"""
+    app = create_app()
+    app.run(
+        host=os.getenv("SPECIESTRACK_HOST", "127.0.0.1"),
+        port=int(os.getenv("SPECIESTRACK_PORT", "5000"))
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,13 @@ from flask_sqlalchemy import SQLAlchemy
 db = SQLAlchemy()
 
 from speciestrack.models.native_plant import NativePlant
+from speciestrack.models.region import Region, RegionOccurrence
 from speciestrack.models.gbif_data import GbifData
+from speciestrack.models.gbif_sync_state import GbifSyncState
+from speciestrack.models.gbif_job_run import GbifJobRun
+from speciestrack.models.observation_cluster import ObservationCluster
+from speciestrack.models.dataset_version import DatasetVersion
+from speciestrack.models.observation_rollup import ObservationDailyRollup, RollupState, RollupPendingDay
 
-__all__ = ['db', 'NativePlant', 'GbifData']
+__all__ = ['db', 'NativePlant', 'Region', 'RegionOccurrence', 'GbifData', 'GbifSyncState', 'GbifJobRun', 'ObservationCluster', 'DatasetVersion',
+           'ObservationDailyRollup', 'RollupState', 'RollupPendingDay']
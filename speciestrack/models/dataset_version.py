@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, DateTime, func, update
+from speciestrack.models import db
+
+
+class DatasetVersion(db.Model):
+    """
+    Version number of the observation data: a single row bumped after
+    every job that changes gbif_data has committed. Response caches are
+    keyed on it.
+    """
+
+    __tablename__ = 'dataset_version'
+
+    # The one row of the table
+    SINGLETON_ID = 1
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    version = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
+
+    def __repr__(self):
+        return f'<DatasetVersion {self.version}>'
+
+    @classmethod
+    def current(cls):
+        """Current version, 0 before the first bump"""
+        version = db.session.query(cls.version).filter(cls.id == cls.SINGLETON_ID).scalar()
+        return version or 0
+
+    @classmethod
+    def bump(cls):
+        """
+        Increment the version in the current transaction; the caller commits.
+        The increment happens in SQL, so concurrent bumps are not lost.
+
+        Returns:
+            The new version
+        """
+        updated = db.session.execute(
+            update(cls.__table__)
+            .where(cls.__table__.c.id == cls.SINGLETON_ID)
+            .values(version=cls.__table__.c.version + 1, updated_at=func.current_timestamp())
+        ).rowcount
+        if not updated:
+            db.session.add(cls(id=cls.SINGLETON_ID, version=1))
+            db.session.flush()
+        return cls.current()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Numeric, DateTime, func
+from sqlalchemy import Column, Integer, String, Boolean, Numeric, DateTime, ForeignKey, Index, DDL, event, func, table, column
 from speciestrack.models import db
 
 
@@ -13,36 +13,167 @@ class GbifData(db.Model):
     # Observation data
     scientific_name = Column(String(500), nullable=False)
     common_name = Column(String(255))
-    occurrence_id = Column(String(500))  # GBIF occurrence ID/URL
+    occurrence_id = Column(String(500), unique=True, index=True)  # GBIF occurrence ID/URL
     observation_count = Column(Integer, default=1)
     observation_type = Column(String(100))
     native = Column(Boolean, default=False)
     decimal_latitude = Column(Numeric(10, 8))  # Allows -90 to +90 with 8 decimal precision
     decimal_longitude = Column(Numeric(11, 8))  # Allows -180 to +180 with 8 decimal precision
     event_date = Column(DateTime)  # Date when the observation occurred
+    payload_hash = Column(String(64))  # Hash of the GBIF payload, used to skip unchanged rows on upsert
+    region_id = Column(Integer, ForeignKey('regions.id'), index=True)  # Region the observation was fetched for
 
     # Timestamps
     fetch_date = Column(DateTime, default=func.current_timestamp())
     created_at = Column(DateTime, default=func.current_timestamp())
     updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
 
+    __table_args__ = (
+        # Keyset pagination of /native-plants: newest observations first, undated ones last.
+        # SQLite cannot declare NULLS LAST on an index, so it is only created on PostgreSQL.
+        Index(
+            'idx_gbif_native_event_date_id',
+            native,
+            event_date.desc().nulls_last(),
+            id.desc()
+        ).ddl_if(dialect='postgresql'),
+        # Bounding box queries (/observations.geojson); SQLite uses the R*Tree below instead
+        Index(
+            'idx_gbif_location',
+            decimal_longitude,
+            decimal_latitude
+        ).ddl_if(dialect='postgresql'),
+        # Trigram indexes serve the ILIKE '%...%' name filters (needs the pg_trgm extension)
+        Index(
+            'idx_gbif_scientific_name_trgm',
+            scientific_name,
+            postgresql_using='gin',
+            postgresql_ops={'scientific_name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'idx_gbif_common_name_trgm',
+            common_name,
+            postgresql_using='gin',
+            postgresql_ops={'common_name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        # Incremental rollup refresh: rows changed since the last run, then whole days of rows
+        Index('idx_gbif_updated_at', updated_at),
+        Index('idx_gbif_event_date', event_date),
+    )
+
     def __repr__(self):
         return f'<GbifData {self.scientific_name} (count: {self.observation_count})>'
 
-    def to_dict(self):
+    # Fields of the JSON representation, in output order
+    FIELDS = (
+        'id',
+        'scientific_name',
+        'common_name',
+        'occurrence_id',
+        'observation_count',
+        'observation_type',
+        'native',
+        'decimal_latitude',
+        'decimal_longitude',
+        'event_date',
+        'region_id',
+        'fetch_date',
+        'created_at',
+        'updated_at',
+    )
+
+    @classmethod
+    def columns(cls, fields):
+        """Columns to SELECT for a list of fields"""
+        return [getattr(cls, field) for field in fields]
+
+    @classmethod
+    def serialize(cls, row, fields=FIELDS):
+        """
+        Convert a model instance, or a row selected with columns(fields),
+        to a dictionary for JSON serialization.
+
+        Args:
+            row: GbifData instance or result row with the requested fields
+            fields: Fields to include, in output order
+
+        Returns:
+            Dictionary of field name -> JSON-ready value
+        """
+        data = {}
+        for field in fields:
+            value = getattr(row, field)
+            converter = _FIELD_CONVERTERS.get(field)
+            data[field] = converter(value) if converter is not None else value
+        return data
+
+    def to_dict(self, fields=FIELDS):
         """Convert model to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
-            'scientific_name': self.scientific_name,
-            'common_name': self.common_name,
-            'occurrence_id': self.occurrence_id,
-            'observation_count': self.observation_count,
-            'observation_type': self.observation_type,
-            'native': self.native,
-            'decimal_latitude': float(self.decimal_latitude) if self.decimal_latitude else None,
-            'decimal_longitude': float(self.decimal_longitude) if self.decimal_longitude else None,
-            'event_date': self.event_date.isoformat() if self.event_date else None,
-            'fetch_date': self.fetch_date.isoformat() if self.fetch_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
+        return self.serialize(self, fields)
+
+
+def _float_or_none(value):
+    return float(value) if value else None
+
+
+def _isoformat_or_none(value):
+    return value.isoformat() if value else None
+
+
+# Conversions for fields that are not JSON-ready as loaded; other fields are used as is
+_FIELD_CONVERTERS = {
+    'decimal_latitude': _float_or_none,
+    'decimal_longitude': _float_or_none,
+    'event_date': _isoformat_or_none,
+    'fetch_date': _isoformat_or_none,
+    'created_at': _isoformat_or_none,
+    'updated_at': _isoformat_or_none,
+}
+
+
+event.listen(
+    GbifData.__table__,
+    'before_create',
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect='postgresql')
+)
+
+
+# SQLite spatial index: an R*Tree virtual table holding one point box per
+# located observation, kept in sync with gbif_data by triggers. R*Tree
+# stores 32-bit floats rounded outwards, so queries still re-check the
+# exact coordinates.
+GBIF_LOCATION_RTREE = 'gbif_data_rtree'
+
+gbif_location_rtree = table(
+    GBIF_LOCATION_RTREE,
+    column('id'),
+    column('min_lon'),
+    column('max_lon'),
+    column('min_lat'),
+    column('max_lat'),
+)
+
+# Inserts also cover SQLite's INSERT OR REPLACE upserts, which replace a row
+# without firing delete triggers
+_RTREE_SYNC = f"""
+    DELETE FROM {GBIF_LOCATION_RTREE} WHERE id = NEW.id;
+    INSERT INTO {GBIF_LOCATION_RTREE} (id, min_lon, max_lon, min_lat, max_lat)
+    SELECT NEW.id, NEW.decimal_longitude, NEW.decimal_longitude, NEW.decimal_latitude, NEW.decimal_latitude
+    WHERE NEW.decimal_longitude IS NOT NULL AND NEW.decimal_latitude IS NOT NULL;
+"""
+
+for _statement in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {GBIF_LOCATION_RTREE} USING rtree(id, min_lon, max_lon, min_lat, max_lat)",
+    f"CREATE TRIGGER IF NOT EXISTS gbif_data_rtree_insert AFTER INSERT ON gbif_data BEGIN {_RTREE_SYNC} END",
+    f"CREATE TRIGGER IF NOT EXISTS gbif_data_rtree_update "
+    f"AFTER UPDATE OF decimal_longitude, decimal_latitude ON gbif_data BEGIN {_RTREE_SYNC} END",
+    f"CREATE TRIGGER IF NOT EXISTS gbif_data_rtree_delete AFTER DELETE ON gbif_data "
+    f"BEGIN DELETE FROM {GBIF_LOCATION_RTREE} WHERE id = OLD.id; END",
+):
+    event.listen(GbifData.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+
+event.listen(
+    GbifData.__table__,
+    'after_drop',
+    DDL(f"DROP TABLE IF EXISTS {GBIF_LOCATION_RTREE}").execute_if(dialect='sqlite')
+)
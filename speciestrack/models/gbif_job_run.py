@@ -0,0 +1,137 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func
+from datetime import datetime
+from speciestrack.models import db
+from speciestrack.models.gbif_sync_state import GbifSyncState
+import json
+
+
+class GbifJobRun(db.Model):
+    """One GBIF ingestion run and its resume checkpoint"""
+
+    __tablename__ = 'gbif_job_run'
+    __table_args__ = (
+        Index('idx_gbif_job_run_query', 'dataset_key', 'geometry_hash', 'id'),
+    )
+
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    # Query identity, as in gbif_sync_state
+    dataset_key = Column(String(255), nullable=False, default='')
+    geometry_hash = Column(String(64), nullable=False)
+
+    # lastInterpreted lower bound the run was started with (None for a full query)
+    since = Column(DateTime)
+
+    status = Column(String(20), nullable=False, default=STATUS_RUNNING)
+
+    # JSON: {"tiles": [[key, [min_lon, min_lat, max_lon, max_lat], count], ...],
+    #        "offsets": {tile_key: next_offset}}
+    checkpoint = Column(Text)
+    rows_stored = Column(Integer, nullable=False, default=0)
+    max_last_interpreted = Column(DateTime)
+    error = Column(Text)
+
+    # Timestamps
+    started_at = Column(DateTime, default=func.current_timestamp())
+    updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
+    finished_at = Column(DateTime)
+
+    def __repr__(self):
+        return f'<GbifJobRun {self.id} {self.status} ({self.rows_stored} rows)>'
+
+    @classmethod
+    def start(cls, dataset_key, geometry, since=None):
+        """
+        Create a run for a dataset and polygon.
+        The row is added to the session but not committed.
+        """
+        run = cls(
+            dataset_key=dataset_key or '',
+            geometry_hash=GbifSyncState.hash_geometry(geometry),
+            since=since,
+            status=cls.STATUS_RUNNING,
+            rows_stored=0,
+        )
+        db.session.add(run)
+        return run
+
+    @classmethod
+    def resumable(cls, dataset_key, geometry):
+        """
+        Get the latest run for a dataset and polygon if it did not complete.
+
+        Returns:
+            GbifJobRun, or None if the latest run completed or there is none
+        """
+        latest = cls.query.filter_by(
+            dataset_key=dataset_key or '',
+            geometry_hash=GbifSyncState.hash_geometry(geometry)
+        ).order_by(cls.id.desc()).first()
+
+        if latest is None or latest.status == cls.STATUS_COMPLETED:
+            return None
+        return latest
+
+    def load_checkpoint(self):
+        """Decoded checkpoint, with empty tiles/offsets if none was recorded"""
+        checkpoint = json.loads(self.checkpoint) if self.checkpoint else {}
+        checkpoint.setdefault('tiles', None)
+        checkpoint.setdefault('offsets', {})
+        return checkpoint
+
+    def record_batch(self, tiles, positions, row_count, page_size):
+        """
+        Move the checkpoint past the pages in a batch about to be committed.
+        Call before the batch commit so both land in the same transaction.
+
+        Args:
+            tiles: Tile plan of the run as [key, bounds, count] lists, or None
+            positions: (tile_key, offset) of every page in the batch
+            row_count: Rows the batch inserted or updated (unchanged rows are not counted)
+            page_size: Records requested per page
+        """
+        checkpoint = self.load_checkpoint()
+        if tiles is not None:
+            checkpoint['tiles'] = tiles
+
+        offsets = checkpoint['offsets']
+        for tile_key, offset in positions:
+            tile_key = tile_key or ''
+            offsets[tile_key] = max(offsets.get(tile_key, 0), offset + page_size)
+
+        self.checkpoint = json.dumps(checkpoint)
+        self.rows_stored = (self.rows_stored or 0) + row_count
+
+    def finish(self, status, max_last_interpreted=None, error=None):
+        """
+        Mark the run as completed or failed. Does not commit.
+        """
+        self.status = status
+        self.error = error
+        if max_last_interpreted is not None and (
+            self.max_last_interpreted is None or max_last_interpreted > self.max_last_interpreted
+        ):
+            self.max_last_interpreted = max_last_interpreted
+        self.finished_at = datetime.now()
+
+    def to_dict(self):
+        """Convert model to dictionary for JSON serialization"""
+        return {
+            'id': self.id,
+            'dataset_key': self.dataset_key,
+            'geometry_hash': self.geometry_hash,
+            'since': self.since.isoformat() if self.since else None,
+            'status': self.status,
+            'checkpoint': self.load_checkpoint(),
+            'rows_stored': self.rows_stored,
+            'max_last_interpreted': self.max_last_interpreted.isoformat() if self.max_last_interpreted else None,
+            'error': self.error,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
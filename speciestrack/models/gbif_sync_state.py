@@ -0,0 +1,62 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint, func
+from speciestrack.models import db
+import hashlib
+
+
+class GbifSyncState(db.Model):
+    """Last successful GBIF sync watermark per dataset and query polygon"""
+
+    __tablename__ = 'gbif_sync_state'
+    __table_args__ = (
+        UniqueConstraint('dataset_key', 'geometry_hash', name='uq_gbif_sync_state_query'),
+    )
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    # Query identity
+    dataset_key = Column(String(255), nullable=False, default='')
+    geometry_hash = Column(String(64), nullable=False)  # SHA-256 of the query WKT
+
+    # Highest GBIF lastInterpreted (UTC) stored by a complete, committed run
+    watermark = Column(DateTime)
+    last_success_at = Column(DateTime)
+
+    # Timestamps
+    created_at = Column(DateTime, default=func.current_timestamp())
+    updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
+
+    def __repr__(self):
+        return f'<GbifSyncState {self.dataset_key} {self.geometry_hash[:8]} (watermark: {self.watermark})>'
+
+    @staticmethod
+    def hash_geometry(geometry):
+        """Stable key for a query polygon"""
+        return hashlib.sha256((geometry or '').encode('utf-8')).hexdigest()
+
+    @classmethod
+    def for_query(cls, dataset_key, geometry):
+        """
+        Get the sync state for a dataset and polygon, creating it if needed.
+        New rows are added to the session but not committed.
+        """
+        dataset_key = dataset_key or ''
+        geometry_hash = cls.hash_geometry(geometry)
+
+        state = cls.query.filter_by(dataset_key=dataset_key, geometry_hash=geometry_hash).first()
+        if state is None:
+            state = cls(dataset_key=dataset_key, geometry_hash=geometry_hash)
+            db.session.add(state)
+        return state
+
+    def to_dict(self):
+        """Convert model to dictionary for JSON serialization"""
+        return {
+            'id': self.id,
+            'dataset_key': self.dataset_key,
+            'geometry_hash': self.geometry_hash,
+            'watermark': self.watermark.isoformat() if self.watermark else None,
+            'last_success_at': self.last_success_at.isoformat() if self.last_success_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, Float, Text, UniqueConstraint
+from speciestrack.models import db
+import json
+
+
+class ObservationCluster(db.Model):
+    """
+    Precomputed cluster of located GBIF observations: one Web Mercator
+    grid cell at one zoom level. Rebuilt from gbif_data after ingestion.
+    """
+
+    __tablename__ = 'observation_clusters'
+    __table_args__ = (
+        # Also serves the zoom + cell range lookups of /clusters
+        UniqueConstraint('zoom', 'cell_y', 'cell_x', name='uq_observation_clusters_cell'),
+    )
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    # Grid cell
+    zoom = Column(Integer, nullable=False)
+    cell_x = Column(Integer, nullable=False)
+    cell_y = Column(Integer, nullable=False)
+
+    # Aggregates
+    longitude = Column(Float, nullable=False)  # Mean position of the observations in the cell
+    latitude = Column(Float, nullable=False)
+    observation_count = Column(Integer, nullable=False)
+    native_count = Column(Integer, nullable=False)
+    top_species = Column(Text)  # JSON list of [species, count], most observed first
+
+    def __repr__(self):
+        return f'<ObservationCluster z{self.zoom} ({self.cell_x}, {self.cell_y}): {self.observation_count}>'
+
+    def to_feature(self):
+        """Convert to a GeoJSON Point feature at the cluster position"""
+        return {
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [self.longitude, self.latitude],
+            },
+            'properties': {
+                'observation_count': self.observation_count,
+                'native_count': self.native_count,
+                'top_species': [
+                    {'species': species, 'count': count}
+                    for species, count in json.loads(self.top_species or '[]')
+                ],
+            },
+        }
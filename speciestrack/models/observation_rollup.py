@@ -0,0 +1,67 @@
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Index, UniqueConstraint
+from speciestrack.models import db
+
+
+class ObservationDailyRollup(db.Model):
+    """
+    GBIF observations of one species and native flag on one day (by
+    event_date). Kept up to date from gbif_data after ingestion.
+    """
+
+    __tablename__ = 'observation_daily_rollups'
+    __table_args__ = (
+        # Serves the species + date range lookups of /stats/timeseries
+        UniqueConstraint('species', 'day', 'native', name='uq_observation_daily_rollups_key'),
+        # Serves date range lookups across all species
+        Index('idx_observation_daily_rollups_day', 'day'),
+    )
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    # Rollup key
+    species = Column(String(500), nullable=False)  # Genus + species, so name variants count as one
+    native = Column(Boolean, nullable=False)
+    day = Column(Date, nullable=False)
+
+    # Aggregates
+    record_count = Column(Integer, nullable=False)  # gbif_data rows
+    observation_count = Column(Integer, nullable=False)  # Sum of their observation_count
+
+    def __repr__(self):
+        return f'<ObservationDailyRollup {self.species} {self.day}: {self.observation_count}>'
+
+
+class RollupState(db.Model):
+    """
+    Progress of the incremental rollup refresh: a single row holding the
+    highest gbif_data.updated_at already rolled up.
+    """
+
+    __tablename__ = 'rollup_state'
+
+    # The one row of the table
+    SINGLETON_ID = 1
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    watermark = Column(DateTime)
+
+    def __repr__(self):
+        return f'<RollupState (watermark: {self.watermark})>'
+
+
+class RollupPendingDay(db.Model):
+    """
+    A day the incremental rollup refresh must recompute although no row
+    changed since the watermark still falls on it: written when an upsert
+    moves an observation's event_date to another day.
+    """
+
+    __tablename__ = 'rollup_pending_days'
+
+    day = Column(Date, primary_key=True)
+
+    def __repr__(self):
+        return f'<RollupPendingDay {self.day}>'
@@ -0,0 +1,71 @@
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, func
+from speciestrack.models import db
+
+
+class Region(db.Model):
+    """A tracked area (e.g. a park) whose GBIF observations are ingested"""
+
+    __tablename__ = 'regions'
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    name = Column(String(255), nullable=False, unique=True)
+    geometry = Column(Text, nullable=False)  # WKT POLYGON sent to GBIF
+    dataset_key = Column(String(255))  # GBIF dataset key; DATASET_KEY env var when empty
+    active = Column(Boolean, nullable=False, default=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=func.current_timestamp())
+    updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
+
+    def __repr__(self):
+        return f'<Region {self.name}>'
+
+    @classmethod
+    def lookup(cls, value):
+        """
+        Find a region by id or by name.
+
+        Args:
+            value: Region id (as a string of digits) or exact name
+
+        Returns:
+            Region, or None if there is no match
+        """
+        if value is None:
+            return None
+        value = str(value).strip()
+        if value.isdigit():
+            region = db.session.get(cls, int(value))
+            if region is not None:
+                return region
+        return cls.query.filter_by(name=value).first()
+
+    def to_dict(self):
+        """Convert model to dictionary for JSON serialization"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'geometry': self.geometry,
+            'dataset_key': self.dataset_key,
+            'active': self.active,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class RegionOccurrence(db.Model):
+    """
+    Membership of a stored occurrence in a region. Region polygons can
+    overlap, so one occurrence can belong to several regions, while
+    gbif_data.region_id only keeps the first region that stored it.
+    """
+
+    __tablename__ = 'region_occurrences'
+
+    region_id = Column(Integer, ForeignKey('regions.id'), primary_key=True)
+    occurrence_id = Column(String(500), primary_key=True)  # gbif_data.occurrence_id
+
+    def __repr__(self):
+        return f'<RegionOccurrence {self.region_id} {self.occurrence_id}>'
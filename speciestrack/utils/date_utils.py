@@ -16,3 +16,25 @@ def get_date_json():
     }
 
     return date_map
+
+
+def parse_gbif_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp from GBIF (e.g. lastInterpreted).
+
+    Args:
+        value: Timestamp string, possibly with a 'Z' or offset suffix
+
+    Returns:
+        Naive UTC datetime, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
@@ -1,5 +1,11 @@
 """Utility functions for geometry processing."""
 
+import math
+import re
+
+# Latitude limit of the Web Mercator projection used by map tiles
+MERCATOR_MAX_LATITUDE = 85.05112878
+
 
 def simplify_polygon(coordinates, max_points=100):
     """
@@ -84,3 +90,240 @@ def get_bounding_box_polygon(min_lon, min_lat, max_lon, max_lat):
 
     coord_strings = [f"{lon} {lat}" for lon, lat in coordinates]
     return f"POLYGON(({','.join(coord_strings)}))"
+
+
+def parse_bbox(value):
+    """
+    Parse a "min_lon,min_lat,max_lon,max_lat" bounding box (GeoJSON/OGC order).
+
+    A min_lon greater than max_lon describes a box that crosses the
+    antimeridian.
+
+    Args:
+        value: Comma separated bounding box string
+
+    Returns:
+        (min_lon, min_lat, max_lon, max_lat) tuple of floats
+
+    Raises:
+        ValueError: If the box is malformed or out of range
+    """
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError(f"bbox must be min_lon,min_lat,max_lon,max_lat: {value}")
+    min_lon, min_lat, max_lon, max_lat = (float(part) for part in parts)
+    if not all(-180 <= lon <= 180 for lon in (min_lon, max_lon)):
+        raise ValueError(f"bbox longitudes must be between -180 and 180: {value}")
+    if not (-90 <= min_lat <= max_lat <= 90):
+        raise ValueError(f"bbox latitudes must be between -90 and 90 with min <= max: {value}")
+    return (min_lon, min_lat, max_lon, max_lat)
+
+
+def bbox_longitude_ranges(bbox):
+    """
+    Split a bounding box into longitude ranges that do not cross the antimeridian.
+
+    Returns:
+        List of one or two (min_lon, max_lon) tuples
+    """
+    min_lon, _, max_lon, _ = bbox
+    if min_lon <= max_lon:
+        return [(min_lon, max_lon)]
+    return [(min_lon, 180.0), (-180.0, max_lon)]
+
+
+def parse_wkt_polygon(wkt):
+    """
+    Parse a WKT POLYGON string into its rings.
+
+    Args:
+        wkt: WKT POLYGON string, e.g. "POLYGON((lon lat,lon lat,...),(hole...))"
+
+    Returns:
+        List of rings, each a list of (lon, lat) tuples. The first ring is
+        the outer boundary and any others are holes.
+    """
+    rings = []
+    # Each ring is the text between a pair of innermost parentheses
+    for ring_text in re.findall(r"\(([^()]+)\)", wkt):
+        ring = []
+        for point in ring_text.split(","):
+            lon, lat = point.split()
+            ring.append((float(lon), float(lat)))
+        rings.append(ring)
+
+    return rings
+
+
+def polygon_bounds(rings):
+    """
+    Get the bounding box of a polygon.
+
+    Args:
+        rings: Polygon rings as returned by parse_wkt_polygon
+
+    Returns:
+        (min_lon, min_lat, max_lon, max_lat) tuple
+    """
+    lons = [lon for lon, _ in rings[0]]
+    lats = [lat for _, lat in rings[0]]
+    return (min(lons), min(lats), max(lons), max(lats))
+
+
+def point_in_polygon(lon, lat, rings):
+    """
+    Check whether a point lies inside a polygon, excluding its holes.
+    Uses even-odd ray casting over every ring.
+
+    Args:
+        lon: Point longitude
+        lat: Point latitude
+        rings: Polygon rings as returned by parse_wkt_polygon
+
+    Returns:
+        True if the point is inside the polygon
+    """
+    inside = False
+    for ring in rings:
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+            if (y1 > lat) != (y2 > lat):
+                crossing_lon = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+                if lon < crossing_lon:
+                    inside = not inside
+    return inside
+
+
+def _point_in_bounds(lon, lat, bounds):
+    min_lon, min_lat, max_lon, max_lat = bounds
+    return min_lon <= lon <= max_lon and min_lat <= lat <= max_lat
+
+
+def _segments_intersect(a, b, c, d):
+    """Check whether segment a-b crosses segment c-d"""
+    def orientation(p, q, r):
+        value = (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+        return (value > 0) - (value < 0)
+
+    o1, o2 = orientation(a, b, c), orientation(a, b, d)
+    o3, o4 = orientation(c, d, a), orientation(c, d, b)
+    return o1 != o2 and o3 != o4
+
+
+def bounds_intersect_polygon(bounds, rings):
+    """
+    Check whether a bounding box overlaps a polygon's outer boundary.
+
+    Args:
+        bounds: (min_lon, min_lat, max_lon, max_lat) tuple
+        rings: Polygon rings as returned by parse_wkt_polygon
+
+    Returns:
+        True if the box and the polygon overlap
+    """
+    outer = rings[0]
+    if any(_point_in_bounds(lon, lat, bounds) for lon, lat in outer):
+        return True
+
+    min_lon, min_lat, max_lon, max_lat = bounds
+    corners = [(min_lon, min_lat), (max_lon, min_lat), (max_lon, max_lat), (min_lon, max_lat)]
+    if any(point_in_polygon(lon, lat, [outer]) for lon, lat in corners):
+        return True
+
+    box_edges = list(zip(corners, corners[1:] + corners[:1]))
+    for a, b in zip(outer, outer[1:] + outer[:1]):
+        if any(_segments_intersect(a, b, c, d) for c, d in box_edges):
+            return True
+
+    return False
+
+
+def split_bounds(bounds):
+    """
+    Split a bounding box into four equal quadrants.
+
+    Args:
+        bounds: (min_lon, min_lat, max_lon, max_lat) tuple
+
+    Returns:
+        List of quadrant bounds in SW, SE, NW, NE order
+    """
+    min_lon, min_lat, max_lon, max_lat = bounds
+    mid_lon = (min_lon + max_lon) / 2
+    mid_lat = (min_lat + max_lat) / 2
+    return [
+        (min_lon, min_lat, mid_lon, mid_lat),
+        (mid_lon, min_lat, max_lon, mid_lat),
+        (min_lon, mid_lat, mid_lon, max_lat),
+        (mid_lon, mid_lat, max_lon, max_lat),
+    ]
+
+
+def quadtree_tiles(bounds, count, max_count, max_depth=8, rings=None):
+    """
+    Split a bounding box into a quadtree of tiles that each hold at most
+    `max_count` records.
+
+    Every tile is probed with `count`; tiles over the threshold are split
+    into quadrants until they fit or `max_depth` is reached. Tiles with no
+    records, or that do not overlap `rings`, are dropped.
+
+    Args:
+        bounds: (min_lon, min_lat, max_lon, max_lat) of the area to tile
+        count: Callable taking tile bounds and returning its record count
+        max_count: Largest record count allowed in one tile
+        max_depth: Maximum number of splits below the root tile
+        rings: Optional polygon rings; tiles outside it are not probed
+
+    Returns:
+        List of (key, bounds, count) tuples. The key is the quadrant path
+        from the root ("" for the root, "03" for the NE child of its SW child).
+    """
+    tiles = []
+    pending = [("", bounds)]
+
+    while pending:
+        key, tile_bounds = pending.pop()
+
+        if rings is not None and key and not bounds_intersect_polygon(tile_bounds, rings):
+            continue
+
+        tile_count = count(tile_bounds)
+        if tile_count <= 0:
+            continue
+
+        if tile_count <= max_count or len(key) >= max_depth:
+            tiles.append((key, tile_bounds, tile_count))
+            continue
+
+        for quadrant, child_bounds in enumerate(split_bounds(tile_bounds)):
+            pending.append((key + str(quadrant), child_bounds))
+
+    tiles.sort(key=lambda tile: tile[0])
+    return tiles
+
+
+def mercator_cell(lon, lat, cells):
+    """
+    Find the Web Mercator grid cell holding a point.
+
+    The world is split into cells x cells squares in the projection used by
+    map tiles (x grows eastwards from -180, y grows southwards from the
+    north edge), so a cell covers the same number of screen pixels
+    everywhere on the map.
+
+    Args:
+        lon: Longitude in degrees
+        lat: Latitude in degrees, clamped to the projection's limits
+        cells: Cells per axis
+
+    Returns:
+        (x, y) integer cell indexes in [0, cells)
+    """
+    lat = max(-MERCATOR_MAX_LATITUDE, min(MERCATOR_MAX_LATITUDE, lat))
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return (
+        min(cells - 1, max(0, int(x * cells))),
+        min(cells - 1, max(0, int(y * cells)))
+    )
@@ -0,0 +1,135 @@
+"""
+Scientific name normalisation for matching GBIF names against the
+native_plants catalog.
+
+GBIF names carry author citations ("Quercus lobata Née"), write hybrids
+several ways ("Quercus × alvordiana", "Quercus x alvordiana") and spell
+infraspecific ranks inconsistently ("ssp." / "subsp."). Normalising both
+sides to the same canonical form lets them be compared with a dict lookup.
+"""
+
+from collections import namedtuple
+import re
+
+# Canonical name ("Genus epithet [rank infraepithet]") and its genus + species key
+NormalizedName = namedtuple("NormalizedName", ["canonical", "species"])
+
+# Spellings of each infraspecific rank, mapped to the canonical abbreviation
+INFRASPECIFIC_RANKS = {
+    "ssp.": "subsp.",
+    "ssp": "subsp.",
+    "subsp.": "subsp.",
+    "subsp": "subsp.",
+    "var.": "var.",
+    "var": "var.",
+    "subvar.": "subvar.",
+    "f.": "f.",
+    "fo.": "f.",
+    "forma": "f.",
+}
+
+_GENUS = re.compile(r"^[A-Z][a-z]+(?:-[a-z]+)?$")
+_EPITHET = re.compile(r"^[a-z][a-z-]*$")
+# Hybrid marker, either standalone ("×", "x", "X") or glued to the name ("×alvordiana")
+_HYBRID_MARKER = re.compile(r"^(?:×|x|X)$")
+_HYBRID_PREFIX = re.compile(r"^×(?=\S)")
+# Separators between names in the other_names / obsolete_names columns
+_NAME_LIST_SEPARATOR = re.compile(r"[,;\n]+")
+
+
+def normalize_scientific_name(name):
+    """
+    Reduce a scientific name to its canonical form.
+
+    Author citations (including parenthesised basionym authors, "ex" and
+    "&" clauses) are dropped, hybrid markers are written as "×" glued to
+    the following name, and the first infraspecific rank is kept with its
+    canonical abbreviation:
+
+        "Ceanothus thyrsiflorus Eschsch. var. griseus Trel."
+            -> ("Ceanothus thyrsiflorus var. griseus", "Ceanothus thyrsiflorus")
+        "Quercus x alvordiana Eastw."
+            -> ("Quercus ×alvordiana", "Quercus ×alvordiana")
+
+    Args:
+        name: Scientific name, with or without authors
+
+    Returns:
+        NormalizedName, or None if the name has no genus and species epithet
+    """
+    if not name:
+        return None
+
+    tokens = name.split()
+    genus_hybrid = ""
+    if tokens and _HYBRID_MARKER.match(tokens[0]):
+        genus_hybrid = "×"
+        tokens = tokens[1:]
+    elif tokens and _HYBRID_PREFIX.match(tokens[0]):
+        genus_hybrid = "×"
+        tokens[0] = tokens[0][1:]
+
+    if len(tokens) < 2 or not _GENUS.match(tokens[0]):
+        return None
+    genus = genus_hybrid + tokens[0]
+
+    position = 1
+    species_hybrid = ""
+    if _HYBRID_MARKER.match(tokens[position]):
+        species_hybrid = "×"
+        position += 1
+    elif _HYBRID_PREFIX.match(tokens[position]):
+        species_hybrid = "×"
+        tokens[position] = tokens[position][1:]
+
+    if position >= len(tokens) or not _EPITHET.match(tokens[position]):
+        return None
+    species = f"{genus} {species_hybrid}{tokens[position]}"
+
+    # Everything after the epithet is authors except a rank followed by an epithet
+    canonical = species
+    for index in range(position + 1, len(tokens) - 1):
+        rank = INFRASPECIFIC_RANKS.get(tokens[index].lower())
+        if rank is not None and _EPITHET.match(tokens[index + 1]):
+            canonical = f"{species} {rank} {tokens[index + 1]}"
+            break
+
+    return NormalizedName(canonical, species)
+
+
+def species_key(scientific_name, cache=None):
+    """
+    Genus + species of a name, so author and rank variants count as one
+    species. Names that do not normalise are kept as they are.
+
+    Args:
+        scientific_name: Scientific name, with or without authors
+        cache: Optional dictionary memoising results across calls
+
+    Returns:
+        Species name
+    """
+    if cache is not None:
+        key = cache.get(scientific_name)
+        if key is not None:
+            return key
+    normalized = normalize_scientific_name(scientific_name)
+    key = normalized.species if normalized is not None else scientific_name
+    if cache is not None:
+        cache[scientific_name] = key
+    return key
+
+
+def split_name_list(value):
+    """
+    Split an other_names / obsolete_names column into individual names.
+
+    Args:
+        value: Comma, semicolon or newline separated names, or None
+
+    Returns:
+        List of stripped, non-empty names
+    """
+    if not value:
+        return []
+    return [name.strip() for name in _NAME_LIST_SEPARATOR.split(value) if name.strip()]
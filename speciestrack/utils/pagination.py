@@ -0,0 +1,50 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row of a page. Clients pass it
+back unchanged to get the next page, so its format can change without
+breaking them.
+"""
+
+from datetime import datetime
+import base64
+import binascii
+import json
+
+
+def encode_cursor(event_date, row_id):
+    """
+    Encode the (event_date, id) sort key of a row as a cursor.
+
+    Args:
+        event_date: Row event_date, or None
+        row_id: Row id
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([event_date.isoformat() if event_date else None, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Cursor string from a previous response
+
+    Returns:
+        (event_date or None, id) tuple
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        event_date, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            raise ValueError("cursor id must be an integer")
+        return (datetime.fromisoformat(event_date) if event_date is not None else None), row_id
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
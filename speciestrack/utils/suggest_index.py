@@ -0,0 +1,92 @@
+"""
+Sorted prefix/token index for autocomplete.
+
+Every word-start suffix of every name is a key ("valley oak" is stored as
+"valley oak" and "oak"), so a query matches the start of any word. Keys are
+lowercased and accent-folded, kept in one sorted list, and looked up with
+bisect: a query costs O(log n) plus the matching keys.
+"""
+
+from bisect import bisect_left
+import unicodedata
+
+
+def fold(text):
+    """Lowercase and strip accents, so "Née" and "nee" compare equal"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+class SuggestIndex:
+    """
+    Autocomplete index over a fixed set of entries.
+
+    Entries are ranked by weight (highest first), then by their position in
+    the input. Results of one and two character queries, which match the
+    most keys, are memoised.
+    """
+
+    # Queries up to this length are memoised
+    MEMO_MAX_LENGTH = 2
+
+    def __init__(self, entries):
+        """
+        Build the index.
+
+        Args:
+            entries: List of (names, weight, value) tuples. names are the
+                     strings to match (e.g. scientific and common name),
+                     value is returned for a match.
+        """
+        self.values = []
+        self.weights = []
+        pairs = []
+        for position, (names, weight, value) in enumerate(entries):
+            self.values.append(value)
+            self.weights.append(weight)
+            for name in names:
+                if not name:
+                    continue
+                words = fold(name).split()
+                for start in range(len(words)):
+                    pairs.append((" ".join(words[start:]), position))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.positions = [position for _, position in pairs]
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def _ranked_matches(self, prefix):
+        seen = set()
+        start = bisect_left(self.keys, prefix)
+        for index in range(start, len(self.keys)):
+            if not self.keys[index].startswith(prefix):
+                break
+            seen.add(self.positions[index])
+        return sorted(seen, key=lambda position: (-self.weights[position], position))
+
+    def suggest(self, query, limit=10):
+        """
+        Find entries with a word starting with the query.
+
+        Args:
+            query: Text typed so far; case and accents are ignored, and
+                   several words match consecutive words of a name
+            limit: Maximum number of results
+
+        Returns:
+            List of entry values, highest weight first
+        """
+        prefix = " ".join(fold(query).split())
+        if not prefix:
+            return []
+
+        if len(prefix) <= self.MEMO_MAX_LENGTH:
+            ranked = self._memo.get(prefix)
+            if ranked is None:
+                ranked = self._memo[prefix] = self._ranked_matches(prefix)
+        else:
+            ranked = self._ranked_matches(prefix)
+        return [self.values[position] for position in ranked[:limit]]
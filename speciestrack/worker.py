@@ -0,0 +1,60 @@
+"""
+Background worker process: owns the scheduler and runs GBIF ingestion.
+
+Run exactly one of these next to any number of web processes:
+    speciestrack-worker
+    python -m speciestrack.worker
+"""
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+from datetime import datetime
+from speciestrack.main import create_app
+from speciestrack.jobs.gbif_job import store_all_regions
+from speciestrack.jobs.run_lock import run_exclusive
+
+GBIF_DAILY_JOB_ID = 'gbif_daily_fetch'
+
+
+def create_scheduler(app, scheduler_class=BlockingScheduler):
+    """
+    Build the scheduler with the daily ingestion job. It is not started.
+
+    Args:
+        app: Flask application the jobs run against
+        scheduler_class: APScheduler scheduler class to instantiate
+
+    Returns:
+        Scheduler instance
+    """
+    scheduler = scheduler_class()
+    # Every active region is ingested; the run lock still guards against a
+    # second worker or a manual run overlapping
+    scheduler.add_job(
+        func=lambda: run_exclusive(app, store_all_regions),
+        trigger="cron",
+        hour=12,
+        minute=0,
+        id=GBIF_DAILY_JOB_ID,
+        name='Fetch GBIF data daily at 12pm',
+        replace_existing=True
+    )
+    return scheduler
+
+
+def main():
+    """Entry point for speciestrack-worker: run the scheduler until interrupted"""
+    app = create_app()
+    scheduler = create_scheduler(app)
+
+    print(f"[{datetime.now()}] Starting speciestrack worker")
+    for job in scheduler.get_jobs():
+        print(f"Scheduled {job.id}: {job.trigger}")
+
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        print(f"[{datetime.now()}] Stopping speciestrack worker")
+
+
+if __name__ == "__main__":
+    main()
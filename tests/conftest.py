@@ -4,7 +4,7 @@ This file provides common test setup including database configuration and fixtur
 """
 
 import pytest
-from speciestrack.main import app as flask_app
+from speciestrack.main import create_app
 from speciestrack.models import db as _db
 from speciestrack.models.gbif_data import GbifData
 from speciestrack.models.native_plant import NativePlant
@@ -16,7 +16,7 @@ def app():
     Create and configure a Flask app instance for testing.
     Uses an in-memory SQLite database instead of production PostgreSQL.
     """
-    flask_app.config.update({
+    flask_app = create_app({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
         'SQLALCHEMY_TRACK_MODIFICATIONS': False,
@@ -0,0 +1,250 @@
+"""Tests for the gbif_data bulk write path."""
+
+import csv
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from speciestrack.jobs.bulk_insert import (
+    insert_gbif_rows,
+    upsert_gbif_rows,
+    rows_to_copy_buffer,
+    GBIF_INSERT_COLUMNS
+)
+from speciestrack.models.gbif_data import GbifData
+from speciestrack.models.region import RegionOccurrence
+
+
+def make_row(name, **overrides):
+    """Build a gbif_data row dictionary like the pipeline produces."""
+    row = {
+        "scientific_name": name,
+        "common_name": None,
+        "occurrence_id": None,
+        "observation_count": 1,
+        "observation_type": "",
+        "native": False,
+        "decimal_latitude": 37.93,
+        "decimal_longitude": -122.29,
+        "event_date": None,
+        "fetch_date": datetime(2025, 6, 1, 12, 0),
+    }
+    row.update(overrides)
+    return row
+
+
+class TestInsertGbifRows:
+    """Tests for insert_gbif_rows on SQLite (executemany path)."""
+
+    def test_insert_gbif_rows(self, db):
+        """Test that rows are inserted with column defaults applied."""
+        insert_gbif_rows([make_row(f"Species {i}") for i in range(250)])
+        db.session.commit()
+
+        assert GbifData.query.count() == 250
+        row = GbifData.query.first()
+        assert row.created_at is not None
+        assert row.fetch_date == datetime(2025, 6, 1, 12, 0)
+
+    def test_insert_gbif_rows_native_fields(self, db):
+        """Test that native and common_name values are written."""
+        insert_gbif_rows([make_row("Quercus lobata", native=True, common_name="Valley Oak")])
+        db.session.commit()
+
+        row = GbifData.query.first()
+        assert row.native is True
+        assert row.common_name == "Valley Oak"
+
+    def test_insert_gbif_rows_returns_inserted_count(self, db):
+        """Test that already stored occurrence ids are not counted as inserted."""
+        assert insert_gbif_rows([make_row("Quercus lobata", occurrence_id="1")]) == 1
+        assert insert_gbif_rows([
+            make_row("Quercus lobata", occurrence_id="1"),
+            make_row("Quercus lobata", occurrence_id="2"),
+        ]) == 1
+        db.session.commit()
+
+        assert GbifData.query.count() == 2
+
+    def test_insert_gbif_rows_empty(self, db):
+        """Test that an empty batch is a no-op."""
+        insert_gbif_rows([])
+        db.session.commit()
+
+        assert GbifData.query.count() == 0
+
+
+class TestUpsertGbifRows:
+    """Tests for upsert_gbif_rows keyed on occurrence_id."""
+
+    def test_upsert_inserts_new_occurrences(self, db):
+        """Test that unseen occurrence ids are inserted."""
+        result = upsert_gbif_rows([
+            make_row("Quercus lobata", occurrence_id="1", payload_hash="a"),
+            make_row("Aesculus californica", occurrence_id="2", payload_hash="b"),
+        ])
+        db.session.commit()
+
+        assert result.inserted == 2
+        assert GbifData.query.count() == 2
+
+    def test_upsert_skips_unchanged_payload(self, db):
+        """Test that rows with an unchanged payload hash are skipped."""
+        upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a")])
+        db.session.commit()
+
+        result = upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a")])
+        db.session.commit()
+
+        assert result.skipped == 1
+        assert result.inserted == 0
+        assert GbifData.query.count() == 1
+
+    def test_upsert_updates_changed_payload_in_place(self, db):
+        """Test that a changed payload rewrites the stored row and keeps its id."""
+        upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a")])
+        db.session.commit()
+        original = GbifData.query.filter_by(occurrence_id="1").first()
+        original_id = original.id
+        original_created_at = original.created_at
+
+        result = upsert_gbif_rows([
+            make_row("Quercus lobata", occurrence_id="1", payload_hash="b", observation_count=4)
+        ])
+        db.session.commit()
+        db.session.expire_all()
+
+        assert result.updated == 1
+        assert GbifData.query.count() == 1
+        updated = GbifData.query.filter_by(occurrence_id="1").first()
+        assert updated.id == original_id
+        assert updated.created_at == original_created_at
+        assert updated.observation_count == 4
+        assert updated.payload_hash == "b"
+
+    def test_upsert_deduplicates_within_batch(self, db):
+        """Test that an occurrence repeated in one batch is stored once."""
+        result = upsert_gbif_rows([
+            make_row("Quercus lobata", occurrence_id="1", payload_hash="a"),
+            make_row("Quercus lobata", occurrence_id="1", payload_hash="a"),
+        ])
+        db.session.commit()
+
+        assert result.inserted == 1
+        assert result.skipped == 1
+        assert GbifData.query.count() == 1
+
+    def test_upsert_inserts_rows_without_occurrence_id(self, db):
+        """Test that rows without an occurrence id are always inserted."""
+        upsert_gbif_rows([make_row("Quercus lobata"), make_row("Quercus lobata")])
+        db.session.commit()
+
+        assert GbifData.query.count() == 2
+
+    def test_upsert_normalises_integer_occurrence_ids(self, db):
+        """Test that GBIF integer keys match stored string ids."""
+        upsert_gbif_rows([make_row("Quercus lobata", occurrence_id=4055379494, payload_hash="a")])
+        db.session.commit()
+
+        result = upsert_gbif_rows([make_row("Quercus lobata", occurrence_id=4055379494, payload_hash="a")])
+        db.session.commit()
+
+        assert result.skipped == 1
+        assert GbifData.query.count() == 1
+
+    def test_upsert_tags_unchanged_rows_with_region(self, db):
+        """Test that an unchanged payload fetched for a region still sets region_id."""
+        upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a")])
+        db.session.commit()
+
+        result = upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=7)])
+        db.session.commit()
+        db.session.expire_all()
+
+        assert result.updated == 1
+        assert GbifData.query.one().region_id == 7
+
+        result = upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=7)])
+        assert result.skipped == 1
+
+    def test_upsert_links_other_region_without_retagging(self, db):
+        """Test that a second region links a stored occurrence but keeps its first region_id."""
+        upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=1)])
+        db.session.commit()
+
+        result = upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=2)])
+        db.session.commit()
+        db.session.expire_all()
+
+        assert (result.updated, result.skipped, result.linked) == (0, 1, 1)
+        assert GbifData.query.one().region_id == 1
+        assert {(link.region_id, link.occurrence_id) for link in RegionOccurrence.query.all()} == {(1, "1"), (2, "1")}
+
+        result = upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=1)])
+        assert (result.updated, result.skipped, result.linked) == (0, 1, 0)
+
+    def test_upsert_without_region_keeps_stored_region(self, db):
+        """Test that a changed payload with no region_id does not clear the stored one."""
+        upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=7)])
+        db.session.commit()
+
+        result = upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="b")])
+        db.session.commit()
+        db.session.expire_all()
+
+        assert result.updated == 1
+        row = GbifData.query.one()
+        assert row.region_id == 7
+        assert row.payload_hash == "b"
+
+    def test_upsert_skips_occurrence_inserted_concurrently(self, db):
+        """Test that a row stored by another run after the lookup is skipped, not a unique violation."""
+        upsert_gbif_rows([make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=1)])
+        db.session.commit()
+
+        # As if the other run committed between this run's lookup and its insert
+        with patch("speciestrack.jobs.bulk_insert._existing_occurrences", return_value={}):
+            result = upsert_gbif_rows([
+                make_row("Quercus lobata", occurrence_id="1", payload_hash="a", region_id=2),
+                make_row("Aesculus californica", occurrence_id="2", payload_hash="b", region_id=2),
+            ])
+        db.session.commit()
+
+        assert result.inserted == 1
+        assert result.skipped == 1
+        assert GbifData.query.count() == 2
+
+
+class TestRowsToCopyBuffer:
+    """Tests for the PostgreSQL COPY serialiser."""
+
+    def test_copy_buffer_column_order(self):
+        """Test that values are written in GBIF_INSERT_COLUMNS order."""
+        buffer = rows_to_copy_buffer([make_row("Quercus lobata", occurrence_id="123")])
+        values = next(csv.reader(buffer))
+
+        assert len(values) == len(GBIF_INSERT_COLUMNS)
+        assert values[GBIF_INSERT_COLUMNS.index("scientific_name")] == "Quercus lobata"
+        assert values[GBIF_INSERT_COLUMNS.index("occurrence_id")] == "123"
+
+    def test_copy_buffer_null_and_empty_string(self):
+        """Test that NULL and empty strings stay distinct."""
+        buffer = rows_to_copy_buffer([make_row("Quercus lobata")])
+        values = next(csv.reader(buffer))
+
+        assert values[GBIF_INSERT_COLUMNS.index("common_name")] == "\\N"
+        assert values[GBIF_INSERT_COLUMNS.index("observation_type")] == ""
+
+    def test_copy_buffer_booleans_and_dates(self):
+        """Test boolean and datetime formatting."""
+        buffer = rows_to_copy_buffer([make_row("Quercus lobata", native=True)])
+        values = next(csv.reader(buffer))
+
+        assert values[GBIF_INSERT_COLUMNS.index("native")] == "t"
+        assert values[GBIF_INSERT_COLUMNS.index("fetch_date")] == "2025-06-01T12:00:00"
+
+    def test_copy_buffer_quotes_commas(self):
+        """Test that names with commas survive CSV quoting."""
+        buffer = rows_to_copy_buffer([make_row("Aesculus californica (Spach) Nutt., 1838")])
+        values = next(csv.reader(buffer))
+
+        assert values[0] == "Aesculus californica (Spach) Nutt., 1838"
@@ -0,0 +1,141 @@
+"""Tests for precomputed observation clusters and the /clusters endpoint."""
+
+import pytest
+from unittest.mock import patch
+from speciestrack.jobs.cluster_job import refresh_observation_clusters, cells_per_axis
+from speciestrack.jobs.gbif_job import GbifPage, store_gbif_data
+from speciestrack.models.gbif_data import GbifData
+from speciestrack.models.observation_cluster import ObservationCluster
+
+WILDCAT_VIEWPORT = "-122.35,37.90,-122.25,37.95"
+
+
+@pytest.fixture
+def small_grid(monkeypatch):
+    """Keep the cluster pyramid small for tests."""
+    monkeypatch.setenv("CLUSTER_MAX_ZOOM", "12")
+    monkeypatch.setenv("CLUSTER_CELL_PIXELS", "64")
+    monkeypatch.setenv("CLUSTER_TOP_SPECIES", "2")
+
+
+class TestRefreshObservationClusters:
+    """Tests for refresh_observation_clusters function."""
+
+    def test_every_zoom_counts_every_located_row(self, db, gbif_sample_data, small_grid):
+        """Test that each zoom level accounts for every located observation."""
+        db.session.add(GbifData(scientific_name="Nowhere", occurrence_id="no-location"))
+        db.session.commit()
+
+        refresh_observation_clusters()
+
+        for zoom in range(13):
+            clusters = ObservationCluster.query.filter_by(zoom=zoom).all()
+            assert sum(cluster.observation_count for cluster in clusters) == 4
+            assert sum(cluster.native_count for cluster in clusters) == 3
+
+    def test_low_zoom_merges_nearby_points(self, db, gbif_sample_data, small_grid):
+        """Test that nearby observations share a cluster at low zoom and split at high zoom."""
+        refresh_observation_clusters()
+
+        world = ObservationCluster.query.filter_by(zoom=0).one()
+        assert world.observation_count == 4
+        assert world.longitude == pytest.approx((-122.3244 - 122.28 - 122.29 - 122.30) / 4)
+        assert ObservationCluster.query.filter_by(zoom=12).count() > 1
+
+    def test_top_species_uses_normalised_names(self, db, small_grid):
+        """Test that author variants count as one species in the breakdown."""
+        names = ["Quercus lobata", "Quercus lobata Née", "Quercus lobata Née", "Pinus sabiniana", "Salix lasiolepis"]
+        for index, name in enumerate(names):
+            db.session.add(GbifData(scientific_name=name, occurrence_id=str(index),
+                                    decimal_latitude=37.92, decimal_longitude=-122.3))
+        db.session.commit()
+
+        refresh_observation_clusters()
+
+        feature = ObservationCluster.query.filter_by(zoom=0).one().to_feature()
+        assert feature["properties"]["top_species"] == [
+            {"species": "Quercus lobata", "count": 3},
+            {"species": "Pinus sabiniana", "count": 1},
+        ]
+
+    def test_refresh_replaces_clusters(self, db, gbif_sample_data, small_grid):
+        """Test that a second refresh rebuilds the table instead of adding to it."""
+        first = refresh_observation_clusters()
+        GbifData.query.delete()
+        db.session.commit()
+
+        assert refresh_observation_clusters() == 0
+        assert first > 0
+        assert ObservationCluster.query.count() == 0
+
+    def test_cells_per_axis(self):
+        """Test the grid size at a zoom level."""
+        assert cells_per_axis(0, 64) == 4
+        assert cells_per_axis(3, 64) == 32
+
+
+class TestRefreshAfterIngestion:
+    """Tests that ingestion jobs refresh the clusters."""
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_gbif_data_refreshes_clusters(self, mock_fetch, app, db, small_grid):
+        """Test that a run that stores rows rebuilds the clusters."""
+        mock_fetch.return_value = [GbifPage(0, [
+            {"name": "Quercus lobata", "occurrence_id": "1", "latitude": 37.92, "longitude": -122.3},
+        ])]
+
+        store_gbif_data(app)
+
+        assert ObservationCluster.query.filter_by(zoom=0).one().observation_count == 1
+
+    @patch('speciestrack.jobs.gbif_job.refresh_derived_data')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_unchanged_run_skips_refresh(self, mock_fetch, mock_refresh, app, db):
+        """Test that a run storing nothing new does not rebuild the clusters."""
+        mock_fetch.return_value = []
+
+        store_gbif_data(app)
+
+        mock_refresh.assert_not_called()
+
+
+class TestClustersEndpoint:
+    """Tests for the /clusters route."""
+
+    def test_clusters_in_viewport(self, client, db, gbif_sample_data, small_grid):
+        """Test that clusters inside the viewport are returned as GeoJSON."""
+        refresh_observation_clusters()
+
+        response = client.get(f"/clusters?bbox={WILDCAT_VIEWPORT}&zoom=5")
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/geo+json"
+        assert data["zoom"] == 5
+        assert len(data["features"]) == 1
+        assert data["features"][0]["properties"]["observation_count"] == 4
+
+    def test_viewport_elsewhere_is_empty(self, client, db, gbif_sample_data, small_grid):
+        """Test that clusters outside the viewport are not returned."""
+        refresh_observation_clusters()
+
+        data = client.get("/clusters?bbox=2.2,48.8,2.4,48.9&zoom=10").get_json()
+
+        assert data["features"] == []
+
+    def test_zoom_above_max_uses_finest_level(self, client, db, gbif_sample_data, small_grid):
+        """Test that deep zoom levels are served from CLUSTER_MAX_ZOOM."""
+        refresh_observation_clusters()
+
+        data = client.get(f"/clusters?bbox={WILDCAT_VIEWPORT}&zoom=20").get_json()
+
+        assert data["zoom"] == 12
+        assert sum(f["properties"]["observation_count"] for f in data["features"]) == 4
+
+    def test_invalid_parameters(self, client, db):
+        """Test that missing or invalid parameters return 400."""
+        for query in ["zoom=3", f"bbox={WILDCAT_VIEWPORT}", f"bbox={WILDCAT_VIEWPORT}&zoom=x",
+                      f"bbox={WILDCAT_VIEWPORT}&zoom=-1", "bbox=1,2&zoom=3"]:
+            response = client.get(f"/clusters?{query}")
+            assert response.status_code == 400
+            assert "error" in response.get_json()
@@ -0,0 +1,214 @@
+"""Tests for Darwin Core Archive ingestion."""
+
+import zipfile
+import pytest
+from unittest.mock import Mock, patch
+from speciestrack.jobs.gbif_archive import (
+    iter_archive_pages,
+    read_archive_layout,
+    build_download_predicate,
+    request_gbif_download,
+    store_gbif_archive
+)
+from speciestrack.jobs import ingest_pipeline
+from speciestrack.jobs.gbif_job import GbifFetchError, GbifPage, parse_gbif_results
+from speciestrack.jobs.ingest_pipeline import run_ingestion_pipeline
+from speciestrack.jobs.native_plant_index import NativePlantIndex
+from speciestrack.models.gbif_data import GbifData
+
+META_XML = """<?xml version="1.0" encoding="utf-8"?>
+<archive xmlns="http://rs.tdwg.org/dwc/text/" metadata="metadata.xml">
+  <core encoding="UTF-8" fieldsTerminatedBy="\\t" linesTerminatedBy="\\n" fieldsEnclosedBy=""
+        ignoreHeaderLines="1" rowType="http://rs.tdwg.org/dwc/terms/Occurrence">
+    <files>
+      <location>occurrence.txt</location>
+    </files>
+    <id index="0" />
+    <field index="0" term="http://rs.gbif.org/terms/1.0/gbifID"/>
+    <field index="1" term="http://rs.tdwg.org/dwc/terms/eventDate"/>
+    <field index="2" term="http://rs.tdwg.org/dwc/terms/decimalLatitude"/>
+    <field index="3" term="http://rs.tdwg.org/dwc/terms/decimalLongitude"/>
+    <field index="4" term="http://rs.tdwg.org/dwc/terms/scientificName"/>
+    <field index="5" term="http://rs.gbif.org/terms/1.0/lastInterpreted"/>
+  </core>
+</archive>
+"""
+
+HEADER = "gbifID\teventDate\tdecimalLatitude\tdecimalLongitude\tscientificName\tlastInterpreted\n"
+
+
+def write_archive(path, rows, include_meta=True):
+    """Write a minimal DwC-A zip with the given occurrence rows."""
+    lines = [HEADER] + ["\t".join(row) + "\n" for row in rows]
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        if include_meta:
+            archive.writestr("meta.xml", META_XML)
+        archive.writestr("occurrence.txt", "".join(lines))
+    return path
+
+
+def occurrence_row(i, name="Quercus lobata Née"):
+    """Build an occurrence.txt row for gbifID i."""
+    return [str(i), "2025-05-01T10:00:00", "37.93", "-122.29", name, "2025-06-02T09:00:00.000Z"]
+
+
+class TestReadArchive:
+    """Tests for reading DwC-A zips."""
+
+    def test_read_archive_layout_from_meta(self, tmp_path):
+        """Test that meta.xml provides the core file and column indexes."""
+        path = write_archive(tmp_path / "download.zip", [occurrence_row(1)])
+
+        with zipfile.ZipFile(path) as archive:
+            layout = read_archive_layout(archive)
+
+        assert layout["location"] == "occurrence.txt"
+        assert layout["delimiter"] == "\t"
+        assert layout["header_lines"] == 1
+        assert layout["columns"]["scientificName"] == 4
+        assert layout["columns"]["gbifID"] == 0
+
+    def test_iter_archive_pages(self, tmp_path):
+        """Test that rows are streamed into pages of observations."""
+        path = write_archive(tmp_path / "download.zip", [occurrence_row(i) for i in range(25)])
+
+        pages = list(iter_archive_pages(path, page_size=10))
+
+        assert [len(page.observations) for page in pages] == [10, 10, 5]
+        assert [page.offset for page in pages] == [0, 10, 20]
+        first = pages[0].observations[0]
+        assert first["name"] == "Quercus lobata Née"
+        assert first["occurrence_id"] == "0"
+        assert first["latitude"] == 37.93
+        assert first["last_interpreted"] == "2025-06-02T09:00:00.000Z"
+
+    def test_iter_archive_pages_without_meta(self, tmp_path):
+        """Test that the header row is used when meta.xml is missing."""
+        path = write_archive(tmp_path / "download.zip", [occurrence_row(1)], include_meta=False)
+
+        pages = list(iter_archive_pages(path))
+
+        assert pages[0].observations[0]["name"] == "Quercus lobata Née"
+
+    def test_iter_archive_pages_skips_rows_without_names(self, tmp_path):
+        """Test that rows without a scientific name are skipped."""
+        path = write_archive(tmp_path / "download.zip", [occurrence_row(1), occurrence_row(2, name="")])
+
+        pages = list(iter_archive_pages(path))
+
+        assert len(pages[0].observations) == 1
+
+
+class TestDownloadApi:
+    """Tests for the GBIF download API client."""
+
+    def test_build_download_predicate(self):
+        """Test that the predicate mirrors the search filters."""
+        predicate = build_download_predicate(dataset_key="abc", geometry="POLYGON((0 0,1 0,1 1,0 0))")
+
+        assert predicate["type"] == "and"
+        assert {"type": "equals", "key": "DATASET_KEY", "value": "abc"} in predicate["predicates"]
+        assert {"type": "within", "geometry": "POLYGON((0 0,1 0,1 1,0 0))"} in predicate["predicates"]
+
+    @patch('speciestrack.jobs.gbif_archive.requests.get')
+    @patch('speciestrack.jobs.gbif_archive.requests.post')
+    def test_request_gbif_download(self, mock_post, mock_get, tmp_path):
+        """Test that a download is requested, polled and saved."""
+        mock_post.return_value = Mock(status_code=201, text="0001-123")
+
+        running = Mock(status_code=200)
+        running.json.return_value = {"status": "RUNNING"}
+        succeeded = Mock(status_code=200)
+        succeeded.json.return_value = {"status": "SUCCEEDED", "downloadLink": "https://example.org/0001-123.zip"}
+        archive_response = Mock(status_code=200)
+        archive_response.iter_content.return_value = [b"PK", b"data"]
+        archive_response.__enter__ = Mock(return_value=archive_response)
+        archive_response.__exit__ = Mock(return_value=False)
+        mock_get.side_effect = [running, succeeded, archive_response]
+
+        destination = tmp_path / "download.zip"
+        request_gbif_download(destination, poll_seconds=0)
+
+        assert destination.read_bytes() == b"PKdata"
+
+    @patch('speciestrack.jobs.gbif_archive.requests.get')
+    @patch('speciestrack.jobs.gbif_archive.requests.post')
+    def test_request_gbif_download_failed(self, mock_post, mock_get, tmp_path):
+        """Test that a killed download raises GbifFetchError."""
+        mock_post.return_value = Mock(status_code=201, text="0001-123")
+        killed = Mock(status_code=200)
+        killed.json.return_value = {"status": "KILLED"}
+        mock_get.return_value = killed
+
+        with pytest.raises(GbifFetchError):
+            request_gbif_download(tmp_path / "download.zip", poll_seconds=0)
+
+
+class TestStoreGbifArchive:
+    """Tests for store_gbif_archive function."""
+
+    def test_store_gbif_archive(self, app, db, native_plant_sample_data, tmp_path):
+        """Test that archive rows are matched and stored."""
+        path = write_archive(tmp_path / "download.zip", [
+            occurrence_row(1),
+            occurrence_row(2, name="Eucalyptus globulus Labill."),
+        ])
+
+        stats = store_gbif_archive(app, path)
+
+        assert stats.stored == 2
+        oak = GbifData.query.filter_by(occurrence_id="1").first()
+        assert oak.native is True
+        assert oak.common_name == "Valley Oak"
+
+    def test_store_gbif_archive_is_idempotent(self, app, db, tmp_path):
+        """Test that importing the same archive twice does not duplicate rows."""
+        path = write_archive(tmp_path / "download.zip", [occurrence_row(i) for i in range(5)])
+
+        store_gbif_archive(app, path)
+        store_gbif_archive(app, path)
+
+        assert GbifData.query.count() == 5
+
+    def test_api_fetch_after_archive_skips_unchanged_rows(self, app, db, tmp_path):
+        """Test that an occurrence loaded from an archive is not rewritten when the API returns it."""
+        path = write_archive(tmp_path / "download.zip", [
+            ["4055379494", "2025-05-01T10:00", "37.930", "-122.29", "Quercus lobata Née", "2025-06-02T09:00:00.000Z"]
+        ])
+        store_gbif_archive(app, path)
+
+        observations = parse_gbif_results([{
+            "key": 4055379494,
+            "eventDate": "2025-05-01T10:00:00",
+            "decimalLatitude": 37.93,
+            "decimalLongitude": -122.29,
+            "scientificName": "Quercus lobata Née",
+        }])
+        stats = run_ingestion_pipeline([GbifPage(0, observations)], NativePlantIndex([]))
+
+        assert (stats.inserted, stats.updated, stats.skipped) == (0, 0, 1)
+        assert GbifData.query.count() == 1
+
+    def test_failed_import_refreshes_committed_batches(self, app, db, monkeypatch):
+        """Test that batches committed before an import fails still refresh derived data."""
+        monkeypatch.setenv("GBIF_INSERT_BATCH_SIZE", "1")
+        pages = [
+            GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": "1"}]),
+            GbifPage(1, [{"name": "Quercus lobata", "occurrence_id": "2"}]),
+        ]
+        upsert = ingest_pipeline.upsert_gbif_rows
+        calls = []
+
+        def fail_second_batch(rows):
+            calls.append(rows)
+            if len(calls) > 1:
+                raise RuntimeError("database went away")
+            return upsert(rows)
+
+        with patch('speciestrack.jobs.gbif_archive.iter_archive_pages', return_value=pages), \
+                patch.object(ingest_pipeline, "upsert_gbif_rows", side_effect=fail_second_batch), \
+                patch('speciestrack.jobs.gbif_archive.refresh_derived_data') as mock_refresh:
+            assert store_gbif_archive(app, "download.zip") is None
+
+        assert GbifData.query.count() == 1
+        mock_refresh.assert_called_once()
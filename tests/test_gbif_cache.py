@@ -0,0 +1,160 @@
+"""Tests for the GBIF response disk cache."""
+
+import os
+import time
+import pytest
+from unittest.mock import Mock, patch
+from speciestrack.jobs.gbif_cache import GbifResponseCache, GbifCacheMiss, cache_key
+from speciestrack.jobs.gbif_client import GbifClient
+
+URL = "https://gbif.test/occurrence/search"
+
+
+def make_response(status_code=200, text='{"results": [{"key": 1}]}'):
+    """Build a mock requests.Response."""
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = {}
+    return response
+
+
+class TestCacheKey:
+    """Tests for cache key normalisation."""
+
+    def test_parameter_order_does_not_matter(self):
+        """Test that equivalent parameter sets share a key."""
+        assert cache_key(URL, {"offset": 0, "limit": 300}) == cache_key(URL, {"limit": "300", "offset": "0"})
+
+    def test_empty_values_are_ignored(self):
+        """Test that unset parameters do not change the key."""
+        assert cache_key(URL, {"limit": 300, "dataset_key": None}) == cache_key(URL, {"limit": 300})
+
+    def test_different_queries_differ(self):
+        """Test that different offsets get different keys."""
+        assert cache_key(URL, {"offset": 0}) != cache_key(URL, {"offset": 300})
+
+
+class TestGbifResponseCache:
+    """Tests for GbifResponseCache."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a recorded response is served back compressed from disk."""
+        cache = GbifResponseCache(str(tmp_path))
+        cache.put(URL, {"offset": 0}, make_response())
+
+        cached = cache.get(URL, {"offset": 0})
+
+        assert cached.status_code == 200
+        assert cached.json() == {"results": [{"key": 1}]}
+        assert list(tmp_path.rglob("*.json.gz"))
+
+    def test_error_responses_are_not_cached(self, tmp_path):
+        """Test that non-200 responses are never stored."""
+        cache = GbifResponseCache(str(tmp_path))
+        cache.put(URL, {"offset": 0}, make_response(503))
+
+        assert cache.get(URL, {"offset": 0}) is None
+
+    def test_expired_entries_are_refetched(self, tmp_path):
+        """Test that entries older than the TTL are ignored in record mode."""
+        cache = GbifResponseCache(str(tmp_path), ttl_seconds=60)
+        cache.put(URL, {"offset": 0}, make_response())
+        path = next(tmp_path.rglob("*.json.gz"))
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        assert cache.get(URL, {"offset": 0}) is None
+
+    def test_replay_ignores_ttl_and_raises_on_miss(self, tmp_path):
+        """Test that replay serves old entries and fails on missing ones."""
+        GbifResponseCache(str(tmp_path)).put(URL, {"offset": 0}, make_response())
+        path = next(tmp_path.rglob("*.json.gz"))
+        old = time.time() - 10 * 24 * 3600
+        os.utime(path, (old, old))
+
+        cache = GbifResponseCache(str(tmp_path), mode="replay", ttl_seconds=60)
+
+        assert cache.get(URL, {"offset": 0}).status_code == 200
+        with pytest.raises(GbifCacheMiss):
+            cache.get(URL, {"offset": 300})
+
+    def test_size_eviction_removes_least_recently_used(self, tmp_path):
+        """Test that the oldest entries are evicted past max_bytes."""
+        cache = GbifResponseCache(str(tmp_path), max_bytes=10 ** 9)
+        for offset in range(3):
+            cache.put(URL, {"offset": offset}, make_response(text=os.urandom(400).hex()))
+            path = tmp_path / cache_key(URL, {"offset": offset})[:2] / f"{cache_key(URL, {'offset': offset})}.json.gz"
+            os.utime(path, (offset, offset))
+        entry_size = path.stat().st_size
+
+        cache.max_bytes = entry_size * 2
+        cache.put(URL, {"offset": 3}, make_response(text=os.urandom(400).hex()))
+
+        assert cache.get(URL, {"offset": 0}) is None
+        assert cache.get(URL, {"offset": 3}) is not None
+
+    def test_overwriting_a_key_does_not_grow_the_size(self, tmp_path):
+        """Test that re-recording a key replaces its size instead of adding to it."""
+        cache = GbifResponseCache(str(tmp_path))
+        for _ in range(3):
+            cache.put(URL, {"offset": 0}, make_response(text=os.urandom(400).hex()))
+
+        path = next(tmp_path.rglob("*.json.gz"))
+        assert cache.size == path.stat().st_size
+
+    def test_replay_on_a_later_day_uses_the_recorded_date_query(self, tmp_path):
+        """Test that date-derived params do not break replay, but are refetched when recording."""
+        recorded_day = {"offset": 0, "month": 5, "year": 2025, "start_day_of_year": 121}
+        later_day = {"offset": 0, "month": 5, "year": 2025, "start_day_of_year": 122}
+        GbifResponseCache(str(tmp_path)).put(URL, recorded_day, make_response())
+
+        replay = GbifResponseCache(str(tmp_path), mode="replay")
+        assert replay.get(URL, later_day).json() == {"results": [{"key": 1}]}
+
+        record = GbifResponseCache(str(tmp_path))
+        assert record.get(URL, recorded_day) is not None
+        assert record.get(URL, later_day) is None
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        """Test that the cache is configured from the environment."""
+        monkeypatch.setenv("GBIF_CACHE_MODE", "replay")
+        monkeypatch.setenv("GBIF_CACHE_DIR", str(tmp_path))
+
+        cache = GbifResponseCache.from_env()
+
+        assert cache.mode == "replay"
+        assert cache.directory == str(tmp_path)
+
+    def test_from_env_off_by_default(self, monkeypatch):
+        """Test that caching is disabled unless configured."""
+        monkeypatch.delenv("GBIF_CACHE_MODE", raising=False)
+
+        assert GbifResponseCache.from_env() is None
+
+
+class TestClientCaching:
+    """Tests for GbifClient with a response cache."""
+
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_record_then_replay(self, mock_get, tmp_path):
+        """Test that a recorded run replays without any network request."""
+        mock_get.return_value = make_response()
+        recorder = GbifClient(URL, rate_limit=0, cache=GbifResponseCache(str(tmp_path)))
+        recorder.get({"offset": 0, "limit": 300})
+        assert mock_get.call_count == 1
+
+        replayer = GbifClient(URL, rate_limit=0, cache=GbifResponseCache(str(tmp_path), mode="replay"))
+        response = replayer.get({"limit": 300, "offset": 0})
+
+        assert response.json() == {"results": [{"key": 1}]}
+        assert mock_get.call_count == 1
+
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_replay_miss_does_not_hit_network(self, mock_get, tmp_path):
+        """Test that replay mode fails instead of fetching."""
+        client = GbifClient(URL, rate_limit=0, cache=GbifResponseCache(str(tmp_path), mode="replay"))
+
+        with pytest.raises(GbifCacheMiss):
+            client.get({"offset": 0})
+        mock_get.assert_not_called()
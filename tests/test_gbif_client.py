@@ -0,0 +1,150 @@
+"""Tests for the pooled, retrying GBIF HTTP client."""
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from speciestrack.jobs.gbif_client import GbifClient, TokenBucket, parse_retry_after
+from speciestrack.jobs.gbif_job import fetch_gbif_data_raw
+
+
+def make_response(status_code, results=None, headers=None):
+    """Build a mock GBIF response."""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.text = "error"
+    response.json.return_value = {"results": results or []}
+    return response
+
+
+def make_client(**overrides):
+    """Build a client with no rate limit and fast backoff."""
+    options = {"url": "https://gbif.test/occurrence/search", "rate_limit": 0, "backoff_base": 0.01}
+    options.update(overrides)
+    return GbifClient(**options)
+
+
+class TestGbifClient:
+    """Tests for GbifClient retries and session setup."""
+
+    def test_session_requests_gzip(self):
+        """Test that the shared session asks for compressed responses."""
+        client = make_client(username="user", password="secret")
+
+        assert client.session.headers["Accept-Encoding"] == "gzip"
+        assert client.session.auth == ("user", "secret")
+
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_retries_server_errors(self, mock_get, mock_sleep):
+        """Test that 5xx responses are retried until one succeeds."""
+        mock_get.side_effect = [make_response(503), make_response(502), make_response(200)]
+
+        response = make_client().get({"offset": 0})
+
+        assert response.status_code == 200
+        assert mock_get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_honours_retry_after(self, mock_get, mock_sleep):
+        """Test that a 429 waits for the Retry-After delay."""
+        mock_get.side_effect = [make_response(429, headers={"Retry-After": "7"}), make_response(200)]
+
+        make_client().get({"offset": 0})
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_gives_up_after_max_retries(self, mock_get, mock_sleep):
+        """Test that the last error response is returned once retries run out."""
+        mock_get.return_value = make_response(500)
+
+        response = make_client(max_retries=2).get({"offset": 0})
+
+        assert response.status_code == 500
+        assert mock_get.call_count == 3
+
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_does_not_retry_client_errors(self, mock_get, mock_sleep):
+        """Test that 4xx responses other than 429 are returned immediately."""
+        mock_get.return_value = make_response(400)
+
+        response = make_client().get({"offset": 0})
+
+        assert response.status_code == 400
+        assert mock_get.call_count == 1
+
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_retries_connection_errors(self, mock_get, mock_sleep):
+        """Test that connection errors are retried."""
+        mock_get.side_effect = [requests.ConnectionError("reset"), make_response(200)]
+
+        response = make_client().get({"offset": 0})
+
+        assert response.status_code == 200
+
+    def test_backoff_delay_is_bounded(self):
+        """Test that jittered backoff stays within the exponential ceiling."""
+        client = make_client(backoff_base=1.0, backoff_max=10.0)
+
+        for attempt in range(8):
+            assert 0 <= client.backoff_delay(attempt) <= min(10.0, 2 ** attempt)
+
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_transient_error_does_not_truncate_fetch(self, mock_get, mock_sleep):
+        """Test that a 503 in the middle of pagination no longer ends the run."""
+        full_page = [{"scientificName": f"Species {i}"} for i in range(300)]
+        mock_get.side_effect = [
+            make_response(200, full_page),
+            make_response(503),
+            make_response(200, [{"scientificName": "Last species"}]),
+        ]
+
+        result = fetch_gbif_data_raw(client=make_client())
+
+        assert len(result) == 301
+
+
+class TestRetryAfter:
+    """Tests for parse_retry_after."""
+
+    def test_parse_seconds(self):
+        assert parse_retry_after("12") == 12.0
+
+    def test_parse_http_date_in_past(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_parse_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestTokenBucket:
+    """Tests for the token bucket rate limiter."""
+
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    def test_burst_within_capacity_does_not_wait(self, mock_sleep):
+        """Test that requests within the bucket capacity are not delayed."""
+        bucket = TokenBucket(rate=5, capacity=5)
+
+        for _ in range(5):
+            bucket.acquire()
+
+        mock_sleep.assert_not_called()
+
+    def test_waits_when_empty(self):
+        """Test that an empty bucket delays the next request."""
+        bucket = TokenBucket(rate=50, capacity=1)
+        bucket.acquire()
+
+        with patch('speciestrack.jobs.gbif_client.time.sleep', side_effect=lambda s: None) as mock_sleep:
+            with patch('speciestrack.jobs.gbif_client.time.monotonic', side_effect=[bucket.updated, bucket.updated + 1]):
+                bucket.acquire()
+
+        assert mock_sleep.call_count == 1
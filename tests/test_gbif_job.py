@@ -1,17 +1,52 @@
 """Tests for GBIF data fetching and storage job."""
 
 import pytest
+import threading
+import time
 from unittest.mock import Mock, patch
 from datetime import datetime
-from speciestrack.jobs.gbif_job import fetch_gbif_data_raw, store_gbif_data
+from speciestrack.jobs.gbif_job import (
+    fetch_gbif_data_raw,
+    store_gbif_data,
+    build_search_params,
+    fetch_gbif_tiles,
+    GbifPage,
+    GbifTile,
+    GbifFetchError
+)
 from speciestrack.models.gbif_data import GbifData
+from speciestrack.models.gbif_sync_state import GbifSyncState
+from speciestrack.models.gbif_job_run import GbifJobRun
 from speciestrack.models.native_plant import NativePlant
+from speciestrack.utils.geometry_utils import parse_wkt_polygon, polygon_bounds
+
+
+class FakeGbifClient:
+    """In-memory stand-in for GbifClient that answers from a list of points."""
+
+    def __init__(self, points):
+        self.points = points  # (key, lon, lat)
+        self.requests = []
+
+    def get(self, params):
+        self.requests.append(params)
+        min_lon, min_lat, max_lon, max_lat = polygon_bounds(parse_wkt_polygon(params["geometry"]))
+        # GBIF treats points on the boundary as within the geometry
+        matches = [
+            {"key": key, "scientificName": "Quercus agrifolia", "decimalLongitude": lon, "decimalLatitude": lat}
+            for key, lon, lat in self.points
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat
+        ]
+        response = Mock(status_code=200)
+        offset, limit = params["offset"] if "offset" in params else 0, params["limit"]
+        response.json.return_value = {"count": len(matches), "results": matches[offset:offset + limit]}
+        return response
 
 
 class TestFetchGbifDataRaw:
     """Tests for fetch_gbif_data_raw function."""
 
-    @patch('speciestrack.jobs.gbif_job.requests.get')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
     def test_fetch_gbif_data_success(self, mock_get):
         """Test successful GBIF data fetch with single page."""
         # Mock successful API response
@@ -33,7 +68,7 @@ class TestFetchGbifDataRaw:
         assert result[0]["name"] == "Quercus lobata"
         assert result[1]["name"] == "Aesculus californica"
 
-    @patch('speciestrack.jobs.gbif_job.requests.get')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
     def test_fetch_gbif_data_empty_results(self, mock_get):
         """Test GBIF data fetch with no results."""
         # Mock empty API response
@@ -48,8 +83,9 @@ class TestFetchGbifDataRaw:
         # Verify results
         assert len(result) == 0
 
-    @patch('speciestrack.jobs.gbif_job.requests.get')
-    def test_fetch_gbif_data_api_error(self, mock_get):
+    @patch('speciestrack.jobs.gbif_client.time.sleep')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_fetch_gbif_data_api_error(self, mock_get, mock_sleep):
         """Test GBIF data fetch with API error."""
         # Mock failed API response
         mock_response = Mock()
@@ -63,7 +99,7 @@ class TestFetchGbifDataRaw:
         # Should return empty list on error
         assert len(result) == 0
 
-    @patch('speciestrack.jobs.gbif_job.requests.get')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
     def test_fetch_gbif_data_pagination(self, mock_get):
         """Test GBIF data fetch with pagination (multiple pages)."""
         # Mock two pages of results
@@ -89,7 +125,7 @@ class TestFetchGbifDataRaw:
         assert len(result) == 301
         assert mock_get.call_count == 2
 
-    @patch('speciestrack.jobs.gbif_job.requests.get')
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
     def test_fetch_gbif_data_filters_missing_names(self, mock_get):
         """Test that entries without scientificName are filtered out."""
         # Mock response with missing names
@@ -111,18 +147,160 @@ class TestFetchGbifDataRaw:
         assert len(result) == 1
         assert result[0]["name"] == "Valid species"
 
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_fetch_gbif_data_concurrent_keeps_offset_order(self, mock_get):
+        """Test that concurrent fetching returns pages in offset order."""
+        def page_for_offset(url, params, **kwargs):
+            offset = params["offset"]
+            response = Mock()
+            response.status_code = 200
+            # Three full pages followed by a short page at offset 900
+            count = 300 if offset < 900 else (10 if offset == 900 else 0)
+            response.json.return_value = {
+                "results": [{"scientificName": f"Species {offset + i}"} for i in range(count)]
+            }
+            return response
+
+        mock_get.side_effect = page_for_offset
+
+        result = fetch_gbif_data_raw(concurrency=4)
+
+        assert len(result) == 910
+        assert [item["name"] for item in result] == [f"Species {i}" for i in range(910)]
+
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_fetch_gbif_data_concurrent_stops_scheduling_at_end(self, mock_get):
+        """Test that no new pages are scheduled after a short page."""
+        def page_for_offset(url, params, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            count = 300 if params["offset"] == 0 else 5
+            response.json.return_value = {
+                "results": [{"scientificName": "Species"} for _ in range(count)]
+            }
+            return response
+
+        mock_get.side_effect = page_for_offset
+
+        result = fetch_gbif_data_raw(concurrency=3)
+
+        # First page plus the short page; at most one window of extra requests
+        assert len(result) == 305
+        assert mock_get.call_count <= 4
+
+    @patch('speciestrack.jobs.gbif_client.requests.Session.get')
+    def test_fetch_gbif_data_concurrent_respects_max_offset(self, mock_get, monkeypatch):
+        """Test that concurrent fetching never requests past the maximum offset."""
+        monkeypatch.setenv("GBIF_RATE_LIMIT", "0")
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {
+            "results": [{"scientificName": "Species"} for _ in range(300)]
+        }
+        mock_get.return_value = response
+
+        fetch_gbif_data_raw(concurrency=8)
+
+        offsets = [call.kwargs["params"]["offset"] for call in mock_get.call_args_list]
+        assert max(offsets) <= 100000
+        assert offsets == sorted(offsets)
+
+
+class TestFetchGbifTiles:
+    """Tests for fetch_gbif_tiles function."""
+
+    SQUARE = "POLYGON((0 0,10 0,10 10,0 10,0 0))"
+
+    def test_small_region_is_one_tile(self):
+        """Test that a polygon under the threshold is fetched as is."""
+        client = FakeGbifClient([(i, 1, 1) for i in range(5)])
+
+        pages = list(fetch_gbif_tiles(geometry=self.SQUARE, client=client, max_count=100))
+
+        assert [page.tile for page in pages] == [""]
+        assert len(pages[0].observations) == 5
+        assert client.requests[-1]["geometry"] == self.SQUARE
+
+    def test_single_tile_keeps_several_pages_in_flight(self, monkeypatch):
+        """Test that one tile still fetches GBIF_FETCH_CONCURRENCY pages at once."""
+        monkeypatch.setenv("GBIF_FETCH_CONCURRENCY", "4")
+        client = FakeGbifClient([(i, 1, 1) for i in range(1500)])
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+        get = client.get
+
+        def slow_get(params):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            try:
+                return get(params)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        client.get = slow_get
+        pages = list(fetch_gbif_tiles(geometry=self.SQUARE, client=client, max_count=5000))
+
+        assert [page.tile for page in pages] == [""] * 5
+        assert sum(len(page.observations) for page in pages) == 1500
+        assert peak[0] > 1
+
+    def test_dense_region_is_split_and_fetched_in_parallel(self):
+        """Test that a dense polygon is tiled and every record is fetched once."""
+        points = [(i, 1 + (i % 40) * 0.1, 1 + (i // 40) * 0.1) for i in range(400)]
+        points += [(1000 + i, 8, 8) for i in range(20)]
+        client = FakeGbifClient(points)
+
+        pages = list(fetch_gbif_tiles(geometry=self.SQUARE, client=client, max_count=150, concurrency=3))
+
+        keys = [obs["occurrence_id"] for page in pages for obs in page.observations]
+        assert sorted(keys) == sorted(point[0] for point in points)
+        assert len({page.tile for page in pages}) > 1
+
+    def test_edge_records_are_deduplicated(self):
+        """Test that a record on a shared tile edge is only yielded once."""
+        points = [(1, 5, 5)] + [(100 + i, 2, 2) for i in range(10)] + [(200 + i, 7, 7) for i in range(10)]
+        client = FakeGbifClient(points)
+
+        pages = list(fetch_gbif_tiles(geometry=self.SQUARE, client=client, max_count=12))
+
+        keys = [obs["occurrence_id"] for page in pages for obs in page.observations]
+        assert keys.count(1) == 1
+        assert len(keys) == 21
+
+    def test_records_outside_polygon_are_filtered(self):
+        """Test that bounding box tiles are filtered back to the polygon."""
+        triangle = "POLYGON((0 0,10 0,0 10,0 0))"
+        points = [(i, 1, 1) for i in range(10)] + [(100 + i, 9, 9) for i in range(10)]
+        client = FakeGbifClient(points)
+
+        pages = list(fetch_gbif_tiles(geometry=triangle, client=client, max_count=5, max_depth=2))
+
+        keys = {obs["occurrence_id"] for page in pages for obs in page.observations}
+        assert keys == set(range(10))
+
+    def test_tile_error_is_raised(self):
+        """Test that a failing tile fetch raises GbifFetchError."""
+        client = Mock()
+        client.get.return_value = Mock(status_code=500, text="Internal Server Error")
+
+        with pytest.raises(GbifFetchError):
+            list(fetch_gbif_tiles(geometry=self.SQUARE, client=client))
+
 
 class TestStoreGbifData:
     """Tests for store_gbif_data function."""
 
-    @patch('speciestrack.jobs.gbif_job.fetch_gbif_data_raw')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
     def test_store_gbif_data_success(self, mock_fetch, app, db):
         """Test successful storage of GBIF data."""
         # Mock fetch function to return test data
-        mock_fetch.return_value = [
+        mock_fetch.return_value = [GbifPage(0, [
             {"name": "Test species 1", "type": "specimen", "count": 5},
             {"name": "Test species 2", "type": "observation", "count": 3},
-        ]
+        ])]
 
         # Call the function
         store_gbif_data(app)
@@ -137,7 +315,7 @@ class TestStoreGbifData:
         assert species1.observation_count == 5
         assert species1.observation_type == "specimen"
 
-    @patch('speciestrack.jobs.gbif_job.fetch_gbif_data_raw')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
     def test_store_gbif_data_empty_fetch(self, mock_fetch, app, db):
         """Test storage when fetch returns no data."""
         # Mock empty fetch
@@ -150,14 +328,14 @@ class TestStoreGbifData:
         stored_count = GbifData.query.count()
         assert stored_count == 0
 
-    @patch('speciestrack.jobs.gbif_job.fetch_gbif_data_raw')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
     def test_store_gbif_data_identifies_native_plants(self, mock_fetch, app, db, native_plant_sample_data):
         """Test that native plants are correctly identified."""
         # Mock fetch to return species that match native plants
-        mock_fetch.return_value = [
+        mock_fetch.return_value = [GbifPage(0, [
             {"name": "Quercus lobata", "type": "specimen", "count": 1},
             {"name": "Eucalyptus globulus", "type": "specimen", "count": 1},
-        ]
+        ])]
 
         # Call the function
         store_gbif_data(app)
@@ -171,14 +349,14 @@ class TestStoreGbifData:
         assert non_native_plant is not None
         assert non_native_plant.native is False
 
-    @patch('speciestrack.jobs.gbif_job.fetch_gbif_data_raw')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
     def test_store_gbif_data_matches_with_author_names(self, mock_fetch, app, db, native_plant_sample_data):
         """Test that species with author names are matched to native plants."""
         # Mock fetch with author names appended
-        mock_fetch.return_value = [
+        mock_fetch.return_value = [GbifPage(0, [
             {"name": "Quercus lobata Née", "type": "specimen", "count": 1},
             {"name": "Aesculus californica (Spach) Nutt.", "type": "specimen", "count": 1},
-        ]
+        ])]
 
         # Call the function
         store_gbif_data(app)
@@ -192,13 +370,13 @@ class TestStoreGbifData:
         assert species2 is not None
         assert species2.native is True
 
-    @patch('speciestrack.jobs.gbif_job.fetch_gbif_data_raw')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
     def test_store_gbif_data_sets_fetch_date(self, mock_fetch, app, db):
         """Test that fetch_date is set when storing data."""
         # Mock fetch
-        mock_fetch.return_value = [
+        mock_fetch.return_value = [GbifPage(0, [
             {"name": "Test species", "type": "specimen", "count": 1},
-        ]
+        ])]
 
         # Get time before calling
         before_time = datetime.now()
@@ -215,7 +393,7 @@ class TestStoreGbifData:
         assert species.fetch_date is not None
         assert before_time <= species.fetch_date <= after_time
 
-    @patch('speciestrack.jobs.gbif_job.fetch_gbif_data_raw')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
     def test_store_gbif_data_handles_errors_gracefully(self, mock_fetch, app, db):
         """Test that errors during storage are handled gracefully."""
         # Mock fetch to raise an exception
@@ -231,15 +409,15 @@ class TestStoreGbifData:
         stored_count = GbifData.query.count()
         assert stored_count == 0
 
-    @patch('speciestrack.jobs.gbif_job.fetch_gbif_data_raw')
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
     def test_store_gbif_data_handles_partial_errors(self, mock_fetch, app, db):
         """Test that individual entry errors don't stop the entire job."""
         # Mock fetch with valid and problematic data
-        mock_fetch.return_value = [
+        mock_fetch.return_value = [GbifPage(0, [
             {"name": "Valid species", "type": "specimen", "count": 1},
             {"name": "", "type": "specimen", "count": 1},  # Empty name
             {"name": "Another valid species", "type": "observation", "count": 2},
-        ]
+        ])]
 
         # Call the function
         store_gbif_data(app)
@@ -247,3 +425,167 @@ class TestStoreGbifData:
         # Verify valid entries were stored despite error in one entry
         stored_count = GbifData.query.count()
         assert stored_count >= 2  # At least the valid ones should be stored
+
+
+class TestIncrementalSync:
+    """Tests for watermark-based incremental GBIF sync."""
+
+    def test_build_search_params_default_date_query(self):
+        """Test that without a watermark the query uses today's date filters."""
+        params = build_search_params()
+
+        assert "month" in params
+        assert "start_day_of_year" in params
+        assert "last_interpreted" not in params
+
+    def test_build_search_params_with_watermark(self):
+        """Test that a watermark replaces the date filters with a lastInterpreted range."""
+        params = build_search_params(since=datetime(2025, 6, 1, 8, 30))
+
+        assert params["last_interpreted"] == "2025-06-01T08:30:00,*"
+        assert "month" not in params
+        assert "year" not in params
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_gbif_data_advances_watermark(self, mock_fetch, app, db):
+        """Test that a complete run stores the newest lastInterpreted as the watermark."""
+        mock_fetch.return_value = [GbifPage(0, [
+            {"name": "Quercus lobata", "occurrence_id": "1", "last_interpreted": "2025-06-01T10:00:00.000+00:00"},
+            {"name": "Aesculus californica", "occurrence_id": "2", "last_interpreted": "2025-06-02T09:00:00Z"},
+        ])]
+
+        store_gbif_data(app)
+
+        state = GbifSyncState.query.one()
+        assert state.watermark == datetime(2025, 6, 2, 9, 0)
+        assert state.last_success_at is not None
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_gbif_data_uses_watermark(self, mock_fetch, app, db):
+        """Test that the next run only requests records newer than the watermark."""
+        mock_fetch.return_value = [GbifPage(0, [
+            {"name": "Quercus lobata", "occurrence_id": "1", "last_interpreted": "2025-06-02T09:00:00Z"},
+        ])]
+        store_gbif_data(app)
+
+        mock_fetch.return_value = []
+        store_gbif_data(app)
+
+        since = mock_fetch.call_args.kwargs["since"]
+        assert since is not None
+        assert since <= datetime(2025, 6, 2, 9, 0)
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_gbif_data_full_sync_ignores_watermark(self, mock_fetch, app, db):
+        """Test that full_sync runs the default query."""
+        mock_fetch.return_value = [GbifPage(0, [
+            {"name": "Quercus lobata", "occurrence_id": "1", "last_interpreted": "2025-06-02T09:00:00Z"},
+        ])]
+        store_gbif_data(app)
+
+        store_gbif_data(app, full_sync=True)
+
+        assert mock_fetch.call_args.kwargs["since"] is None
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_gbif_data_failed_fetch_keeps_watermark(self, mock_fetch, app, db):
+        """Test that a partial fetch stores rows but does not advance the watermark."""
+        def failing_pages(**kwargs):
+            yield GbifPage(0, [
+                {"name": "Quercus lobata", "occurrence_id": "1", "last_interpreted": "2025-06-02T09:00:00Z"},
+            ])
+            raise GbifFetchError("Error fetching data from GBIF API at offset 300: 503")
+
+        mock_fetch.side_effect = failing_pages
+
+        store_gbif_data(app)
+
+        assert GbifData.query.count() == 1
+        assert GbifSyncState.query.one().watermark is None
+
+
+class TestResumableRuns:
+    """Tests for checkpointed, resumable ingestion runs."""
+
+    TILES = [
+        GbifTile("0", "POLYGON((0 0,1 0,1 1,0 1,0 0))", (0, 0, 1, 1), 900),
+        GbifTile("1", "POLYGON((1 0,2 0,2 1,1 1,1 0))", (1, 0, 2, 1), 900),
+    ]
+
+    def failing_pages(self, **kwargs):
+        """Plan two tiles, store one page of tile 0, then fail."""
+        kwargs["on_plan"](self.TILES)
+        yield GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": "1"}], "0")
+        raise GbifFetchError("Error fetching data from GBIF API at offset 300: 503")
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_completed_run_is_recorded(self, mock_fetch, app, db):
+        """Test that a successful run is recorded with its checkpoint."""
+        mock_fetch.return_value = [GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": "1"}])]
+
+        store_gbif_data(app)
+
+        job_run = GbifJobRun.query.one()
+        assert job_run.status == GbifJobRun.STATUS_COMPLETED
+        assert job_run.rows_stored == 1
+        assert job_run.load_checkpoint()["offsets"] == {"": 300}
+        assert job_run.finished_at is not None
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_unchanged_rows_are_not_counted_as_stored(self, mock_fetch, app, db):
+        """Test that rows_stored counts only inserted and updated rows."""
+        mock_fetch.return_value = [GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": "1"}])]
+
+        store_gbif_data(app)
+        store_gbif_data(app)
+
+        first_run, second_run = GbifJobRun.query.order_by(GbifJobRun.id).all()
+        assert first_run.rows_stored == 1
+        assert second_run.rows_stored == 0
+        assert second_run.load_checkpoint()["offsets"] == {"": 300}
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_failed_run_keeps_checkpoint(self, mock_fetch, app, db):
+        """Test that a failed fetch leaves a checkpoint of the committed pages."""
+        mock_fetch.side_effect = self.failing_pages
+
+        store_gbif_data(app)
+
+        job_run = GbifJobRun.query.one()
+        assert job_run.status == GbifJobRun.STATUS_FAILED
+        checkpoint = job_run.load_checkpoint()
+        assert checkpoint["offsets"] == {"0": 300}
+        assert [tile[0] for tile in checkpoint["tiles"]] == ["0", "1"]
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_resume_continues_from_checkpoint(self, mock_fetch, app, db):
+        """Test that --resume reuses the query, tile plan and offsets of the failed run."""
+        mock_fetch.side_effect = self.failing_pages
+        store_gbif_data(app)
+        failed_run = GbifJobRun.query.one()
+
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = [GbifPage(300, [{"name": "Quercus lobata", "occurrence_id": "2"}], "0")]
+        store_gbif_data(app, resume=True)
+
+        kwargs = mock_fetch.call_args.kwargs
+        assert kwargs["start_offsets"] == {"0": 300}
+        assert [tile.key for tile in kwargs["tiles"]] == ["0", "1"]
+        assert kwargs["since"] == failed_run.since
+
+        db.session.expire_all()
+        job_run = GbifJobRun.query.one()
+        assert job_run.status == GbifJobRun.STATUS_COMPLETED
+        assert job_run.rows_stored == 2
+        assert GbifData.query.count() == 2
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_resume_without_unfinished_run_starts_fresh(self, mock_fetch, app, db):
+        """Test that --resume after a completed run starts a new run."""
+        mock_fetch.return_value = [GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": "1"}])]
+        store_gbif_data(app)
+
+        store_gbif_data(app, resume=True)
+
+        assert mock_fetch.call_args.kwargs["start_offsets"] is None
+        assert GbifJobRun.query.count() == 2
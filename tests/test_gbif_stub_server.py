@@ -0,0 +1,74 @@
+"""Tests for the local GBIF stand-in server used by the ingestion benchmark."""
+
+import pytest
+from misc.gbif_stub_server import start_stub_server, generate_records, FIRST_KEY, SEARCH_PATH, STATS_PATH
+from speciestrack.jobs.gbif_client import GbifClient
+from speciestrack.jobs.gbif_job import store_gbif_data, LIMIT, WILDCAT_CANYON_POLYGON
+from speciestrack.utils.geometry_utils import parse_wkt_polygon, point_in_polygon
+from speciestrack.models.gbif_data import GbifData
+
+
+@pytest.fixture
+def stub_server():
+    """Run a stub server with 1000 records for one test."""
+    server = start_stub_server(records=1000)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestGbifStubServer:
+    """Tests for the stub occurrence search endpoint."""
+
+    def test_serves_pages_and_counts(self, stub_server):
+        """Test that pages and counts follow limit/offset like GBIF."""
+        with GbifClient(stub_server.url, rate_limit=0) as client:
+            page = client.get({"limit": LIMIT, "offset": 900}).json()
+            probe = client.get({"limit": 0}).json()
+
+        assert page["count"] == 1000
+        assert len(page["results"]) == 100
+        assert page["results"][0]["key"] == FIRST_KEY + 900
+        assert probe["results"] == []
+
+    def test_records_are_inside_the_polygon(self):
+        """Test that generated records fall inside the polygon, not just its bounding box."""
+        rings = parse_wkt_polygon(WILDCAT_CANYON_POLYGON)
+        records = generate_records(500)
+
+        assert all(point_in_polygon(r["decimalLongitude"], r["decimalLatitude"], rings) for r in records)
+        assert generate_records(500) == records
+
+    def test_stats_endpoint(self, stub_server):
+        """Test that served request counts can be read from another process."""
+        stats_url = stub_server.url[:-len(SEARCH_PATH)] + STATS_PATH
+        with GbifClient(stub_server.url, rate_limit=0) as client:
+            client.get({"limit": 0})
+        with GbifClient(stats_url, rate_limit=0) as client:
+            stats = client.get({}).json()
+
+        assert stats == {"requests": 1, "errors": 0}
+
+    def test_error_rate(self):
+        """Test that the configured share of requests fail with 503."""
+        server = start_stub_server(records=10, error_rate=1.0)
+        try:
+            with GbifClient(server.url, rate_limit=0, max_retries=0) as client:
+                response = client.get({"limit": 10, "offset": 0})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.status_code == 503
+        assert server.error_count == 1
+
+    def test_store_gbif_data_end_to_end(self, stub_server, app, db, monkeypatch):
+        """Test that the job ingests every stub record over real HTTP."""
+        monkeypatch.setenv("GBIF_API_URL", stub_server.url)
+        monkeypatch.setenv("GBIF_RATE_LIMIT", "0")
+
+        stats = store_gbif_data(app, full_sync=True)
+
+        assert stats.fetch_complete is True
+        assert stats.stored == 1000
+        assert GbifData.query.count() == 1000
@@ -4,7 +4,14 @@ import pytest
 from speciestrack.utils.geometry_utils import (
     simplify_polygon,
     create_wkt_polygon,
-    get_bounding_box_polygon
+    get_bounding_box_polygon,
+    parse_wkt_polygon,
+    polygon_bounds,
+    point_in_polygon,
+    bounds_intersect_polygon,
+    split_bounds,
+    quadtree_tiles,
+    mercator_cell
 )
 
 
@@ -194,3 +201,104 @@ class TestGetBoundingBoxPolygon:
         inner = result.replace("POLYGON((", "").replace("))", "")
         assert "0 0" in inner
         assert "10 10" in inner
+
+
+SQUARE_WITH_HOLE = "POLYGON((0 0,10 0,10 10,0 10,0 0),(4 4,6 4,6 6,4 6,4 4))"
+
+
+class TestPolygonQueries:
+    """Tests for WKT parsing and point/box tests against polygons."""
+
+    def test_parse_wkt_polygon_with_hole(self):
+        """Test that outer ring and holes are parsed as separate rings."""
+        rings = parse_wkt_polygon(SQUARE_WITH_HOLE)
+
+        assert len(rings) == 2
+        assert rings[0][1] == (10.0, 0.0)
+        assert polygon_bounds(rings) == (0.0, 0.0, 10.0, 10.0)
+
+    def test_point_in_polygon_excludes_holes(self):
+        """Test that points in a hole are outside the polygon."""
+        rings = parse_wkt_polygon(SQUARE_WITH_HOLE)
+
+        assert point_in_polygon(2, 2, rings) is True
+        assert point_in_polygon(5, 5, rings) is False
+        assert point_in_polygon(12, 5, rings) is False
+
+    def test_bounds_intersect_polygon(self):
+        """Test box/polygon overlap for inside, crossing and disjoint boxes."""
+        rings = parse_wkt_polygon("POLYGON((0 0,10 0,0 10,0 0))")
+
+        assert bounds_intersect_polygon((1, 1, 2, 2), rings) is True
+        assert bounds_intersect_polygon((4, 4, 20, 5), rings) is True
+        assert bounds_intersect_polygon((8, 8, 9, 9), rings) is False
+
+
+class TestQuadtreeTiles:
+    """Tests for quadtree tiling driven by count probes."""
+
+    def test_split_bounds(self):
+        """Test that a box splits into four quadrants."""
+        assert split_bounds((0, 0, 4, 2)) == [
+            (0, 0, 2, 1), (2, 0, 4, 1), (0, 1, 2, 2), (2, 1, 4, 2)
+        ]
+
+    def test_root_fits(self):
+        """Test that no split happens when the root is under the threshold."""
+        tiles = quadtree_tiles((0, 0, 10, 10), lambda bounds: 50, max_count=100)
+
+        assert tiles == [("", (0, 0, 10, 10), 50)]
+
+    def test_splits_dense_tiles_only(self):
+        """Test that only tiles over the threshold are split again."""
+        points = [(1, 1)] * 30 + [(8, 8)] * 5
+
+        def count(bounds):
+            min_lon, min_lat, max_lon, max_lat = bounds
+            return sum(1 for lon, lat in points if min_lon <= lon < max_lon and min_lat <= lat < max_lat)
+
+        tiles = quadtree_tiles((0, 0, 10, 10), count, max_count=10)
+
+        assert sum(tile[2] for tile in tiles) == 35
+        assert all(tile[2] <= 10 or len(tile[0]) == 8 for tile in tiles)
+        assert ("3", (5.0, 5.0, 10, 10), 5) in tiles
+
+    def test_max_depth_stops_splitting(self):
+        """Test that tiles are kept once max_depth is reached."""
+        tiles = quadtree_tiles((0, 0, 10, 10), lambda bounds: 1000, max_count=10, max_depth=1)
+
+        assert [tile[0] for tile in tiles] == ["0", "1", "2", "3"]
+
+    def test_tiles_outside_polygon_are_not_probed(self):
+        """Test that tiles that miss the polygon are dropped without a probe."""
+        rings = parse_wkt_polygon("POLYGON((0 0,4 0,0 4,0 0))")
+        probed = []
+
+        def count(bounds):
+            probed.append(bounds)
+            return 100
+
+        tiles = quadtree_tiles((0, 0, 10, 10), count, max_count=10, max_depth=1, rings=rings)
+
+        assert [tile[0] for tile in tiles] == ["0"]
+        assert len(probed) == 2
+
+
+class TestMercatorCell:
+    """Tests for mercator_cell function."""
+
+    def test_quadrants(self):
+        """Test that a 2x2 grid splits the world at the equator and prime meridian."""
+        assert mercator_cell(-122.3, 37.9, 2) == (0, 0)
+        assert mercator_cell(151.2, -33.9, 2) == (1, 1)
+
+    def test_edges_are_clamped(self):
+        """Test that the poles and the antimeridian stay inside the grid."""
+        assert mercator_cell(180.0, 90.0, 4) == (3, 0)
+        assert mercator_cell(-180.0, -90.0, 4) == (0, 3)
+
+    def test_parent_cell_is_shifted_child(self):
+        """Test that halving the grid maps a cell to its index shifted right by one."""
+        x, y = mercator_cell(-122.3244, 37.9187, 2 ** 18)
+
+        assert mercator_cell(-122.3244, 37.9187, 2 ** 17) == (x >> 1, y >> 1)
@@ -0,0 +1,127 @@
+"""Tests for the streaming GBIF ingestion pipeline."""
+
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from speciestrack.jobs.gbif_job import GbifPage
+from speciestrack.jobs.bulk_insert import UpsertResult
+from speciestrack.jobs.ingest_pipeline import run_ingestion_pipeline, parse_observation
+from speciestrack.jobs.native_plant_index import NativePlantIndex
+from speciestrack.models.gbif_data import GbifData
+
+
+def make_pages(page_count, page_size):
+    """Build GbifPage objects with uniquely named observations."""
+    return [
+        GbifPage(page * page_size, [
+            {"name": f"Species {page * page_size + i}", "occurrence_id": str(page * page_size + i)}
+            for i in range(page_size)
+        ])
+        for page in range(page_count)
+    ]
+
+
+class TestParseObservation:
+    """Tests for parse_observation function."""
+
+    def test_parse_observation_event_date(self):
+        """Test that ISO event dates with a Z suffix are parsed."""
+        fetch_time = datetime(2025, 6, 1)
+        row = parse_observation({"name": "Quercus lobata", "event_date": "2025-05-01T10:00:00Z"}, fetch_time)
+
+        assert row["scientific_name"] == "Quercus lobata"
+        assert row["event_date"].year == 2025
+        assert row["fetch_date"] == fetch_time
+        assert row["native"] is False
+
+    def test_parse_observation_invalid_event_date(self):
+        """Test that unparseable event dates are stored as None."""
+        row = parse_observation({"name": "Quercus lobata", "event_date": "2025-05"}, datetime.now())
+
+        assert row["event_date"] is None
+
+
+class TestRunIngestionPipeline:
+    """Tests for run_ingestion_pipeline function."""
+
+    def test_pipeline_stores_all_pages(self, app, db):
+        """Test that every observation from every page is stored."""
+        stats = run_ingestion_pipeline(make_pages(5, 10), NativePlantIndex([]), batch_size=20)
+
+        assert GbifData.query.count() == 50
+        assert stats.pages == 5
+        assert stats.fetched == 50
+        assert stats.stored == 50
+        assert stats.fetch_complete is True
+
+    def test_pipeline_commits_per_batch(self, app, db):
+        """Test that rows are committed in batches of whole pages."""
+        with patch('speciestrack.jobs.ingest_pipeline.insert_batch') as mock_insert:
+            mock_insert.side_effect = lambda rows, before_commit=None: UpsertResult(len(rows), 0, 0)
+            stats = run_ingestion_pipeline(make_pages(5, 10), NativePlantIndex([]), batch_size=20)
+
+        batch_sizes = [len(call.args[0]) for call in mock_insert.call_args_list]
+        assert batch_sizes == [20, 20, 10]
+        assert stats.batches == 3
+
+    def test_pipeline_flags_native_plants(self, app, db):
+        """Test that the match stage sets native and common_name."""
+        pages = [GbifPage(0, [{"name": "Quercus lobata Née"}, {"name": "Eucalyptus globulus"}])]
+        index = NativePlantIndex([("Quercus lobata", "Valley Oak")])
+
+        stats = run_ingestion_pipeline(pages, index)
+
+        oak = GbifData.query.filter_by(scientific_name="Quercus lobata Née").first()
+        assert oak.native is True
+        assert oak.common_name == "Valley Oak"
+        assert stats.native == 1
+        assert stats.match_reasons == {"canonical": 1, "unmatched": 1}
+
+    def test_pipeline_keeps_rows_from_failed_fetch(self, app, db):
+        """Test that pages fetched before a source failure are still stored."""
+        def failing_pages():
+            yield from make_pages(2, 10)
+            raise RuntimeError("connection reset")
+
+        stats = run_ingestion_pipeline(failing_pages(), NativePlantIndex([]))
+
+        assert GbifData.query.count() == 20
+        assert stats.fetch_complete is False
+
+    def test_pipeline_reads_source_lazily(self, app, db):
+        """Test that bounded queues stop the source from running far ahead of inserts."""
+        produced = []
+
+        def counting_pages():
+            for page in make_pages(50, 10):
+                produced.append(page.offset)
+                yield page
+
+        pages_before_first_insert = []
+
+        def record_insert(rows, before_commit=None):
+            if not pages_before_first_insert:
+                pages_before_first_insert.append(len(produced))
+            return UpsertResult(len(rows), 0, 0)
+
+        with patch('speciestrack.jobs.ingest_pipeline.insert_batch', side_effect=record_insert):
+            run_ingestion_pipeline(counting_pages(), NativePlantIndex([]), batch_size=10, queue_size=1)
+
+        # At most one page per queue and one per stage can be in progress
+        assert pages_before_first_insert[0] <= 8
+        assert len(produced) == 50
+
+    def test_pipeline_rerun_skips_unchanged_rows(self, app, db):
+        """Test that re-ingesting the same pages does not add duplicate rows."""
+        run_ingestion_pipeline(make_pages(3, 10), NativePlantIndex([]))
+        stats = run_ingestion_pipeline(make_pages(3, 10), NativePlantIndex([]))
+
+        assert GbifData.query.count() == 30
+        assert stats.inserted == 0
+        assert stats.skipped == 30
+
+    def test_pipeline_raises_insert_errors(self, app, db):
+        """Test that a failing insert stops the pipeline and is raised."""
+        with patch('speciestrack.jobs.ingest_pipeline.insert_batch', side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError):
+                run_ingestion_pipeline(make_pages(20, 10), NativePlantIndex([]), batch_size=10)
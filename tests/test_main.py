@@ -194,3 +194,34 @@ def test_native_plants_partial_name_match(client, gbif_sample_data):
 
     assert len(data) == 1
     assert "Aesculus californica" in data[0]["scientific_name"]
+
+
+def test_create_app_applies_config():
+    """Test that create_app applies the given config over the defaults."""
+    from speciestrack.main import create_app
+
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+
+    assert app.config['TESTING'] is True
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == 'sqlite:///:memory:'
+
+
+def test_importing_main_starts_no_threads():
+    """Test that importing the web module does not start a scheduler thread."""
+    import threading
+    import speciestrack.main
+
+    thread_names = [thread.name for thread in threading.enumerate()]
+    assert not any("APScheduler" in name for name in thread_names)
+    assert not hasattr(speciestrack.main, "scheduler")
+
+
+def test_lazy_module_app(monkeypatch):
+    """Test that speciestrack.main.app is built once, on first access."""
+    import speciestrack.main
+
+    monkeypatch.setattr(speciestrack.main, "_app", None)
+    app = speciestrack.main.app
+
+    assert app is speciestrack.main.app
+    assert "/native-plants" in [rule.rule for rule in app.url_map.iter_rules()]
@@ -0,0 +1,85 @@
+"""Tests for scientific name normalisation."""
+
+import pytest
+from speciestrack.utils.name_utils import normalize_scientific_name, species_key, split_name_list
+
+
+class TestNormalizeScientificName:
+    """Tests for normalize_scientific_name function."""
+
+    def test_plain_binomial(self):
+        """Test that a name without authors is unchanged."""
+        result = normalize_scientific_name("Quercus lobata")
+
+        assert result.canonical == "Quercus lobata"
+        assert result.species == "Quercus lobata"
+
+    def test_strips_authors(self):
+        """Test that author citations, including parenthesised ones, are dropped."""
+        assert normalize_scientific_name("Quercus lobata Née").canonical == "Quercus lobata"
+        assert normalize_scientific_name("Aesculus californica (Spach) Nutt.").canonical == "Aesculus californica"
+        assert normalize_scientific_name("Arctostaphylos glauca Lindl. ex Hook. & Arn.").canonical == \
+            "Arctostaphylos glauca"
+
+    def test_keeps_infraspecific_rank(self):
+        """Test that var./subsp. are kept and the authors around them are dropped."""
+        result = normalize_scientific_name("Ceanothus thyrsiflorus Eschsch. var. griseus Trel.")
+
+        assert result.canonical == "Ceanothus thyrsiflorus var. griseus"
+        assert result.species == "Ceanothus thyrsiflorus"
+
+    def test_normalizes_rank_spelling(self):
+        """Test that ssp. and subsp. normalise to the same rank."""
+        assert normalize_scientific_name("Salvia mellifera ssp. nova").canonical == "Salvia mellifera subsp. nova"
+        assert normalize_scientific_name("Salvia mellifera subsp nova").canonical == "Salvia mellifera subsp. nova"
+
+    def test_filius_author_is_not_a_forma(self):
+        """Test that the author abbreviation 'L. f.' is not read as a forma rank."""
+        assert normalize_scientific_name("Carex pansa L. f.").canonical == "Carex pansa"
+
+    def test_hybrid_markers(self):
+        """Test that every spelling of a hybrid marker normalises to a glued '×'."""
+        expected = "Quercus ×alvordiana"
+
+        assert normalize_scientific_name("Quercus × alvordiana Eastw.").canonical == expected
+        assert normalize_scientific_name("Quercus x alvordiana").canonical == expected
+        assert normalize_scientific_name("Quercus ×alvordiana").canonical == expected
+        assert normalize_scientific_name("× Chiranthofremontia lenzii").canonical == "×Chiranthofremontia lenzii"
+
+    def test_invalid_names(self):
+        """Test that names without a genus and epithet are rejected."""
+        assert normalize_scientific_name("") is None
+        assert normalize_scientific_name(None) is None
+        assert normalize_scientific_name("Quercus") is None
+        assert normalize_scientific_name("quercus lobata") is None
+        assert normalize_scientific_name("Quercus Née") is None
+
+
+class TestSpeciesKey:
+    """Tests for species_key function."""
+
+    def test_variants_share_a_key(self):
+        """Test that author and rank variants reduce to genus + species."""
+        cache = {}
+        assert species_key("Quercus lobata Née", cache) == "Quercus lobata"
+        assert species_key("Ceanothus thyrsiflorus var. griseus", cache) == "Ceanothus thyrsiflorus"
+        assert cache["Quercus lobata Née"] == "Quercus lobata"
+
+    def test_unparsed_names_are_kept(self):
+        """Test that names without genus and epithet are returned unchanged."""
+        assert species_key("Plantae") == "Plantae"
+
+
+class TestSplitNameList:
+    """Tests for split_name_list function."""
+
+    def test_splits_on_separators(self):
+        """Test that commas, semicolons and newlines separate names."""
+        assert split_name_list("Mahonia aquifolium, Berberis nervosa;Odostemon aquifolium\nX y") == [
+            "Mahonia aquifolium", "Berberis nervosa", "Odostemon aquifolium", "X y"
+        ]
+
+    def test_empty(self):
+        """Test that missing values give no names."""
+        assert split_name_list(None) == []
+        assert split_name_list(" , ") == []
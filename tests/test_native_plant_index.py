@@ -0,0 +1,112 @@
+"""Tests for the in-memory native plant name index."""
+
+import pytest
+from speciestrack.jobs.native_plant_index import NativePlantIndex
+
+
+class TestNativePlantIndex:
+    """Tests for NativePlantIndex matching."""
+
+    def test_exact_match(self):
+        """Test that an exact botanical name is matched."""
+        index = NativePlantIndex([("Quercus lobata", "Valley Oak")])
+
+        assert index.match("Quercus lobata") == ("Quercus lobata", "Valley Oak")
+
+    def test_match_with_author_names(self):
+        """Test that GBIF names with authors match on genus and species."""
+        index = NativePlantIndex([
+            ("Quercus lobata", "Valley Oak"),
+            ("Aesculus californica", "California Buckeye"),
+        ])
+
+        assert index.match("Quercus lobata Née")[1] == "Valley Oak"
+        assert index.match("Aesculus californica (Spach) Nutt.")[1] == "California Buckeye"
+
+    def test_prefix_match_infraspecific_botanical_name(self):
+        """Test that a GBIF species name matches a variety in the catalog, like LIKE 'Genus species%'."""
+        index = NativePlantIndex([("Ceanothus thyrsiflorus var. griseus", "Carmel Ceanothus")])
+
+        assert index.match("Ceanothus thyrsiflorus Eschsch.")[1] == "Carmel Ceanothus"
+
+    def test_first_plant_wins_for_shared_prefix(self):
+        """Test that the first plant in id order is used for a shared genus + species."""
+        index = NativePlantIndex([
+            ("Ribes sanguineum var. glutinosum", "Pink Flowering Currant"),
+            ("Ribes sanguineum var. sanguineum", "Red Flowering Currant"),
+        ])
+
+        assert index.match("Ribes sanguineum Pursh")[1] == "Pink Flowering Currant"
+
+    def test_no_match(self):
+        """Test that non-native names and single words are not matched."""
+        index = NativePlantIndex([("Quercus lobata", "Valley Oak")])
+
+        assert index.match("Eucalyptus globulus") is None
+        assert index.match("Quercus") is None
+        assert index.match("") is None
+
+    def test_load_from_database(self, db, native_plant_sample_data):
+        """Test loading the index from the native_plants table."""
+        index = NativePlantIndex.load()
+
+        assert len(index) == 3
+        assert index.match("Eschscholzia californica Cham.")[1] == "California Poppy"
+
+    def test_infraspecific_name_matches_its_own_variety(self):
+        """Test that a GBIF variety matches that variety rather than the first one in the species."""
+        index = NativePlantIndex([
+            ("Ribes sanguineum var. glutinosum", "Pink Flowering Currant"),
+            ("Ribes sanguineum var. sanguineum", "Red Flowering Currant"),
+        ])
+
+        assert index.match_with_reason("Ribes sanguineum Pursh var. sanguineum") == (
+            ("Ribes sanguineum var. sanguineum", "Red Flowering Currant"), "canonical"
+        )
+
+    def test_ssp_matches_subsp(self):
+        """Test that rank spellings are normalised on both sides."""
+        index = NativePlantIndex([("Salvia mellifera subsp. nova", "Black Sage")])
+
+        assert index.match_with_reason("Salvia mellifera ssp. nova Epling") == (
+            ("Salvia mellifera subsp. nova", "Black Sage"), "canonical"
+        )
+
+    def test_synonym_and_obsolete_names(self):
+        """Test that other_names and obsolete_names are matched."""
+        index = NativePlantIndex([
+            ("Berberis aquifolium", "Oregon Grape", "Mahonia aquifolium (Pursh) Nutt.", None),
+            ("Frangula californica", "California Coffeeberry", None, "Rhamnus californica; Rhamnus tomentella"),
+        ])
+
+        assert index.match_with_reason("Mahonia aquifolium Nutt.") == (("Berberis aquifolium", "Oregon Grape"), "synonym")
+        assert index.match_with_reason("Rhamnus tomentella Benth.")[1] == "obsolete"
+        assert index.match_with_reason("Rhamnus californica subsp. occidentalis") == (
+            ("Frangula californica", "California Coffeeberry"), "synonym_species"
+        )
+
+    def test_botanical_name_wins_over_synonym(self):
+        """Test that another plant's synonym never shadows a botanical name."""
+        index = NativePlantIndex([
+            ("Berberis aquifolium", "Oregon Grape", "Berberis nervosa", None),
+            ("Berberis nervosa", "Longleaf Oregon Grape", None, None),
+        ])
+
+        assert index.match("Berberis nervosa Pursh")[1] == "Longleaf Oregon Grape"
+
+    def test_match_batch_reports_reasons(self):
+        """Test that match_batch returns one (entry, reason) per name in order."""
+        index = NativePlantIndex([("Quercus lobata", "Valley Oak")])
+
+        results = index.match_batch(["Quercus lobata", "Quercus lobata Née", "Quercus lobata Née", "Eucalyptus globulus"])
+
+        assert [reason for _, reason in results] == ["exact", "canonical", "canonical", "unmatched"]
+
+    def test_load_includes_synonyms(self, db, native_plant_sample_data):
+        """Test that load() indexes other_names from the database."""
+        native_plant_sample_data[0].other_names = "Quercus hindsii Benth."
+        db.session.commit()
+
+        index = NativePlantIndex.load()
+
+        assert index.match_with_reason("Quercus hindsii") == (("Quercus lobata", "Valley Oak"), "synonym")
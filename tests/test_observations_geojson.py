@@ -0,0 +1,139 @@
+"""Tests for the /observations.geojson endpoint and its spatial index."""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+from speciestrack.jobs.bulk_insert import upsert_gbif_rows
+from speciestrack.models.gbif_data import GbifData
+from speciestrack.utils.geometry_utils import parse_bbox, bbox_longitude_ranges
+
+VIEWPORT = "-122.33,37.91,-122.31,37.92"
+
+
+def rtree_ids(db):
+    """Ids stored in the SQLite R*Tree."""
+    return {row[0] for row in db.session.execute(text("SELECT id FROM gbif_data_rtree"))}
+
+
+class TestParseBbox:
+    """Tests for parse_bbox and bbox_longitude_ranges functions."""
+
+    def test_parse_bbox(self):
+        """Test that a valid bbox is parsed in min_lon,min_lat,max_lon,max_lat order."""
+        assert parse_bbox("-122.5,37.5,-122,38") == (-122.5, 37.5, -122.0, 38.0)
+
+    def test_invalid_bbox(self):
+        """Test that malformed or out of range boxes are rejected."""
+        for value in ["1,2,3", "a,b,c,d", "-200,0,0,1", "0,10,1,5", "0,nan,1,2"]:
+            with pytest.raises(ValueError):
+                parse_bbox(value)
+
+    def test_antimeridian_ranges(self):
+        """Test that a box crossing the antimeridian is split in two."""
+        assert bbox_longitude_ranges((-10, 0, 10, 1)) == [(-10, 10)]
+        assert bbox_longitude_ranges((170, 0, -170, 1)) == [(170, 180.0), (-180.0, -170)]
+
+
+class TestSpatialIndex:
+    """Tests for the SQLite R*Tree kept in sync with gbif_data."""
+
+    def test_rtree_follows_inserts_updates_and_deletes(self, db, gbif_sample_data):
+        """Test that the triggers mirror located rows into the R*Tree."""
+        ids = {row.id for row in gbif_sample_data}
+        assert rtree_ids(db) == ids
+
+        unlocated = GbifData(scientific_name="Nowhere", occurrence_id="x")
+        db.session.add(unlocated)
+        db.session.commit()
+        assert rtree_ids(db) == ids
+
+        unlocated.decimal_latitude = 1.0
+        unlocated.decimal_longitude = 2.0
+        db.session.commit()
+        assert unlocated.id in rtree_ids(db)
+
+        db.session.delete(gbif_sample_data[0])
+        db.session.commit()
+        assert gbif_sample_data[0].id not in rtree_ids(db)
+
+    def test_rtree_follows_upserts(self, db, gbif_sample_data):
+        """Test that INSERT OR REPLACE updates keep the R*Tree in step."""
+        row = gbif_sample_data[0].to_dict()
+        moved = {
+            "scientific_name": row["scientific_name"],
+            "occurrence_id": row["occurrence_id"],
+            "decimal_latitude": 10.0,
+            "decimal_longitude": 20.0,
+            "payload_hash": "changed",
+            "fetch_date": datetime.now(),
+        }
+
+        upsert_gbif_rows([moved])
+        db.session.commit()
+
+        box = db.session.execute(
+            text("SELECT min_lon, min_lat FROM gbif_data_rtree WHERE id = :id"), {"id": row["id"]}
+        ).one()
+        assert box == pytest.approx((20.0, 10.0))
+
+
+class TestObservationsGeojson:
+    """Tests for the /observations.geojson route."""
+
+    def test_feature_collection(self, client, gbif_sample_data):
+        """Test that every located observation is returned as a Point feature."""
+        response = client.get("/observations.geojson")
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/geo+json"
+        assert data["type"] == "FeatureCollection"
+        assert data["truncated"] is False
+        assert len(data["features"]) == 4
+        feature = data["features"][0]
+        assert feature["geometry"] == {"type": "Point", "coordinates": [-122.3, 37.94]}
+        assert feature["properties"]["scientific_name"] == "Eucalyptus globulus"
+        assert feature["id"] == feature["properties"]["id"]
+
+    def test_bbox_filter(self, client, gbif_sample_data):
+        """Test that only observations inside the box are returned."""
+        data = client.get(f"/observations.geojson?bbox={VIEWPORT}").get_json()
+
+        assert [f["properties"]["scientific_name"] for f in data["features"]] == ["Quercus lobata"]
+        assert data["bbox"] == [-122.33, 37.91, -122.31, 37.92]
+
+    def test_bbox_excludes_rtree_rounding(self, client, db):
+        """Test that points just outside the box are excluded despite R*Tree float rounding."""
+        db.session.add_all([
+            GbifData(scientific_name="Inside", occurrence_id="1", decimal_latitude=37.5, decimal_longitude=-122.5),
+            GbifData(scientific_name="Outside", occurrence_id="2",
+                     decimal_latitude=37.50000001, decimal_longitude=-122.5),
+        ])
+        db.session.commit()
+
+        data = client.get("/observations.geojson?bbox=-123,37,-122,37.5").get_json()
+
+        assert [f["properties"]["scientific_name"] for f in data["features"]] == ["Inside"]
+
+    def test_native_fields_and_limit(self, client, gbif_sample_data):
+        """Test the native filter, sparse properties and truncation."""
+        data = client.get("/observations.geojson?native=true&fields=scientific_name&limit=2").get_json()
+
+        assert [f["properties"] for f in data["features"]] == [
+            {"scientific_name": "Arctostaphylos glauca"}, {"scientific_name": "Aesculus californica"}
+        ]
+        assert data["features"][0]["id"] is None
+        assert data["truncated"] is True
+
+    def test_shared_filters(self, client, gbif_sample_data):
+        """Test that the /native-plants filters apply."""
+        data = client.get("/observations.geojson?scientific_name=Aesculus").get_json()
+
+        assert len(data["features"]) == 1
+
+    def test_invalid_parameters(self, client, gbif_sample_data):
+        """Test that invalid parameters return 400."""
+        for query in ["bbox=1,2,3", "native=maybe", "limit=0", "fields=secret", "start_time=bad"]:
+            response = client.get(f"/observations.geojson?{query}")
+            assert response.status_code == 400
+            assert "error" in response.get_json()
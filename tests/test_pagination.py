@@ -0,0 +1,112 @@
+"""Tests for keyset pagination of /native-plants."""
+
+import pytest
+from datetime import datetime
+from speciestrack.models.gbif_data import GbifData
+from speciestrack.utils.pagination import encode_cursor, decode_cursor
+
+
+def add_native_observations(db, event_dates):
+    """Store one native observation per event date (None for undated)."""
+    rows = [
+        GbifData(scientific_name=f"Plant {index}", occurrence_id=str(index), native=True, event_date=event_date)
+        for index, event_date in enumerate(event_dates)
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def fetch_all_pages(client, limit):
+    """Follow next cursors until the last page, returning every page."""
+    pages = []
+    url = f"/native-plants?limit={limit}"
+    while url:
+        page = client.get(url).get_json()
+        pages.append(page)
+        url = f"/native-plants?limit={limit}&cursor={page['next']}" if page["next"] else None
+    return pages
+
+
+class TestCursor:
+    """Tests for encode_cursor and decode_cursor functions."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the sort key it was built from."""
+        event_date = datetime(2025, 3, 15, 10, 30)
+
+        assert decode_cursor(encode_cursor(event_date, 42)) == (event_date, 42)
+        assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+    def test_cursor_is_url_safe(self):
+        """Test that cursors need no escaping in a query string."""
+        cursor = encode_cursor(datetime(2025, 3, 15), 10 ** 12)
+
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    def test_invalid_cursors(self):
+        """Test that malformed cursors raise ValueError."""
+        for cursor in ["not a cursor", "", encode_cursor(None, 1)[:-3], "WzEsMiwzXQ"]:
+            with pytest.raises(ValueError):
+                decode_cursor(cursor)
+
+
+class TestNativePlantsPagination:
+    """Tests for limit/cursor on the /native-plants route."""
+
+    def test_without_pagination_returns_list(self, client, gbif_sample_data):
+        """Test that requests without limit or cursor keep the plain list response."""
+        assert isinstance(client.get("/native-plants").get_json(), list)
+
+    def test_first_page(self, client, gbif_sample_data):
+        """Test that a page holds the newest observations and a next cursor."""
+        page = client.get("/native-plants?limit=2").get_json()
+
+        assert [row["scientific_name"] for row in page["results"]] == ["Arctostaphylos glauca", "Aesculus californica"]
+        assert page["next"] is not None
+        assert "approximate_count" not in page
+
+    def test_pages_cover_every_row_once(self, client, db):
+        """Test that following cursors visits every row once, undated rows last."""
+        dates = [datetime(2025, 1, day % 5 + 1) for day in range(12)] + [None, None, None]
+        rows = add_native_observations(db, dates)
+
+        pages = fetch_all_pages(client, limit=4)
+        seen = [row["id"] for page in pages for row in page["results"]]
+
+        assert len(pages) == 4
+        assert sorted(seen) == sorted(row.id for row in rows)
+        assert len(set(seen)) == len(seen)
+        event_dates = [row["event_date"] for page in pages for row in page["results"]]
+        dated = [value for value in event_dates if value is not None]
+        assert dated == sorted(dated, reverse=True)
+        assert event_dates[-3:] == [None, None, None]
+        assert pages[-1]["next"] is None
+
+    def test_cursor_alone_uses_default_limit(self, client, gbif_sample_data):
+        """Test that a cursor without a limit still returns a page."""
+        first = client.get("/native-plants?limit=1").get_json()
+
+        page = client.get(f"/native-plants?cursor={first['next']}").get_json()
+
+        assert [row["scientific_name"] for row in page["results"]] == ["Aesculus californica", "Quercus lobata"]
+        assert page["next"] is None
+
+    def test_filters_apply_to_pages(self, client, gbif_sample_data):
+        """Test that filters and pagination combine."""
+        page = client.get("/native-plants?limit=10&scientific_name=Quercus").get_json()
+
+        assert [row["scientific_name"] for row in page["results"]] == ["Quercus lobata"]
+
+    def test_include_count(self, client, gbif_sample_data):
+        """Test that include_count adds the total of the filtered query."""
+        page = client.get("/native-plants?limit=1&include_count=true").get_json()
+
+        assert page["approximate_count"] == 3
+
+    def test_invalid_parameters(self, client, gbif_sample_data):
+        """Test that bad limits and cursors return 400."""
+        for query in ["limit=abc", "limit=0", "limit=100000", "cursor=garbage"]:
+            response = client.get(f"/native-plants?{query}")
+            assert response.status_code == 400
+            assert "error" in response.get_json()
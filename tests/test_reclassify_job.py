@@ -0,0 +1,107 @@
+"""Tests for re-classifying the native status of stored observations."""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from speciestrack.jobs.reclassify_job import reclassify_native_status
+from speciestrack.models.gbif_data import GbifData
+from speciestrack.models.native_plant import NativePlant
+
+
+def add_observation(db, scientific_name, native=False, common_name=None, occurrence_id=None):
+    """Store one gbif_data row."""
+    row = GbifData(
+        scientific_name=scientific_name,
+        native=native,
+        common_name=common_name,
+        occurrence_id=occurrence_id or f"occ-{scientific_name}-{datetime.now().timestamp()}",
+        fetch_date=datetime(2025, 1, 1)
+    )
+    db.session.add(row)
+    db.session.commit()
+    return row
+
+
+class TestReclassifyNativeStatus:
+    """Tests for reclassify_native_status function."""
+
+    def test_marks_newly_native_rows(self, app, db, native_plant_sample_data):
+        """Test that rows for a plant added to the catalog become native."""
+        add_observation(db, "Quercus lobata Née", occurrence_id="1")
+        add_observation(db, "Quercus lobata Née", occurrence_id="2")
+        add_observation(db, "Eucalyptus globulus Labill.", occurrence_id="3")
+
+        result = reclassify_native_status(app)
+
+        assert result.names == 2
+        assert result.changed_names == 1
+        assert result.updated == 2
+        oak = GbifData.query.filter_by(occurrence_id="1").first()
+        assert oak.native is True
+        assert oak.common_name == "Valley Oak"
+        assert GbifData.query.filter_by(occurrence_id="3").first().native is False
+
+    def test_clears_rows_removed_from_catalog(self, app, db, native_plant_sample_data):
+        """Test that rows whose plant left the catalog lose their native status."""
+        add_observation(db, "Ceanothus thyrsiflorus", native=True, common_name="Blue Blossom", occurrence_id="1")
+
+        result = reclassify_native_status(app)
+
+        row = GbifData.query.filter_by(occurrence_id="1").first()
+        assert result.updated == 1
+        assert row.native is False
+        assert row.common_name is None
+
+    def test_updates_renamed_common_name_and_synonyms(self, app, db, native_plant_sample_data):
+        """Test that catalog edits to common names and synonyms are picked up."""
+        add_observation(db, "Quercus lobata", native=True, common_name="Valley Oak", occurrence_id="1")
+        add_observation(db, "Quercus hindsii Benth.", occurrence_id="2")
+        plant = NativePlant.query.filter_by(botanical_name="Quercus lobata").first()
+        plant.common_name = "Roble"
+        plant.other_names = "Quercus hindsii"
+        db.session.commit()
+
+        result = reclassify_native_status(app)
+
+        assert result.updated == 2
+        assert {row.common_name for row in GbifData.query.all()} == {"Roble"}
+
+    def test_leaves_up_to_date_rows_alone(self, app, db, native_plant_sample_data):
+        """Test that nothing is rewritten when every row is already correct."""
+        add_observation(db, "Quercus lobata Née", native=True, common_name="Valley Oak", occurrence_id="1")
+        add_observation(db, "Eucalyptus globulus", occurrence_id="2")
+
+        result = reclassify_native_status(app)
+
+        assert result.changed_names == 0
+        assert result.updated == 0
+
+    def test_batches_by_name(self, app, db, native_plant_sample_data):
+        """Test that names are spread across several UPDATE batches."""
+        for index, name in enumerate(["Quercus lobata", "Aesculus californica", "Eschscholzia californica"]):
+            add_observation(db, name, occurrence_id=str(index))
+
+        result = reclassify_native_status(app, batch_size=1)
+
+        assert result.updated == 3
+        assert GbifData.query.filter_by(native=True).count() == 3
+
+    def test_failed_run_refreshes_committed_batches(self, app, db, native_plant_sample_data):
+        """Test that batches committed before a failure still refresh derived data."""
+        for index, name in enumerate(["Quercus lobata", "Aesculus californica"]):
+            add_observation(db, name, occurrence_id=str(index))
+        commit = db.session.commit
+        commits = []
+
+        def fail_second_commit():
+            commits.append(1)
+            if len(commits) > 1:
+                raise RuntimeError("database went away")
+            commit()
+
+        with patch.object(db.session, "commit", side_effect=fail_second_commit), \
+                patch('speciestrack.jobs.reclassify_job.refresh_derived_data') as mock_refresh:
+            assert reclassify_native_status(app, batch_size=1) is None
+
+        assert GbifData.query.filter_by(native=True).count() == 1
+        mock_refresh.assert_called_once()
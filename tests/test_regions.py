@@ -0,0 +1,168 @@
+"""Tests for multi-region tracking and ingestion."""
+
+import pytest
+from unittest.mock import patch
+from speciestrack.jobs.gbif_job import store_all_regions, store_gbif_data, GbifPage
+from speciestrack.jobs.ingest_pipeline import IngestionStats
+from speciestrack.models import Region, RegionOccurrence, GbifData, DatasetVersion
+
+WILDCAT = "POLYGON((-122.3 37.9,-122.2 37.9,-122.2 38.0,-122.3 38.0,-122.3 37.9))"
+TILDEN = "POLYGON((-122.25 37.87,-122.2 37.87,-122.2 37.92,-122.25 37.92,-122.25 37.87))"
+
+
+@pytest.fixture
+def regions(db):
+    """Create two active regions and one inactive one."""
+    wildcat = Region(name="Wildcat Canyon", geometry=WILDCAT)
+    tilden = Region(name="Tilden", geometry=TILDEN, dataset_key="tilden-dataset")
+    closed = Region(name="Closed Park", geometry=TILDEN, active=False)
+    db.session.add_all([wildcat, tilden, closed])
+    db.session.commit()
+    return [wildcat, tilden, closed]
+
+
+def pages_for(**kwargs):
+    """Return one page whose occurrence id depends on the polygon fetched."""
+    occurrence_id = "1" if kwargs["geometry"] == WILDCAT else "2"
+    return [GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": occurrence_id}])]
+
+
+class TestRegionModel:
+    """Tests for the Region model."""
+
+    def test_lookup_by_name_and_id(self, regions):
+        """Test that regions are found by exact name or by id."""
+        assert Region.lookup("Tilden").id == regions[1].id
+        assert Region.lookup(str(regions[0].id)).name == "Wildcat Canyon"
+        assert Region.lookup("Nowhere") is None
+
+
+class TestRegionIngestion:
+    """Tests for per-region ingestion."""
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_gbif_data_tags_rows_with_region(self, mock_fetch, app, regions):
+        """Test that a region run uses its polygon and dataset key and tags its rows."""
+        mock_fetch.side_effect = pages_for
+
+        store_gbif_data(app, region_id=regions[1].id)
+
+        kwargs = mock_fetch.call_args.kwargs
+        assert kwargs["geometry"] == TILDEN
+        assert kwargs["dataset_key"] == "tilden-dataset"
+        assert GbifData.query.one().region_id == regions[1].id
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_all_regions_in_process(self, mock_fetch, app, regions):
+        """Test that every active region is ingested with max_workers=1."""
+        mock_fetch.side_effect = pages_for
+
+        results = store_all_regions(app, max_workers=1)
+
+        assert set(results) == {"Wildcat Canyon", "Tilden"}
+        stored = {row.occurrence_id: row.region_id for row in GbifData.query.all()}
+        assert stored == {"1": regions[0].id, "2": regions[1].id}
+
+    @patch('speciestrack.jobs.bulk_insert._existing_occurrences', return_value={})
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_overlapping_regions_store_shared_occurrence_once(self, mock_fetch, mock_existing, app, regions):
+        """Test that two overlapping regions that both see an occurrence as new both succeed."""
+        # Both polygons contain occurrence 1; neither run sees the other's row in its lookup
+        mock_fetch.return_value = [GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": "1"}])]
+
+        results = store_all_regions(app, max_workers=1)
+
+        assert all(stats is not None for stats in results.values())
+        assert sorted(stats.inserted for stats in results.values()) == [0, 1]
+        assert GbifData.query.count() == 1
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_overlapping_regions_rerun_changes_nothing(self, mock_fetch, app, client, regions,
+                                                       native_plant_sample_data):
+        """Test that an occurrence in two regions belongs to both and is not rewritten on the next run."""
+        mock_fetch.side_effect = lambda **kwargs: [GbifPage(0, [
+            {"name": "Eschscholzia californica", "occurrence_id": "1", "latitude": 37.9, "longitude": -122.22}
+        ])]
+
+        store_all_regions(app, max_workers=1)
+        row = GbifData.query.one()
+        first_region, updated_at = row.region_id, row.updated_at
+        version = DatasetVersion.current()
+
+        results = store_all_regions(app, max_workers=1)
+
+        assert all((stats.inserted, stats.updated, stats.linked) == (0, 0, 0) for stats in results.values())
+        assert DatasetVersion.current() == version
+        row = GbifData.query.one()
+        assert (row.region_id, row.updated_at) == (first_region, updated_at)
+        assert {link.region_id for link in RegionOccurrence.query.all()} == {regions[0].id, regions[1].id}
+        for region in regions[:2]:
+            plants = client.get(f"/native-plants?region={region.id}").get_json()
+            assert [plant["occurrence_id"] for plant in plants] == ["1"]
+
+    @patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles')
+    def test_store_all_regions_without_regions(self, mock_fetch, app, db):
+        """Test that the default polygon is fetched when no region is configured."""
+        mock_fetch.return_value = [GbifPage(0, [{"name": "Quercus lobata", "occurrence_id": "1"}])]
+
+        results = store_all_regions(app)
+
+        assert list(results) == [None]
+        assert GbifData.query.one().region_id is None
+
+    def test_store_all_regions_uses_process_pool(self, app, regions, monkeypatch):
+        """Test that regions are submitted to a bounded process pool with a shared rate limit."""
+        submitted = []
+
+        class InlineExecutor:
+            """Runs submitted calls immediately, recording them."""
+
+            def __init__(self, max_workers, mp_context):
+                self.max_workers = max_workers
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def submit(self, fn, *args):
+                import os
+                from concurrent.futures import Future
+                submitted.append((fn.__name__, args, self.max_workers, os.environ["GBIF_RATE_LIMIT"]))
+                future = Future()
+                future.set_result(IngestionStats())
+                return future
+
+        monkeypatch.setenv("GBIF_RATE_LIMIT", "10")
+        with patch('speciestrack.jobs.gbif_job.ProcessPoolExecutor', InlineExecutor):
+            results = store_all_regions(app, max_workers=8)
+
+        assert set(results) == {"Wildcat Canyon", "Tilden"}
+        assert [call[1][0] for call in submitted] == [regions[0].id, regions[1].id]
+        assert all(call[0] == "store_region" and call[2] == 2 and call[3] == "5.0" for call in submitted)
+
+
+class TestNativePlantsRegionFilter:
+    """Tests for /native-plants?region=."""
+
+    def test_filter_by_region(self, client, db, regions):
+        """Test that only the region's native plants are returned."""
+        db.session.add_all([
+            GbifData(scientific_name="Quercus lobata", native=True, occurrence_id="1", region_id=regions[0].id),
+            GbifData(scientific_name="Aesculus californica", native=True, occurrence_id="2", region_id=regions[1].id),
+        ])
+        db.session.commit()
+
+        by_name = client.get("/native-plants?region=Tilden").get_json()
+        by_id = client.get(f"/native-plants?region={regions[0].id}").get_json()
+
+        assert [plant["occurrence_id"] for plant in by_name] == ["2"]
+        assert [plant["occurrence_id"] for plant in by_id] == ["1"]
+
+    def test_unknown_region(self, client, db):
+        """Test that an unknown region returns 404."""
+        response = client.get("/native-plants?region=Nowhere")
+
+        assert response.status_code == 404
+        assert "Unknown region" in response.get_json()["error"]
@@ -0,0 +1,162 @@
+"""Tests for the dataset version and the versioned response cache."""
+
+from unittest.mock import patch
+from speciestrack.controllers.response_cache import ResponseCache
+from speciestrack.jobs import ingest_pipeline
+from speciestrack.jobs.gbif_job import GbifPage, store_gbif_data
+from speciestrack.jobs.dataset_version import current_dataset_version, bump_dataset_version
+from speciestrack.jobs.derived_data import refresh_derived_data
+from speciestrack.models.dataset_version import DatasetVersion
+from speciestrack.models.gbif_data import GbifData
+
+
+def add_observation(db, occurrence_id):
+    db.session.add(GbifData(scientific_name="Quercus lobata", occurrence_id=occurrence_id, native=True))
+    db.session.commit()
+
+
+class TestDatasetVersion:
+    """Tests for DatasetVersion and the cached version lookup."""
+
+    def test_version_starts_at_zero_and_bumps(self, app, db):
+        """Test that the version is 0 without a row and bumping creates it."""
+        assert DatasetVersion.current() == 0
+        assert bump_dataset_version() == 1
+        assert bump_dataset_version() == 2
+        assert DatasetVersion.query.count() == 1
+
+    def test_current_version_is_cached(self, app, db, monkeypatch):
+        """Test that the version is re-read only after DATASET_VERSION_CHECK_SECONDS."""
+        monkeypatch.setenv("DATASET_VERSION_CHECK_SECONDS", "60")
+        assert current_dataset_version() == 0
+        DatasetVersion.bump()
+        db.session.commit()
+
+        assert current_dataset_version() == 0
+
+        monkeypatch.setenv("DATASET_VERSION_CHECK_SECONDS", "0")
+        assert current_dataset_version() == 1
+
+    def test_refresh_bumps_version(self, app, db):
+        """Test that refresh_derived_data() ends with a version bump."""
+        refresh_derived_data()
+        assert current_dataset_version() == 1
+
+
+class TestResponseCache:
+    """Tests for the ResponseCache LRU."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the byte bound evicts the least recently used entry."""
+        cache = ResponseCache(version=1, max_bytes=10)
+        cache.put("a", (b"aaaa", "application/json", "ea"))
+        cache.put("b", (b"bbbb", "application/json", "eb"))
+        cache.get("a")
+        cache.put("c", (b"cccc", "application/json", "ec"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.size == 8
+
+    def test_skips_entries_larger_than_the_cache(self):
+        """Test that a body larger than the whole cache is not stored."""
+        cache = ResponseCache(version=1, max_bytes=3)
+        cache.put("a", (b"aaaa", "application/json", "ea"))
+        assert cache.get("a") is None
+        assert cache.size == 0
+
+
+class TestCachedRoutes:
+    """Tests for the cached data routes."""
+
+    def test_second_request_is_a_hit(self, client, gbif_sample_data):
+        """Test that a repeated request is served from the cache with the same ETag."""
+        first = client.get('/native-plants?native=true')
+        second = client.get('/native-plants?native=true')
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.get_json() == first.get_json()
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert second.headers["Cache-Control"] == "no-cache"
+
+    def test_query_order_shares_an_entry(self, client, gbif_sample_data):
+        """Test that the same parameters in another order hit the same entry."""
+        client.get('/observations.geojson?native=true&limit=2')
+        response = client.get('/observations.geojson?limit=2&native=true')
+
+        assert response.headers["X-Cache"] == "HIT"
+        assert response.mimetype == "application/geo+json"
+
+    def test_if_none_match_returns_304(self, client, gbif_sample_data):
+        """Test conditional requests with a matching, a stale and a wildcard ETag."""
+        etag = client.get('/native-plants').headers["ETag"]
+
+        not_modified = client.get('/native-plants', headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.data == b""
+        assert not_modified.headers["ETag"] == etag
+
+        assert client.get('/native-plants', headers={"If-None-Match": '"stale"'}).status_code == 200
+        assert client.get('/native-plants', headers={"If-None-Match": "*"}).status_code == 304
+
+    def test_version_bump_invalidates(self, app, client, db, gbif_sample_data):
+        """Test that new data is only served after the dataset version changes."""
+        etag = client.get('/native-plants').headers["ETag"]
+        add_observation(db, "cache-new")
+
+        assert len(client.get('/native-plants').get_json()) == 3
+
+        refresh_derived_data()
+        response = client.get('/native-plants', headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "MISS"
+        assert len(response.get_json()) == 4
+
+    def test_failed_ingestion_still_invalidates(self, app, client, db, gbif_sample_data, native_plant_sample_data,
+                                                monkeypatch):
+        """Test that batches committed before an ingestion fails bump the dataset version."""
+        monkeypatch.setenv("GBIF_INSERT_BATCH_SIZE", "1")
+        etag = client.get('/native-plants').headers["ETag"]
+        upsert = ingest_pipeline.upsert_gbif_rows
+        calls = []
+
+        def fail_second_batch(rows):
+            calls.append(rows)
+            if len(calls) > 1:
+                raise RuntimeError("database went away")
+            return upsert(rows)
+
+        pages = [
+            GbifPage(0, [{"name": "Eschscholzia californica", "occurrence_id": "failing-1"}]),
+            GbifPage(300, [{"name": "Eschscholzia californica", "occurrence_id": "failing-2"}]),
+        ]
+        with patch('speciestrack.jobs.gbif_job.fetch_gbif_tiles', return_value=pages), \
+                patch.object(ingest_pipeline, "upsert_gbif_rows", side_effect=fail_second_batch):
+            assert store_gbif_data(app) is None
+
+        response = client.get('/native-plants', headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "MISS"
+        assert len(response.get_json()) == 4
+
+    def test_errors_and_streams_are_not_cached(self, client, gbif_sample_data):
+        """Test that error responses and NDJSON streams bypass the cache."""
+        assert client.get('/native-plants?limit=0').status_code == 400
+        error = client.get('/native-plants?limit=0')
+        assert "X-Cache" not in error.headers
+
+        stream = client.get('/native-plants?stream=1')
+        assert stream.mimetype == "application/x-ndjson"
+        assert "X-Cache" not in stream.headers
+
+    def test_disabled_cache_keeps_etags(self, client, gbif_sample_data, monkeypatch):
+        """Test that RESPONSE_CACHE_MAX_MB=0 stops caching but still answers If-None-Match."""
+        monkeypatch.setenv("RESPONSE_CACHE_MAX_MB", "0")
+        etag = client.get('/native-plants').headers["ETag"]
+        response = client.get('/native-plants', headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["X-Cache"] == "MISS"
@@ -0,0 +1,189 @@
+"""Tests for the daily observation rollups and /stats/timeseries."""
+
+from datetime import date, datetime
+from unittest.mock import patch
+from speciestrack.jobs import rollup_job
+from speciestrack.jobs.bulk_insert import upsert_gbif_rows
+from speciestrack.jobs.rollup_job import refresh_observation_rollups
+from speciestrack.models.gbif_data import GbifData
+from speciestrack.models.observation_rollup import ObservationDailyRollup, RollupState, RollupPendingDay
+import time
+
+
+def add_observation(db, occurrence_id, scientific_name, event_date, native=True, count=1, updated_at=None):
+    """Store one observation, optionally with a fixed updated_at."""
+    row = GbifData(
+        scientific_name=scientific_name,
+        occurrence_id=occurrence_id,
+        native=native,
+        observation_count=count,
+        event_date=event_date,
+        updated_at=updated_at or datetime(2025, 1, 1)
+    )
+    db.session.add(row)
+    db.session.commit()
+    return row
+
+
+def rollups():
+    """All rollup rows as {(species, native, day): (record_count, observation_count)}."""
+    return {
+        (row.species, row.native, row.day): (row.record_count, row.observation_count)
+        for row in ObservationDailyRollup.query.all()
+    }
+
+
+class TestRefreshObservationRollups:
+    """Tests for refresh_observation_rollups function."""
+
+    def test_full_build_merges_name_variants(self, app, db):
+        """Test that the first refresh rolls up every dated row by species, native and day."""
+        add_observation(db, "r1", "Quercus lobata", datetime(2025, 3, 10, 8), count=2)
+        add_observation(db, "r2", "Quercus lobata Née", datetime(2025, 3, 10, 17), count=3)
+        add_observation(db, "r3", "Eucalyptus globulus", datetime(2025, 3, 11), native=False)
+        add_observation(db, "r4", "Quercus lobata", None)
+
+        assert refresh_observation_rollups() == 2
+        assert rollups() == {
+            ("Quercus lobata", True, date(2025, 3, 10)): (2, 5),
+            ("Eucalyptus globulus", False, date(2025, 3, 11)): (1, 1),
+        }
+        assert db.session.get(RollupState, RollupState.SINGLETON_ID).watermark == datetime(2025, 1, 1)
+
+    def test_incremental_refresh_recomputes_only_changed_days(self, app, db):
+        """Test that only days with rows changed since the watermark are re-aggregated."""
+        add_observation(db, "r1", "Quercus lobata", datetime(2025, 3, 10), updated_at=datetime(2024, 12, 1))
+        # Rows at the watermark itself are re-read, so this day is recomputed too
+        add_observation(db, "r2", "Quercus lobata", datetime(2025, 3, 12))
+        refresh_observation_rollups()
+
+        add_observation(db, "r3", "Quercus lobata", datetime(2025, 3, 12), updated_at=datetime(2025, 2, 1))
+        with patch.object(rollup_job, "aggregate_days", wraps=rollup_job.aggregate_days) as aggregate:
+            refresh_observation_rollups()
+
+        aggregate.assert_called_once_with([date(2025, 3, 12)])
+        assert rollups() == {
+            ("Quercus lobata", True, date(2025, 3, 10)): (1, 1),
+            ("Quercus lobata", True, date(2025, 3, 12)): (2, 2),
+        }
+
+    def test_updated_rows_are_not_counted_twice(self, app, db):
+        """Test that a re-classified row moves between native flags instead of being added again."""
+        row = add_observation(db, "r1", "Quercus lobata", datetime(2025, 3, 10), native=False)
+        refresh_observation_rollups()
+
+        row.native = True
+        row.updated_at = datetime(2025, 2, 1)
+        db.session.commit()
+        refresh_observation_rollups()
+
+        assert rollups() == {("Quercus lobata", True, date(2025, 3, 10)): (1, 1)}
+
+    def test_emptied_table_is_rebuilt(self, app, db):
+        """Test that rollups are cleared once gbif_data has been emptied."""
+        add_observation(db, "r1", "Quercus lobata", datetime(2025, 3, 10))
+        refresh_observation_rollups()
+
+        GbifData.query.delete()
+        db.session.commit()
+
+        assert refresh_observation_rollups() == 0
+        assert rollups() == {}
+
+    def test_moved_event_date_recomputes_old_day(self, app, db):
+        """Test that an upsert moving an observation to another day clears it from the old day."""
+        upsert_gbif_rows([{"scientific_name": "Quercus lobata", "occurrence_id": "m1",
+                           "event_date": datetime(2025, 3, 10), "payload_hash": "a"}])
+        db.session.commit()
+        refresh_observation_rollups()
+
+        upsert_gbif_rows([{"scientific_name": "Quercus lobata", "occurrence_id": "m1",
+                           "event_date": datetime(2025, 3, 20), "payload_hash": "b"}])
+        db.session.commit()
+        assert [row.day for row in RollupPendingDay.query.all()] == [date(2025, 3, 10)]
+
+        refresh_observation_rollups()
+
+        assert rollups() == {("Quercus lobata", False, date(2025, 3, 20)): (1, 1)}
+        assert RollupPendingDay.query.count() == 0
+
+    def test_bulk_writes_use_the_database_clock(self, app, db, monkeypatch):
+        """Test that a local clock ahead of the database does not push the watermark past later rows."""
+        monkeypatch.setenv("TZ", "Pacific/Kiritimati")  # UTC+14
+        time.tzset()
+        try:
+            upsert_gbif_rows([{"scientific_name": "Quercus lobata", "occurrence_id": "c1",
+                               "event_date": datetime(2025, 1, 1), "payload_hash": "a"}])
+            db.session.commit()
+            refresh_observation_rollups()
+
+            upsert_gbif_rows([{"scientific_name": "Quercus lobata", "occurrence_id": "c1",
+                               "event_date": datetime(2025, 1, 1, 12), "payload_hash": "b"}])
+            db.session.commit()
+            refresh_observation_rollups()
+
+            upsert_gbif_rows([{"scientific_name": "Quercus lobata", "occurrence_id": "c2",
+                               "event_date": datetime(2025, 1, 2), "payload_hash": "c"}])
+            db.session.commit()
+            refresh_observation_rollups()
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+        assert set(day for _, _, day in rollups()) == {date(2025, 1, 1), date(2025, 1, 2)}
+
+
+class TestTimeseriesEndpoint:
+    """Tests for /stats/timeseries."""
+
+    def build(self, db):
+        add_observation(db, "t1", "Quercus lobata", datetime(2025, 3, 10), count=2)  # Monday
+        add_observation(db, "t2", "Quercus lobata Née", datetime(2025, 3, 16), count=3)  # Sunday
+        add_observation(db, "t3", "Eucalyptus globulus", datetime(2025, 3, 17), native=False)
+        add_observation(db, "t4", "Quercus agrifolia", datetime(2025, 4, 2))
+        refresh_observation_rollups()
+
+    def test_weekly_buckets(self, client, db):
+        """Test that weeks start on Monday and sum every species."""
+        self.build(db)
+        response = client.get('/stats/timeseries')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["bucket"] == "week"
+        assert data["results"] == [
+            {"start": "2025-03-10", "record_count": 2, "observation_count": 5,
+             "native_observation_count": 5, "species_count": 1},
+            {"start": "2025-03-17", "record_count": 1, "observation_count": 1,
+             "native_observation_count": 0, "species_count": 1},
+            {"start": "2025-03-31", "record_count": 1, "observation_count": 1,
+             "native_observation_count": 1, "species_count": 1},
+        ]
+
+    def test_monthly_buckets_and_filters(self, client, db):
+        """Test month buckets with the native and date range filters."""
+        self.build(db)
+        response = client.get('/stats/timeseries?bucket=month&native=true&start=2025-03-01&end=2025-04-30')
+
+        assert [(r["start"], r["observation_count"], r["species_count"]) for r in response.get_json()["results"]] == [
+            ("2025-03-01", 5, 1),
+            ("2025-04-01", 1, 1),
+        ]
+
+    def test_species_filter_accepts_name_variants(self, client, db):
+        """Test that the species filter normalises the requested name."""
+        self.build(db)
+        data = client.get('/stats/timeseries?bucket=day&species=Quercus lobata Née').get_json()
+
+        assert data["species"] == "Quercus lobata"
+        assert [(r["start"], r["observation_count"]) for r in data["results"]] == [
+            ("2025-03-10", 2),
+            ("2025-03-16", 3),
+        ]
+
+    def test_invalid_parameters(self, client, db):
+        """Test that bad bucket, native and date values are rejected."""
+        assert client.get('/stats/timeseries?bucket=year').status_code == 400
+        assert client.get('/stats/timeseries?native=maybe').status_code == 400
+        assert client.get('/stats/timeseries?start=03/10/2025').status_code == 400
+        assert client.get('/stats/timeseries?start=2025-04-01&end=2025-03-01').status_code == 400
@@ -0,0 +1,114 @@
+"""Tests for the cross-process ingestion run lock."""
+
+import pytest
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
+from speciestrack.jobs.run_lock import (
+    advisory_lock_key,
+    job_run_lock,
+    lock_file_path,
+    run_exclusive,
+    _file_lock
+)
+from speciestrack.models import db as _db
+
+
+@pytest.fixture(autouse=True)
+def lock_dir(tmp_path, monkeypatch):
+    """Keep lock files out of the shared temp directory."""
+    monkeypatch.setenv("SPECIESTRACK_LOCK_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestFileLock:
+    """Tests for the flock fallback used with SQLite."""
+
+    def test_second_holder_is_refused(self, lock_dir):
+        """Test that a second open of the lock file cannot take the lock."""
+        path = str(lock_dir / "test.lock")
+
+        with _file_lock(path) as first:
+            with _file_lock(path) as second:
+                assert first is True
+                assert second is False
+
+    def test_lock_is_released(self, lock_dir):
+        """Test that the lock can be taken again once released."""
+        path = str(lock_dir / "test.lock")
+
+        with _file_lock(path):
+            pass
+        with _file_lock(path) as acquired:
+            assert acquired is True
+
+    def test_lock_file_depends_on_database(self):
+        """Test that different databases get different lock files."""
+        assert lock_file_path("gbif", "sqlite:///a.db") != lock_file_path("gbif", "sqlite:///b.db")
+
+
+class TestJobRunLock:
+    """Tests for job_run_lock and run_exclusive."""
+
+    def test_sqlite_uses_file_lock(self, app):
+        """Test that nested runs under the same lock exclude each other."""
+        with job_run_lock("gbif") as outer:
+            with job_run_lock("gbif") as inner:
+                assert outer is True
+                assert inner is False
+
+    def test_postgres_uses_advisory_lock(self, app):
+        """Test that PostgreSQL takes and releases an advisory lock on its own connection."""
+        connection = MagicMock()
+        connection.execute.return_value.scalar.return_value = True
+        engine = Mock()
+        engine.dialect.name = "postgresql"
+        engine.connect.return_value = connection
+
+        with patch.object(type(_db), "engine", new_callable=PropertyMock, return_value=engine):
+            with job_run_lock("gbif") as acquired:
+                assert acquired is True
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert "pg_try_advisory_lock" in statements[0]
+        assert "pg_advisory_unlock" in statements[1]
+        assert connection.execute.call_args_list[0].args[1] == {"key": advisory_lock_key("gbif")}
+        connection.close.assert_called_once()
+
+    def test_postgres_lock_held_elsewhere(self, app):
+        """Test that a lock held by another session is reported and not released."""
+        connection = MagicMock()
+        connection.execute.return_value.scalar.return_value = False
+        engine = Mock()
+        engine.dialect.name = "postgresql"
+        engine.connect.return_value = connection
+
+        with patch.object(type(_db), "engine", new_callable=PropertyMock, return_value=engine):
+            with job_run_lock("gbif") as acquired:
+                assert acquired is False
+
+        assert connection.execute.call_count == 1
+
+    def test_advisory_lock_key_is_stable(self):
+        """Test that lock keys are deterministic signed 64-bit integers."""
+        key = advisory_lock_key("gbif_ingestion")
+
+        assert key == advisory_lock_key("gbif_ingestion")
+        assert -2 ** 63 <= key < 2 ** 63
+        assert key != advisory_lock_key("other")
+
+    def test_run_exclusive_runs_job(self, app):
+        """Test that the job runs when the lock is free."""
+        job = Mock(__name__="job", return_value="stats")
+
+        assert run_exclusive(app, job, full_sync=True) == "stats"
+        job.assert_called_once_with(app, full_sync=True)
+
+    def test_run_exclusive_skips_when_locked(self, app, capsys):
+        """Test that the job is skipped and logged when another process runs it."""
+        job = Mock(__name__="job")
+
+        with job_run_lock():
+            result = run_exclusive(app, job)
+
+        assert result is None
+        job.assert_not_called()
+        assert "Skipping job" in capsys.readouterr().out
@@ -0,0 +1,79 @@
+"""Tests for sparse fieldsets (?fields=) on /native-plants."""
+
+import json
+import pytest
+from datetime import datetime
+from speciestrack.controllers.map_controller import parse_fields
+from speciestrack.models.gbif_data import GbifData
+
+MAP_FIELDS = "decimal_latitude,decimal_longitude,scientific_name,event_date"
+
+
+class TestSerialize:
+    """Tests for GbifData.serialize and parse_fields."""
+
+    def test_to_dict_uses_every_field(self, db, gbif_sample_data):
+        """Test that to_dict still returns every field in FIELDS order."""
+        assert tuple(gbif_sample_data[0].to_dict()) == GbifData.FIELDS
+
+    def test_column_rows_match_model_serialisation(self, db, gbif_sample_data):
+        """Test that a row of selected columns serialises like the model instance."""
+        fields = ("scientific_name", "decimal_latitude", "event_date")
+        row = db.session.query(*GbifData.columns(fields)).filter_by(occurrence_id="4055379494").one()
+
+        assert GbifData.serialize(row, fields) == {
+            "scientific_name": "Quercus lobata",
+            "decimal_latitude": 37.9187,
+            "event_date": datetime(2025, 3, 15, 10, 30).isoformat(),
+        }
+        assert GbifData.serialize(row, fields) == gbif_sample_data[0].to_dict(fields)
+
+    def test_parse_fields(self):
+        """Test that fields keep their order, drop duplicates and reject unknown names."""
+        assert parse_fields(None) == GbifData.FIELDS
+        assert parse_fields("event_date, id,event_date") == ("event_date", "id")
+        with pytest.raises(ValueError):
+            parse_fields("id,payload_hash")
+
+
+class TestNativePlantsFields:
+    """Tests for the fields= parameter on the /native-plants route."""
+
+    def test_list_with_fields(self, client, gbif_sample_data):
+        """Test that only the requested fields are returned."""
+        data = client.get(f"/native-plants?fields={MAP_FIELDS}").get_json()
+
+        assert len(data) == 3
+        for row in data:
+            assert set(row) == set(MAP_FIELDS.split(","))
+
+    def test_payload_is_smaller(self, client, gbif_sample_data):
+        """Test that the map payload is much smaller than the full one."""
+        full = client.get("/native-plants").get_data()
+        sparse = client.get(f"/native-plants?fields={MAP_FIELDS}").get_data()
+
+        assert len(sparse) * 2 < len(full)
+
+    def test_page_with_fields(self, client, gbif_sample_data):
+        """Test that pagination works when the sort key is not requested."""
+        first = client.get("/native-plants?limit=2&fields=scientific_name").get_json()
+        second = client.get(f"/native-plants?limit=2&fields=scientific_name&cursor={first['next']}").get_json()
+
+        assert first["results"] == [{"scientific_name": "Arctostaphylos glauca"}, {"scientific_name": "Aesculus californica"}]
+        assert second["results"] == [{"scientific_name": "Quercus lobata"}]
+        assert second["next"] is None
+
+    def test_stream_with_fields(self, client, gbif_sample_data):
+        """Test that streamed lines carry only the requested fields."""
+        body = client.get("/native-plants?stream=1&fields=id,native").get_data(as_text=True)
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert len(rows) == 3
+        assert all(set(row) == {"id", "native"} for row in rows)
+
+    def test_unknown_field(self, client, gbif_sample_data):
+        """Test that an unknown field returns 400."""
+        response = client.get("/native-plants?fields=scientific_name,secret")
+
+        assert response.status_code == 400
+        assert "Unknown field: secret" in response.get_json()["error"]
@@ -0,0 +1,123 @@
+"""Tests for the species autocomplete index and /species/suggest."""
+
+import pytest
+from speciestrack.jobs.derived_data import refresh_derived_data
+from speciestrack.jobs.species_suggestions import load_suggest_index, get_suggest_index
+from speciestrack.models.dataset_version import DatasetVersion
+from speciestrack.models.gbif_data import GbifData
+from speciestrack.utils.suggest_index import SuggestIndex, fold
+
+
+def add_observations(db, names):
+    """Store one observation per (scientific_name, common_name, native) tuple."""
+    start = GbifData.query.count()
+    for index, (scientific_name, common_name, native) in enumerate(names, start):
+        db.session.add(GbifData(
+            scientific_name=scientific_name,
+            common_name=common_name,
+            native=native,
+            occurrence_id=f"suggest-{index}"
+        ))
+    db.session.commit()
+
+
+class TestSuggestIndex:
+    """Tests for SuggestIndex class."""
+
+    @pytest.fixture
+    def index(self):
+        return SuggestIndex([
+            (("Quercus lobata", "Valley Oak"), 5, "lobata"),
+            (("Quercus agrifolia", "Coast Live Oak"), 9, "agrifolia"),
+            (("Eschscholzia californica", "California Poppy"), 2, "poppy"),
+            (("Umbellularia californica", None), 7, "laurel"),
+        ])
+
+    def test_prefix_of_first_word(self, index):
+        """Test that the start of a name matches, highest weight first."""
+        assert index.suggest("quer") == ["agrifolia", "lobata"]
+
+    def test_prefix_of_later_word(self, index):
+        """Test that any word of the scientific or common name can match."""
+        assert index.suggest("oak") == ["agrifolia", "lobata"]
+        assert index.suggest("californica") == ["laurel", "poppy"]
+
+    def test_multiple_words(self, index):
+        """Test that several words match consecutive words of a name."""
+        assert index.suggest("live  o") == ["agrifolia"]
+        assert index.suggest("quercus lob") == ["lobata"]
+        assert index.suggest("oak live") == []
+
+    def test_case_and_accents_are_ignored(self, index):
+        """Test that matching folds case and accents."""
+        assert index.suggest("CALIFÓRNIA P") == ["poppy"]
+        assert fold("Née") == "nee"
+
+    def test_limit_and_empty_query(self, index):
+        """Test the result limit and that blank queries match nothing."""
+        assert index.suggest("c", limit=2) == ["agrifolia", "laurel"]
+        assert index.suggest("c", limit=2) == ["agrifolia", "laurel"]
+        assert index.suggest("   ") == []
+        assert index.suggest("zzz") == []
+
+
+class TestLoadSuggestIndex:
+    """Tests for building the index from gbif_data."""
+
+    def test_name_variants_are_merged(self, db):
+        """Test that author variants of a species become one weighted suggestion."""
+        add_observations(db, [
+            ("Quercus lobata", "Valley Oak", True),
+            ("Quercus lobata Née", "Valley Oak", True),
+            ("Quercus lobata Née", None, False),
+            ("Quercus agrifolia Née", None, False),
+        ])
+
+        suggestions = load_suggest_index().suggest("quercus")
+
+        assert suggestions == [
+            {"scientific_name": "Quercus lobata", "common_name": "Valley Oak", "native": True, "observation_count": 3},
+            {"scientific_name": "Quercus agrifolia", "common_name": None, "native": False, "observation_count": 1},
+        ]
+
+    def test_index_is_rebuilt_for_new_dataset_version(self, app, db):
+        """Test that the index is reused until refresh_derived_data() bumps the version."""
+        add_observations(db, [("Quercus lobata", "Valley Oak", True)])
+        first = get_suggest_index()
+        add_observations(db, [("Pinus sabiniana", "Gray Pine", True)])
+
+        assert get_suggest_index() is first
+
+        refresh_derived_data()
+
+        assert len(get_suggest_index()) == 2
+
+    def test_version_bump_from_another_process(self, app, db, monkeypatch):
+        """Test that a version bumped elsewhere is picked up once it is re-read."""
+        monkeypatch.setenv("DATASET_VERSION_CHECK_SECONDS", "0")
+        first = get_suggest_index()
+        DatasetVersion.bump()
+        db.session.commit()
+
+        assert get_suggest_index() is not first
+
+
+class TestSpeciesSuggestEndpoint:
+    """Tests for the /species/suggest route."""
+
+    def test_suggest(self, client, db, gbif_sample_data):
+        """Test that matching species are returned."""
+        data = client.get("/species/suggest?q=aes").get_json()
+
+        assert data["query"] == "aes"
+        assert [s["scientific_name"] for s in data["suggestions"]] == ["Aesculus californica"]
+
+    def test_limit(self, client, db, gbif_sample_data):
+        """Test the limit parameter and its validation."""
+        assert len(client.get("/species/suggest?q=a&limit=1").get_json()["suggestions"]) == 1
+        assert client.get("/species/suggest?q=a&limit=0").status_code == 400
+        assert client.get("/species/suggest?q=a&limit=x").status_code == 400
+
+    def test_missing_query(self, client, db):
+        """Test that an empty query returns no suggestions."""
+        assert client.get("/species/suggest").get_json()["suggestions"] == []
@@ -0,0 +1,59 @@
+"""Tests for NDJSON streaming of /native-plants."""
+
+import json
+import pytest
+
+
+def parse_ndjson(response):
+    """Parse an NDJSON response body into a list of objects."""
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+class TestNativePlantsStreaming:
+    """Tests for the streaming response mode."""
+
+    def test_stream_query_parameter(self, client, gbif_sample_data):
+        """Test that ?stream=1 returns one JSON object per line."""
+        response = client.get("/native-plants?stream=1")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert response.is_streamed
+        rows = parse_ndjson(response)
+        assert {row["scientific_name"] for row in rows} == {
+            "Quercus lobata", "Aesculus californica", "Arctostaphylos glauca"
+        }
+
+    def test_accept_header(self, client, gbif_sample_data):
+        """Test that Accept: application/x-ndjson selects streaming."""
+        response = client.get("/native-plants", headers={"Accept": "application/x-ndjson"})
+
+        assert response.mimetype == "application/x-ndjson"
+        assert len(parse_ndjson(response)) == 3
+
+    def test_json_stays_default(self, client, gbif_sample_data):
+        """Test that browsers and generic clients still get a JSON list."""
+        response = client.get("/native-plants", headers={"Accept": "*/*"})
+
+        assert response.mimetype == "application/json"
+        assert len(response.get_json()) == 3
+
+    def test_stream_applies_filters(self, client, gbif_sample_data):
+        """Test that filters apply to the streamed rows."""
+        rows = parse_ndjson(client.get("/native-plants?stream=1&scientific_name=Aesculus"))
+
+        assert [row["scientific_name"] for row in rows] == ["Aesculus californica"]
+
+    def test_stream_matches_list_response(self, client, gbif_sample_data):
+        """Test that streamed rows are the same objects as the JSON list."""
+        streamed = parse_ndjson(client.get("/native-plants?stream=1"))
+        listed = client.get("/native-plants").get_json()
+
+        assert sorted(streamed, key=lambda row: row["id"]) == sorted(listed, key=lambda row: row["id"])
+
+    def test_empty_stream(self, client, db):
+        """Test that an empty result streams an empty body."""
+        response = client.get("/native-plants?stream=1")
+
+        assert response.status_code == 200
+        assert response.get_data(as_text=True) == ""
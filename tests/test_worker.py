@@ -0,0 +1,30 @@
+"""Tests for the background worker entry point."""
+
+from unittest.mock import patch
+from apscheduler.schedulers.background import BackgroundScheduler
+from speciestrack.worker import create_scheduler, GBIF_DAILY_JOB_ID
+
+
+class TestWorker:
+    """Tests for the worker scheduler."""
+
+    def test_create_scheduler_adds_daily_job(self, app):
+        """Test that the worker schedules the daily GBIF fetch at noon."""
+        scheduler = create_scheduler(app, scheduler_class=BackgroundScheduler)
+
+        job = scheduler.get_job(GBIF_DAILY_JOB_ID)
+
+        assert job is not None
+        assert str(job.trigger) == "cron[hour='12', minute='0']"
+        assert scheduler.running is False
+
+    def test_scheduled_job_runs_under_lock(self, app):
+        """Test that the scheduled job goes through run_exclusive."""
+        scheduler = create_scheduler(app, scheduler_class=BackgroundScheduler)
+
+        with patch('speciestrack.worker.run_exclusive') as mock_run:
+            scheduler.get_job(GBIF_DAILY_JOB_ID).func()
+
+        args = mock_run.call_args.args
+        assert args[0] is app
+        assert args[1].__name__ == "store_all_regions"